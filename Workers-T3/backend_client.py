@@ -7,21 +7,67 @@ Responsabilidades:
   - Envío de actualizaciones parciales (WebSocket > HTTP fallback)
   - Reporte de tarea completada
   - Gestión del ciclo de vida del WebSocket
+  - Sesiones HTTP persistentes (pool keep-alive) para no abrir una conexión
+    TCP por cada heartbeat, poll o update parcial
 """
 
 import json
 import time
+import socket
 import logging
 import threading
 from typing import Optional, Callable
 
 import requests
 import websocket
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
+from urllib3.connection import HTTPConnection
 
 logger = logging.getLogger(__name__)
 
 
+def _keepalive_socket_options(idle: int) -> list:
+    """Opciones de socket para TCP keep-alive (las que soporte la plataforma)."""
+    opts = list(HTTPConnection.default_socket_options)
+    opts.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        opts.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        opts.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, idle // 3)))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        opts.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3))
+    return opts
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter con TCP keep-alive en las conexiones del pool."""
+
+    def __init__(self, keepalive_idle: int = 30, **kwargs):
+        self._socket_options = _keepalive_socket_options(keepalive_idle) if keepalive_idle else None
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self._socket_options:
+            kwargs["socket_options"] = self._socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _make_session(headers: dict, pool_size: int, keepalive_idle: int) -> requests.Session:
+    # max_retries=0: los reintentos los maneja tenacity (o no hay, en el camino rápido)
+    adapter = _KeepAliveAdapter(
+        keepalive_idle=keepalive_idle,
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        max_retries=0,
+    )
+    session = requests.Session()
+    session.headers.update(headers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 class BackendClient:
     def __init__(
         self,
@@ -31,8 +77,11 @@ class BackendClient:
         tipo: str,
         admin: bool,
         http_fast_timeout: int = 3,
+        http_confirm_timeout: float = 30,
         ws_connect_attempts: int = 10,
         ws_connect_wait: float = 0.5,
+        http_pool_size: int = 4,
+        http_keepalive_idle: int = 30,
     ):
         self.backend = backend_url
         self.headers = {"X-API-KEY": api_key}
@@ -40,16 +89,25 @@ class BackendClient:
         self.tipo = tipo
         self.admin = admin
         self.http_fast_timeout = http_fast_timeout
+        self.http_confirm_timeout = http_confirm_timeout
         self.ws_connect_attempts = ws_connect_attempts
         self.ws_connect_wait = ws_connect_wait
 
+        # Pools separados: una request lenta con reintentos (register, get_task)
+        # no ocupa las conexiones de los updates parciales rápidos.
+        self._session = _make_session(self.headers, http_pool_size, http_keepalive_idle)
+        self._fast_session = _make_session(self.headers, http_pool_size, http_keepalive_idle)
+
         # Estado WebSocket (protegido por locks para thread-safety)
         self._ws_connected = False
         self._ws_connected_lock = threading.Lock()
         self._ws_connection = None
         self._ws_connection_lock = threading.Lock()
-        self._task_queue: list = []
-        self._task_queue_lock = threading.Lock()
+        # El backend anuncia en el mensaje "connected" si entiende task_update_batch
+        self._ws_batch = False
+        # Canal de llegada de tareas: varios new_task seguidos se colapsan en
+        # un solo set() -> un solo get_task.
+        self._task_event = threading.Event()
 
     # ── Propiedad pública ────────────────────────────────────────────
     @property
@@ -69,9 +127,9 @@ class BackendClient:
         url = f"{self.backend}{endpoint}"
         try:
             if method.upper() == "POST":
-                response = requests.post(url, json=json_data, headers=self.headers, timeout=timeout)
+                response = self._session.post(url, json=json_data, timeout=timeout)
             else:
-                response = requests.get(url, headers=self.headers, timeout=timeout)
+                response = self._session.get(url, timeout=timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
@@ -87,18 +145,15 @@ class BackendClient:
         method: str,
         endpoint: str,
         json_data: Optional[dict] = None,
+        timeout: Optional[float] = None,
     ):
         url = f"{self.backend}{endpoint}"
+        timeout = timeout or self.http_fast_timeout
         try:
             if method.upper() == "POST":
-                response = requests.post(
-                    url, json=json_data, headers=self.headers,
-                    timeout=self.http_fast_timeout
-                )
+                response = self._fast_session.post(url, json=json_data, timeout=timeout)
             else:
-                response = requests.get(
-                    url, headers=self.headers, timeout=self.http_fast_timeout
-                )
+                response = self._fast_session.get(url, timeout=timeout)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -119,6 +174,16 @@ class BackendClient:
         logger.error("[REGISTRO] El backend rechazó el registro")
         return False
 
+    def heartbeat(self, timeout: Optional[float] = None) -> bool:
+        """Heartbeat liviano: mismo endpoint que register, sin reintentos y con timeout corto."""
+        result = self._request_fast(
+            "POST",
+            f"/workers/register/{self.tipo}/{self.pc_id}",
+            {"admin": self.admin},
+            timeout=timeout,
+        )
+        return bool(result and result.get("status") == "ok")
+
     def get_task(self) -> Optional[dict]:
         """Obtiene la próxima tarea disponible para este worker."""
         logger.info("[POLL] Intentando obtener tarea...")
@@ -134,6 +199,16 @@ class BackendClient:
             logger.warning(f"[ADVERTENCIA] Respuesta inesperada de get_task: {result}")
         return None
 
+    def release_task(self, task_id: str) -> bool:
+        """Devuelve al backend una tarea obtenida pero no iniciada (lease de prefetch vencido).
+
+        Retorna False si el backend no la liberó (o no tiene el endpoint): en
+        ese caso la tarea sigue asignada a este worker y hay que ejecutarla.
+        """
+        payload = {"pc_id": self.pc_id, "task_id": task_id}
+        result = self._request_fast("POST", "/workers/release_task", payload)
+        return bool(result and result.get("status") == "ok")
+
     # ── Envío de actualizaciones ─────────────────────────────────────
     def send_update(
         self,
@@ -145,9 +220,75 @@ class BackendClient:
         Envía actualización parcial al backend.
         Prioriza WebSocket; si falla o no hay conexión, usa HTTP rápido.
         No bloquea el proceso si el envío falla.
+
+        Por WS, True solo significa que el mensaje salió del socket, no que el
+        backend lo procesó (para eso, send_update_confirmed).
         """
-        partial_data["status"] = status
+        partial_data = {**partial_data, "status": status}
+        self._log_update(task_id, partial_data, status)
+
+        # Intentar WebSocket primero (más rápido, sin overhead HTTP)
+        with self._ws_connected_lock:
+            connected = self._ws_connected
+        with self._ws_connection_lock:
+            conn = self._ws_connection
+
+        if connected and conn:
+            try:
+                message = {
+                    "type": "task_update",
+                    "task_id": task_id,
+                    "partial_data": partial_data,
+                }
+                conn.send(json.dumps(message))
+                logger.debug(f"[WS] Update enviado vía WebSocket")
+                return True
+            except Exception as e:
+                logger.warning(f"[WS] Error enviando update: {e} — usando HTTP")
 
+        # Fallback HTTP rápido
+        payload = {"task_id": task_id, "partial_data": partial_data}
+        result = self._request_fast("POST", "/workers/task_update", payload)
+        if result and result.get("status") == "ok":
+            return True
+
+        logger.warning(f"[UPDATE] No se pudo enviar update para {task_id} — continuando")
+        return False
+
+    def send_update_confirmed(
+        self,
+        task_id: str,
+        partial_data: dict,
+        status: str = "running",
+        update_id: Optional[str] = None,
+    ) -> bool:
+        """Envía un update por HTTP y retorna True solo si el backend respondió ok.
+
+        Lo usa el outbox (UpdateSender) para decidir si puede borrar una entrada.
+        Va por la sesión normal con `http_confirm_timeout`: un resultado final
+        con captura o una lista larga de deudas no entra en el timeout del
+        camino rápido. Sin reintentos acá: lo que falla queda en el outbox.
+        `update_id` (clave de idempotencia) le permite al backend descartar
+        el mismo update reenviado.
+        """
+        partial_data = {**partial_data, "status": status}
+        self._log_update(task_id, partial_data, status)
+        payload = {"task_id": task_id, "partial_data": partial_data}
+        if update_id:
+            payload["update_id"] = update_id
+        try:
+            response = self._session.post(
+                f"{self.backend}/workers/task_update", json=payload, timeout=self.http_confirm_timeout
+            )
+            response.raise_for_status()
+            result = response.json()
+        except Exception as e:
+            logger.warning(f"[UPDATE] {task_id} ({status}) sin confirmar: {e}")
+            return False
+        return bool(result and result.get("status") == "ok")
+
+    @staticmethod
+    def _log_update(task_id: str, partial_data: dict, status: str):
         etapa = partial_data.get("etapa", "")
         info = partial_data.get("info", "")
         has_image = "image" in partial_data
@@ -159,33 +300,61 @@ class BackendClient:
         else:
             logger.info(f"[UPDATE] {task_id} | {status} | {etapa}: {info[:100]}{img_indicator}")
 
-        # Intentar WebSocket primero (más rápido, sin overhead HTTP)
+    def send_update_batch(
+        self,
+        task_id: str,
+        partials: list,
+        status: str = "running",
+    ) -> bool:
+        """
+        Envía varios partials de la misma tarea en un solo mensaje task_update_batch.
+
+        Por WS el lote solo va si el backend anunció `task_update_batch` en sus
+        capabilities (mensaje "connected"): un mensaje de tipo desconocido se
+        descartaría sin aviso. Sin esa capability cada partial va suelto como
+        task_update. Sin WS, HTTP rápido; si el backend no acepta el lote por
+        HTTP, se reenvía cada partial por separado.
+        """
+        partials = [{**partial_data, "status": status} for partial_data in partials]
+
+        etapa = partials[-1].get("etapa", "") if partials else ""
+        logger.info(f"[UPDATE] {task_id} | {status} | {etapa}: lote de {len(partials)} partials")
+
         with self._ws_connected_lock:
             connected = self._ws_connected
         with self._ws_connection_lock:
             conn = self._ws_connection
 
+        if connected and conn and not self._ws_batch:
+            logger.debug("[WS] Backend sin task_update_batch — enviando updates sueltos")
+            ok = True
+            for partial_data in partials:
+                ok = self.send_update(task_id, partial_data, status) and ok
+            return ok
+
         if connected and conn:
             try:
                 message = {
-                    "type": "task_update",
+                    "type": "task_update_batch",
                     "task_id": task_id,
-                    "partial_data": partial_data,
+                    "updates": partials,
                 }
                 conn.send(json.dumps(message))
-                logger.debug(f"[WS] Update enviado vía WebSocket")
+                logger.debug(f"[WS] Lote de {len(partials)} updates enviado vía WebSocket")
                 return True
             except Exception as e:
-                logger.warning(f"[WS] Error enviando update: {e} — usando HTTP")
+                logger.warning(f"[WS] Error enviando lote: {e} — usando HTTP")
 
-        # Fallback HTTP rápido
-        payload = {"task_id": task_id, "partial_data": partial_data}
-        result = self._request_fast("POST", "/workers/task_update", payload)
+        payload = {"task_id": task_id, "updates": partials}
+        result = self._request_fast("POST", "/workers/task_update_batch", payload)
         if result and result.get("status") == "ok":
             return True
 
-        logger.warning(f"[UPDATE] No se pudo enviar update para {task_id} — continuando")
-        return False
+        logger.warning(f"[UPDATE] Lote rechazado para {task_id} — enviando {len(partials)} updates sueltos")
+        ok = True
+        for partial_data in partials:
+            ok = self.send_update(task_id, partial_data, status) and ok
+        return ok
 
     def task_done(
         self, task_id: str, execution_time: int, success: bool = True
@@ -199,7 +368,7 @@ class BackendClient:
         }
         try:
             url = f"{self.backend}/workers/task_done"
-            response = requests.post(url, json=payload, headers=self.headers, timeout=10)
+            response = self._session.post(url, json=payload, timeout=10)
             response.raise_for_status()
             result = response.json()
             return bool(result and result.get("status") == "ok")
@@ -219,11 +388,11 @@ class BackendClient:
             data = json.loads(message)
             msg_type = data.get("type")
             if msg_type == "connected":
-                logger.info(f"[WS] {data.get('message', 'Conectado')}")
+                self._ws_batch = "task_update_batch" in (data.get("capabilities") or ())
+                logger.info(f"[WS] {data.get('message', 'Conectado')} (lotes: {'si' if self._ws_batch else 'no'})")
             elif msg_type == "new_task":
                 logger.info("[WS] Notificación de nueva tarea recibida")
-                with self._task_queue_lock:
-                    self._task_queue.append({"trigger": "fetch"})
+                self.notify_task_trigger()
             else:
                 logger.debug(f"[WS] Mensaje recibido: {data}")
         except json.JSONDecodeError as e:
@@ -237,6 +406,7 @@ class BackendClient:
     def _on_ws_close(self, ws, close_status_code, close_msg):
         with self._ws_connected_lock:
             self._ws_connected = False
+        self._ws_batch = False
         logger.warning(f"[WS] Conexión cerrada (code={close_status_code})")
 
     def _on_ws_open(self, ws):
@@ -278,13 +448,31 @@ class BackendClient:
         )
         return False
 
+    def notify_task_trigger(self):
+        """Marca que hay que pedir tarea (WS new_task, poll de respaldo, etc)."""
+        self._task_event.set()
+
+    def wait_task_trigger(self, timeout: Optional[float] = None) -> bool:
+        """Bloquea hasta que haya un trigger de tarea o venza `timeout`.
+
+        Retorna True (y consume el trigger) si hay que llamar a get_task.
+        """
+        if self._task_event.wait(timeout):
+            self._task_event.clear()
+            return True
+        return False
+
     def get_ws_trigger(self) -> Optional[dict]:
-        """Retorna un trigger de nueva tarea (recibido por WS) o None."""
-        with self._task_queue_lock:
-            if self._task_queue:
-                return self._task_queue.pop(0)
+        """Retorna un trigger de nueva tarea (recibido por WS) o None. No bloquea."""
+        if self.wait_task_trigger(0):
+            return {"trigger": "fetch"}
         return None
 
+    def close_http(self):
+        """Cierra las sesiones HTTP y sus conexiones del pool."""
+        self._session.close()
+        self._fast_session.close()
+
     def close_ws(self):
         """Cierra la conexión WebSocket limpiamente."""
         with self._ws_connection_lock:
@@ -0,0 +1,173 @@
+"""
+camino_host: proceso "caliente" que ejecuta caminos sin lanzar un intérprete por tarea.
+
+El worker lo arranca una sola vez. Al iniciar precarga pyautogui, PIL, pynput,
+shared.* y el JSON master de coordenadas; después atiende pedidos por stdin
+(una línea JSON por pedido) y ejecuta el script pedido en este mismo proceso
+con `runpy`, como si fuera `python -u script.py args...`.
+
+Protocolo (stdin -> host):
+    {"id": 1, "script": "/ruta/scripts/deudas.py", "argv": ["12345678", "{...}"]}
+
+Protocolo (host -> stdout):
+    ===HOST_READY===                         una vez, al terminar la precarga
+    ...stdout del script tal cual...         (===JSON_PARTIAL_*===, ===JSON_RESULT_*===, etc)
+    ===HOST_RUN_END=== {"id": 1, "returncode": 0}
+
+El stdout de cada corrida es idéntico al de un subprocess, así que el
+SubprocessRunner del worker lo procesa sin cambios (ver CaminoHostRunner).
+stderr pasa directo al stderr del host.
+"""
+
+import importlib
+import json
+import os
+import runpy
+import sys
+import time
+import traceback
+
+HOST_READY = "===HOST_READY==="
+HOST_RUN_END = "===HOST_RUN_END==="
+
+_WORKERS_DIR = os.path.dirname(os.path.abspath(__file__))
+_BOT_DIR = os.path.abspath(os.path.join(_WORKERS_DIR, ".."))
+
+# Módulos que cada camino importa al arrancar. Se cargan una sola vez.
+_PRELOAD_MODULES = (
+    "pyautogui",
+    "PIL.Image",
+    "PIL.ImageGrab",
+    "pynput.keyboard",
+    "pynput.mouse",
+    "mss",
+    "pyperclip",
+    "common_utils",
+    "shared.coords",
+    "shared.mouse",
+    "shared.keyboard",
+    "shared.clipboard",
+    "shared.capture",
+    "shared.io_worker",
+    "shared.amounts",
+    "shared.parsing",
+    "shared.validate",
+    "shared.logging_utils",
+    "shared.flows.entrada_cliente",
+    "shared.flows.ver_todos",
+    "shared.flows.validar_cliente",
+    "shared.flows.telefonico",
+    "shared.flows.extraer_dni_cuit",
+    "shared.flows.score",
+    "shared.flows.buscar_deudas_cuenta",
+    "shared.flows.iterar_registros",
+    "shared.flows.cerrar_y_home",
+    # caminos que scripts/deudas.py ejecuta in-process (DEUDAS_IN_PROCESS)
+    "camino_score",
+    "camino_score_corto",
+    "camino_deudas_principal",
+    "camino_deudas_provisorio",
+    "camino_deudas_admin",
+    "camino_score_deudas",
+)
+
+
+def _log(msg: str) -> None:
+    print(f"[camino_host] {msg}", file=sys.stderr, flush=True)
+
+
+def _preload() -> None:
+    """Importa los módulos pesados y deja el JSON master en cache."""
+    for path in (_BOT_DIR, _WORKERS_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    t0 = time.time()
+    for name in _PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            _log(f"WARN no se pudo precargar {name}: {e}")
+
+    try:
+        from shared import coords
+        coords.load_master()
+    except SystemExit:
+        _log("WARN shared/coords.json no se pudo cargar en la precarga")
+    except Exception as e:
+        # CoordsError: claves mal escritas / faltantes. Cada camino va a fallar
+        # al arrancar (antes del primer click) hasta que se corrija coords.json.
+        _log(f"ERROR coords.json invalido: {e}")
+
+    _log(f"precarga completa en {time.time() - t0:.2f}s")
+
+
+def _exit_code(exc: SystemExit) -> int:
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    # sys.exit("mensaje") -> mensaje a stderr y código 1 (igual que el intérprete)
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_script(script: str, argv: list) -> int:
+    """Ejecuta `script` como __main__ en este proceso. Retorna el returncode."""
+    saved_argv = sys.argv[:]
+    saved_path = sys.path[:]
+    sys.argv = [script] + [str(a) for a in argv]
+    # Los clicks que AUTOTUNE no llego a juzgar en la tarea anterior no cuentan para esta
+    autotune = sys.modules.get("shared.autotune")
+    if autotune is not None:
+        autotune.reiniciar()
+    try:
+        runpy.run_path(script, run_name="__main__")
+        return 0
+    except SystemExit as e:
+        return _exit_code(e)
+    except KeyboardInterrupt:
+        return 130
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+def main() -> int:
+    _preload()
+    print(HOST_READY, flush=True)
+
+    for raw in sys.stdin:
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            request = json.loads(raw)
+            run_id = request.get("id")
+            script = request["script"]
+            argv = request.get("argv", [])
+        except Exception as e:
+            _log(f"ERROR pedido inválido: {e}")
+            continue
+
+        t0 = time.time()
+        if not os.path.exists(script):
+            print(f"Script no encontrado: {script}", file=sys.stderr, flush=True)
+            returncode = 2
+        else:
+            returncode = _run_script(script, argv)
+        _log(f"corrida {run_id} terminada rc={returncode} en {time.time() - t0:.1f}s")
+
+        print(f"{HOST_RUN_END} {json.dumps({'id': run_id, 'returncode': returncode})}", flush=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
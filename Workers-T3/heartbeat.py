@@ -0,0 +1,110 @@
+"""
+HeartbeatMonitor: reporta que el worker está vivo desde un thread propio.
+
+Responsabilidades:
+  - Mandar el heartbeat cada `interval` segundos, independiente del loop
+    principal y del runner: un backend lento no frena la lectura del stdout
+    del camino ni los chequeos de timeout
+  - Usar un heartbeat corto (sin reintentos, timeout propio)
+  - Circuit breaker: tras `failure_threshold` fallos seguidos deja de
+    insistir durante `cooldown` segundos y después prueba con un solo
+    heartbeat; si responde, vuelve al ritmo normal
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"        # heartbeats normales
+OPEN = "open"            # backend caído: no se envía hasta que pase el cooldown
+HALF_OPEN = "half_open"  # un heartbeat de prueba tras el cooldown
+
+
+class HeartbeatMonitor:
+    def __init__(
+        self,
+        beat_fn: Callable[[], bool],  # BackendClient.heartbeat
+        interval: float = 30.0,
+        failure_threshold: int = 3,
+        cooldown: float = 120.0,
+    ):
+        self.beat_fn = beat_fn
+        self.interval = interval
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._last_ok: Optional[float] = None
+        self._last_latency = 0.0
+
+    # ── Ciclo de vida ────────────────────────────────────────────────
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="heartbeat", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ── Thread ───────────────────────────────────────────────────────
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.beat()
+
+    def beat(self):
+        """Un ciclo del breaker: envía el heartbeat salvo que el circuito esté abierto."""
+        with self._lock:
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return
+                self._state = HALF_OPEN
+
+        t0 = time.monotonic()
+        try:
+            ok = bool(self.beat_fn())
+        except Exception as e:
+            logger.debug(f"[HEARTBEAT] Error: {e}")
+            ok = False
+        latency = time.monotonic() - t0
+
+        with self._lock:
+            self._last_latency = latency
+            if ok:
+                if self._state != CLOSED:
+                    logger.info("[HEARTBEAT] Backend respondió — circuito cerrado")
+                self._state = CLOSED
+                self._failures = 0
+                self._last_ok = time.time()
+                return
+
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning(
+                        f"[HEARTBEAT] {self._failures} fallos seguidos — circuito abierto "
+                        f"(reintento en {self.cooldown:.0f}s)"
+                    )
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+            else:
+                logger.warning(f"[HEARTBEAT] Falló ({self._failures}/{self.failure_threshold})")
+
+    # ── Métricas ─────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state":                self._state,
+                "consecutive_failures": self._failures,
+                "last_ok_ago_s":        round(time.time() - self._last_ok, 1) if self._last_ok else None,
+                "last_latency_ms":      round(self._last_latency * 1000, 1),
+            }
@@ -0,0 +1,225 @@
+"""
+Métricas del worker en formato de texto Prometheus (ruta /metrics del health server).
+
+Responsabilidades:
+  - Histogramas y contadores con labels, thread-safe, sin dependencias
+    externas (no hace falta prometheus_client en las VMs)
+  - Métricas de la tarea: duración total por tipo, tiempo hasta el primer
+    partial y tiempo en cada etapa del camino (el `etapa` de send_partial)
+  - Métricas de infraestructura: arranque del script, latencia de envío de
+    updates, profundidad de cola (gauges que se leen al hacer el scrape)
+
+Todas las series llevan `pc_id` como label fijo, para comparar las VMs entre sí.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+# ── Primitivas ───────────────────────────────────────────────────────
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _fmt_num(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _labels(self, key: tuple, const: dict, **extra) -> str:
+        return _fmt_labels({**const, **dict(zip(self.labelnames, key)), **extra})
+
+    def render(self, const: dict) -> list:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self, const):
+        lines = super().render(const)
+        with self._lock:
+            for key, value in self._values.items():
+                lines.append(f"{self.name}{self._labels(key, const)} {_fmt_num(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=(0.1, 0.5, 1, 5, 10, 60)):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[tuple, list] = {}  # key -> [counts por bucket..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self, const):
+        lines = super().render(const)
+        with self._lock:
+            for key, series in self._series.items():
+                for bound, count in zip(self.buckets, series):
+                    lines.append(
+                        f"{self.name}_bucket{self._labels(key, const, le=_fmt_num(bound))} {count}"
+                    )
+                lines.append(f"{self.name}_sum{self._labels(key, const)} {series[-2]:.6f}")
+                lines.append(f"{self.name}_count{self._labels(key, const)} {series[-1]}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Gauge calculado al hacer el scrape (fn sin argumentos → número)."""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, fn: Callable[[], float]):
+        super().__init__(name, help_text)
+        self.fn = fn
+
+    def render(self, const):
+        lines = super().render(const)
+        try:
+            value = float(self.fn())
+        except Exception:
+            return []
+        lines.append(f"{self.name}{_fmt_labels(const)} {_fmt_num(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.const_labels: Dict[str, str] = {}
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render(self.const_labels))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def gauge(name: str, help_text: str, fn: Callable[[], float]):
+    REGISTRY.register(Gauge(name, help_text, fn))
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# ── Métricas del worker ──────────────────────────────────────────────
+TASK_DURATION = REGISTRY.register(Histogram(
+    "t3_task_duration_seconds", "Duración total de la tarea (inicio a completed/error)",
+    ("tipo", "status"), buckets=(5, 10, 30, 60, 120, 300, 600, 900, 1200, 1800),
+))
+TASK_FIRST_PARTIAL = REGISTRY.register(Histogram(
+    "t3_task_first_partial_seconds", "Tiempo desde el inicio de la tarea hasta el primer partial del camino",
+    ("tipo",), buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, 120),
+))
+STAGE_DURATION = REGISTRY.register(Histogram(
+    "t3_stage_duration_seconds", "Tiempo en cada etapa del camino (hasta el próximo cambio de etapa o el fin)",
+    ("tipo", "etapa"), buckets=(0.5, 1, 2, 5, 10, 30, 60, 120, 300, 600),
+))
+TASKS_TOTAL = REGISTRY.register(Counter(
+    "t3_tasks_total", "Tareas terminadas por tipo y estado final", ("tipo", "status"),
+))
+SCRIPT_STARTUP = REGISTRY.register(Histogram(
+    "t3_script_startup_seconds", "Tiempo desde el lanzamiento del script hasta su primera línea de stdout",
+    ("runner",), buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20),
+))
+UPDATE_SEND = REGISTRY.register(Histogram(
+    "t3_update_send_seconds", "Latencia de envío de un update (o lote) al backend",
+    ("result",), buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 3),
+))
+
+
+# ── Seguimiento de una tarea ─────────────────────────────────────────
+class TaskMetrics:
+    """Envuelve el send_update de una tarea y mide primer partial, etapas y duración.
+
+    Misma firma que UpdateSender.send_update: se pasa al runner y a los
+    handlers en su lugar. El primer estado final (completed/error) cierra la
+    medición; lo que llegue después se reenvía sin medir.
+    """
+
+    def __init__(self, sender, tipo: str, start_time: Optional[float] = None):
+        self._sender = sender
+        self.tipo = tipo
+        self.start = start_time or time.time()
+        self._first_partial = False
+        self._etapa: Optional[str] = None
+        self._etapa_since = self.start
+        self._done = False
+
+    def send_update(self, task_id: str, partial_data: dict, status: str = "running") -> bool:
+        if not self._done:
+            self._observe(partial_data, status)
+        return self._sender.send_update(task_id, partial_data, status)
+
+    def _observe(self, partial_data: dict, status: str):
+        now = time.time()
+        etapa = partial_data.get("etapa")
+        if status == "running" and etapa:
+            if not self._first_partial:
+                self._first_partial = True
+                TASK_FIRST_PARTIAL.observe(now - self.start, tipo=self.tipo)
+            if etapa != self._etapa:
+                self._close_stage(now)
+                self._etapa, self._etapa_since = etapa, now
+        elif status in ("completed", "error"):
+            self._done = True
+            self._close_stage(now)
+            TASK_DURATION.observe(now - self.start, tipo=self.tipo, status=status)
+            TASKS_TOTAL.inc(tipo=self.tipo, status=status)
+
+    def _close_stage(self, now: float):
+        if self._etapa is not None:
+            STAGE_DURATION.observe(now - self._etapa_since, tipo=self.tipo, etapa=self._etapa)
@@ -0,0 +1,133 @@
+"""
+Outbox: journal en disco (SQLite) de updates que el backend todavía no confirmó.
+
+Responsabilidades:
+  - Guardar antes de enviar (write-ahead) los estados finales completed/error:
+    si el worker muere en medio del envío, el resultado sigue en disco
+  - Guardar los partials que no se pudieron enviar ni por WS ni por HTTP
+  - Devolver lo pendiente en orden de llegada para reenviarlo cuando vuelve
+    la conexión, y borrar cada entrada cuando el backend la acepta
+  - Compactar el archivo cuando el journal queda vacío
+
+Un resultado de deudas puede llevar 20 minutos de clicks en T3: un corte de
+red de unos segundos no debe obligar a repetir ese trabajo. Si el worker muere
+entre el envío y el ack (o la respuesta no llega), al reenviar llega un
+duplicado del mismo update (entrega al-menos-una-vez). Cada entrada tiene un
+`update_id` estable (origen del archivo + id de la entrada) que viaja con
+cada envío para que el backend descarte los repetidos.
+
+Lo usa un solo thread (el de UpdateSender); el lock cubre las lecturas de
+`pending` desde /health.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_COMPACT_MIN_FREE_PAGES = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id    TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+)
+"""
+
+
+class Outbox:
+    def __init__(self, path: str, max_entries: int = 5000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(_SCHEMA)
+        # Origen al azar por archivo: si el journal se borra, los ids nuevos no
+        # chocan con los que el backend ya vio
+        self._db.execute(
+            "INSERT OR IGNORE INTO meta (clave, valor) VALUES ('origen', ?)", (uuid.uuid4().hex,)
+        )
+        self.origen = self._db.execute("SELECT valor FROM meta WHERE clave = 'origen'").fetchone()[0]
+        self._pending = self._db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+        if self._pending:
+            logger.warning(f"[OUTBOX] {self._pending} updates pendientes de una ejecución anterior")
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+    # ── Escritura ────────────────────────────────────────────────────
+    def append(self, task_id: str, partial_data: dict, status: str) -> int:
+        """Guarda un update. Retorna su id, o 0 si se descartó por journal lleno.
+
+        Con el journal lleno solo se descartan partials 'running': un estado
+        final siempre se guarda.
+        """
+        with self._lock:
+            if status == "running" and self._pending >= self.max_entries:
+                logger.warning(f"[OUTBOX] Journal lleno ({self.max_entries}) — descartando partial {task_id}")
+                return 0
+            cur = self._db.execute(
+                "INSERT INTO outbox (task_id, status, payload, created_at) VALUES (?, ?, ?, ?)",
+                (task_id, status, json.dumps(partial_data, ensure_ascii=False), time.time()),
+            )
+            self._pending += 1
+            return cur.lastrowid
+
+    def ack(self, entry_id: int):
+        """El backend aceptó la entrada: se borra del journal."""
+        with self._lock:
+            cur = self._db.execute("DELETE FROM outbox WHERE id = ?", (entry_id,))
+            self._pending -= cur.rowcount
+            empty = self._pending == 0
+        if empty:
+            self.compact()
+
+    def update_id(self, entry_id: int) -> str:
+        """Clave de idempotencia de la entrada (la misma en cada reenvío)."""
+        return f"{self.origen}-{entry_id}"
+
+    # ── Lectura ──────────────────────────────────────────────────────
+    def peek(self, limit: int = 100) -> List[Tuple[int, str, dict, str]]:
+        """Primeras `limit` entradas pendientes, en orden: (id, task_id, partial_data, status)."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, task_id, payload, status FROM outbox ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        return [(row[0], row[1], json.loads(row[2]), row[3]) for row in rows]
+
+    # ── Mantenimiento ────────────────────────────────────────────────
+    def compact(self):
+        """Devuelve al sistema el espacio de las entradas ya confirmadas.
+
+        Solo con el journal vacío y si quedaron páginas libres suficientes: el
+        caso normal (un final por tarea, confirmado enseguida) no paga el VACUUM.
+        """
+        with self._lock:
+            if self._pending:
+                return
+            free_pages = self._db.execute("PRAGMA freelist_count").fetchone()[0]
+            if free_pages < _COMPACT_MIN_FREE_PAGES:
+                return
+            try:
+                self._db.execute("VACUUM")
+            except sqlite3.Error as e:
+                logger.debug(f"[OUTBOX] VACUUM falló: {e}")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
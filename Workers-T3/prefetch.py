@@ -0,0 +1,123 @@
+"""
+TaskPrefetcher: pide la próxima tarea mientras el camino actual está cerrando.
+
+Responsabilidades:
+  - Disparar `get_task` en segundo plano cuando el camino avisa la fase
+    `cerrar_y_home` (marcador [FASE] en stdout), en vez de esperar a que
+    termine la tarea y al próximo trigger WS / poll
+  - Retener la tarea obtenida bajo un lease con vencimiento
+  - Entregarla al loop principal apenas T3 vuelve a home
+
+Si el lease vence antes de que el loop la tome (la tarea actual se colgó en el
+cierre), se intenta devolverla al backend con `release_fn`. Si el backend no la
+acepta, la tarea se conserva y se ejecuta igual: nunca se descarta una tarea.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+FASE_CIERRE = "cerrar_y_home"
+
+
+class TaskPrefetcher:
+    def __init__(
+        self,
+        fetch_fn: Callable[[], Optional[dict]],
+        release_fn: Callable[[str], bool],
+        lease_ttl: float = 90.0,
+    ):
+        self.fetch_fn = fetch_fn
+        self.release_fn = release_fn
+        self.lease_ttl = lease_ttl
+
+        self._lock = threading.Lock()
+        self._fetch_thread: Optional[threading.Thread] = None
+        self._task: Optional[dict] = None
+        self._lease_expires = 0.0
+        self._lease_timer: Optional[threading.Timer] = None
+
+    # ── Disparo ──────────────────────────────────────────────────────
+    def on_phase(self, fase: dict):
+        """Callback del runner: arranca el prefetch al entrar en la fase de cierre."""
+        if fase.get("fase") == FASE_CIERRE:
+            self.trigger()
+
+    def trigger(self):
+        """Pide la próxima tarea en un thread. No-op si ya hay una pedida o retenida."""
+        with self._lock:
+            if self._task is not None:
+                return
+            if self._fetch_thread is not None and self._fetch_thread.is_alive():
+                return
+            self._fetch_thread = threading.Thread(target=self._fetch, daemon=True)
+            self._fetch_thread.start()
+
+    def _fetch(self):
+        t0 = time.time()
+        try:
+            task = self.fetch_fn()
+        except Exception as e:
+            logger.warning(f"[PREFETCH] Error obteniendo tarea: {e}")
+            return
+        if not task:
+            logger.info(f"[PREFETCH] Sin tarea en cola ({time.time() - t0:.2f}s)")
+            return
+
+        with self._lock:
+            self._task = task
+            self._lease_expires = time.time() + self.lease_ttl
+            self._lease_timer = threading.Timer(self.lease_ttl, self._expire)
+            self._lease_timer.daemon = True
+            self._lease_timer.start()
+        logger.info(
+            f"[PREFETCH] Tarea {task.get('task_id')} retenida "
+            f"(lease {self.lease_ttl:.0f}s, fetch {time.time() - t0:.2f}s)"
+        )
+
+    # ── Lease ────────────────────────────────────────────────────────
+    def _expire(self):
+        """Vencimiento del lease: devolver la tarea al backend si es posible."""
+        # Se libera con el lock tomado: take() no puede entregar una tarea que
+        # en paralelo se está devolviendo al backend.
+        with self._lock:
+            task = self._task
+            if task is None or time.time() < self._lease_expires:
+                return
+            task_id = task.get("task_id")
+            try:
+                released = self.release_fn(task_id)
+            except Exception as e:
+                logger.warning(f"[PREFETCH] Error liberando {task_id}: {e}")
+                released = False
+            if released:
+                self._task = None
+                self._lease_timer = None
+
+        if released:
+            logger.warning(f"[PREFETCH] Lease vencido: {task_id} devuelta al backend")
+        else:
+            logger.warning(f"[PREFETCH] Lease vencido pero el backend no liberó {task_id} — se ejecuta igual")
+
+    # ── Entrega ──────────────────────────────────────────────────────
+    def take(self) -> Optional[dict]:
+        """Retorna la tarea prefetcheada (o None).
+
+        Si hay un fetch en curso lo espera: la respuesta ya viene en camino y
+        pedir otra en paralelo podría asignarnos dos tareas.
+        """
+        thread = self._fetch_thread
+        if thread is not None and thread.is_alive():
+            thread.join()
+
+        with self._lock:
+            task, self._task = self._task, None
+            if self._lease_timer is not None:
+                self._lease_timer.cancel()
+                self._lease_timer = None
+        if task:
+            logger.info(f"[PREFETCH] Iniciando tarea prefetcheada {task.get('task_id')}")
+        return task
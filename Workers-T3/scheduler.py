@@ -0,0 +1,46 @@
+"""
+Scheduler: timers periódicos del loop principal en una sola cola.
+
+Responsabilidades:
+  - Mantener los jobs periódicos (stats, reconexión WS, poll de
+    respaldo) en un heap ordenado por próximo vencimiento
+  - Ejecutar los vencidos desde el thread del loop (sin threads extra)
+  - Informar cuánto falta para el próximo, para que el loop duerma
+    exactamente hasta ahí o hasta que llegue una tarea
+"""
+
+import heapq
+import itertools
+import logging
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    def __init__(self):
+        self._heap: list = []
+        self._seq = itertools.count()
+
+    def every(self, name: str, interval: float, fn: Callable[[], None], first_delay: Optional[float] = None):
+        """Agenda `fn` cada `interval` segundos (la primera vez tras `first_delay`, default = interval)."""
+        delay = interval if first_delay is None else first_delay
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), name, interval, fn))
+
+    def seconds_until_next(self) -> float:
+        """Segundos hasta el próximo job (0 si ya hay uno vencido)."""
+        if not self._heap:
+            return 60.0
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def run_pending(self):
+        """Ejecuta los jobs vencidos y los reagenda desde ahora."""
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, name, interval, fn = heapq.heappop(self._heap)
+            try:
+                fn()
+            except Exception as e:
+                logger.error(f"[SCHEDULER] Error en job '{name}': {e}")
+            heapq.heappush(self._heap, (time.monotonic() + interval, next(self._seq), name, interval, fn))
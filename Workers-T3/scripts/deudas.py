@@ -2,24 +2,41 @@
 
 Modos:
   admin_mode=True  -> camino_deudas_admin (score + deudas en un camino)
+  admin_mode=False, modo 'normal' y DEUDAS_FUSIONADO=1 (default)
+                   -> camino_score_deudas (score + deudas en una navegacion;
+                      score_obtenido sale apenas se lee el score)
   admin_mode=False -> camino_score primero; si score==80:
-                       modo 'normal':     camino_deudas_principal (full)
+                       modo 'normal':     camino_deudas_principal (full); con
+                                          DEUDAS_REUSAR_CLIENTE=1 (default) sigue
+                                          desde la pantalla del cliente que dejo
+                                          camino_score, con su tabla de Ver Todos
                        modo 'validacion': camino_deudas_provisorio (umbral)
                          si exit==42:    camino_score_corto (score=98, silencio)
                          si exit==0:     deudas < umbral, resultado normal
 
 Modo y umbral se leen de Bot_T3/modo_config.json (default: normal, 60000).
+
+Ejecucion de los caminos:
+  DEUDAS_IN_PROCESS=1 (default) -> se importan y se llama a su run() en este
+      proceso. El resultado llega como dict y los marcadores [CUENTAS_TOTAL] /
+      [CUENTA_ITEM] por callback (io_worker.capturar), sin pasar por stdout.
+  DEUDAS_IN_PROCESS=0 -> un subprocess por camino (aislamiento total). Tambien
+      se usa automaticamente si el import del camino falla.
 """
 import base64
+import contextlib
 import glob
+import importlib
 import io
 import json
 import os
-import re
 import subprocess
 import sys
+import tempfile
 import threading
 import time
+import traceback
+from pathlib import Path
 
 from PIL import Image
 
@@ -41,11 +58,20 @@ _CAMINO_SCORE = os.path.join(_BOT_DIR, 'camino_score.py')
 _CAMINO_SCORE_CORTO = os.path.join(_BOT_DIR, 'camino_score_corto.py')
 _CAMINO_DEUDAS_ADMIN = os.path.join(_BOT_DIR, 'camino_deudas_admin.py')
 _CAMINO_DEUDAS_PRIN = os.path.join(_BOT_DIR, 'camino_deudas_principal.py')
+_CAMINO_SCORE_DEUDAS = os.path.join(_BOT_DIR, 'camino_score_deudas.py')
 _CAMINO_DEUDAS_PROV = os.path.join(_BOT_DIR, 'camino_deudas_provisorio.py')
 
 MAX_IMAGE_BYTES = 2_000_000
 EXIT_UMBRAL = 42
 
+if _BOT_DIR not in sys.path:
+    sys.path.insert(0, _BOT_DIR)
+from shared import io_worker, tracing, wait  # noqa: E402
+
+IN_PROCESS = os.getenv('DEUDAS_IN_PROCESS', '1').lower() in ('1', 'true', 'yes', 'on')
+FUSIONADO = os.getenv('DEUDAS_FUSIONADO', '1').lower() in ('1', 'true', 'yes', 'on')
+REUSAR_CLIENTE = os.getenv('DEUDAS_REUSAR_CLIENTE', '1').lower() in ('1', 'true', 'yes', 'on')
+
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
 def _send_partial(dni, etapa, info, score="", extra_data=None):
@@ -153,46 +179,232 @@ def _run_subprocess(cmd, timeout, on_line=None):
     return ''.join(stdout_lines), proc.returncode
 
 
+class _LineTee(io.TextIOBase):
+    """stdout de un camino in-process: cada linea va a stderr y a `on_line`.
+
+    Equivale al espejo que hace _run_subprocess con el stdout del hijo, asi
+    los logs del camino no se mezclan con los marcadores que lee el worker.
+    """
+
+    def __init__(self, on_line=None):
+        super().__init__()
+        self._on_line = on_line
+        self._buf = ''
+        self._lines = []
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        self._buf += s
+        while '\n' in self._buf:
+            line, self._buf = self._buf.split('\n', 1)
+            self._emit(line + '\n')
+        return len(s)
+
+    def flush(self):
+        if self._buf:
+            line, self._buf = self._buf, ''
+            self._emit(line)
+
+    def _emit(self, line):
+        self._lines.append(line)
+        print(line.rstrip(), file=sys.stderr)
+        if self._on_line:
+            self._on_line(line)
+
+    def getvalue(self):
+        return ''.join(self._lines)
+
+
+def _import_camino(script):
+    """Importa el modulo de un camino (camino_x.py -> camino_x). None si falla."""
+    if _BOT_DIR not in sys.path:
+        sys.path.insert(0, _BOT_DIR)
+    nombre = os.path.splitext(os.path.basename(script))[0]
+    try:
+        return importlib.import_module(nombre)
+    except Exception as e:
+        print(f"[deudas] WARN no se pudo importar {nombre} ({e}), usando subprocess",
+              file=sys.stderr)
+        return None
+
+
+def _exit_code(exc):
+    if exc.code is None:
+        return 0
+    return exc.code if isinstance(exc.code, int) else 1
+
+
+def _fase_handler(fase_final):
+    """Callback para [FASE] de un camino.
+
+    Solo se reenvia al worker la fase de cierre del camino que termina la tarea
+    (el worker la usa para prefetch). `fase_final` es bool o fn(payload)->bool,
+    ej. camino_score solo es final si el score no es 80.
+    """
+    def handler(payload):
+        final = fase_final(payload) if callable(fase_final) else bool(fase_final)
+        if final:
+            print(f"[FASE] {json.dumps(payload, ensure_ascii=False)}", flush=True)
+    return handler
+
+
+def _run_in_process(modulo, run_kwargs, dni, on_line=None, on_fase=None):
+    """Llama a `modulo.run(**run_kwargs)` en este proceso. Retorna (data, returncode).
+
+    - [CUENTAS_TOTAL] / [CUENTA_ITEM] llegan por callback como dict.
+    - print_json_result deja el resultado en la captura (sin JSON de por medio).
+    - sys.exit(n) del camino (ej. 42 del provisorio) se traduce a returncode.
+    - El resto del stdout (logs [CaminoX]) pasa por `on_line` igual que en subprocess.
+    """
+    from shared import io_worker
+
+    real_stdout = sys.stdout
+
+    def _en_stdout_real(fn):
+        # Los callbacks emiten partials hacia el worker: tienen que escribir en
+        # el stdout real, no en el tee del camino.
+        def wrapper(*args):
+            with contextlib.redirect_stdout(real_stdout):
+                fn(*args)
+        return wrapper
+
+    def on_partial(payload):
+        # Mismo destino que los partials de un camino en subprocess: solo log.
+        print(f"[deudas] partial del camino: {json.dumps(payload, ensure_ascii=False)[:200]}",
+              file=sys.stderr)
+
+    def on_marker(tag, payload):
+        if tag == 'FASE':
+            if on_fase:
+                on_fase(payload)
+            return
+        _handle_progress_marker(tag, payload, dni)
+
+    tee = _LineTee(_en_stdout_real(on_line) if on_line else None)
+    rc = 0
+    with io_worker.capturar(on_partial=on_partial, on_marker=_en_stdout_real(on_marker)) as captura:
+        with contextlib.redirect_stdout(tee):
+            try:
+                modulo.run(**run_kwargs)
+            except SystemExit as e:
+                rc = _exit_code(e)
+            except Exception:
+                traceback.print_exc()
+                rc = 1
+            finally:
+                tee.flush()
+
+    # Un camino que delega por subprocess (ej. camino_deudas_viejo) reimprime el
+    # stdout del hijo: su JSON_RESULT queda en el texto, no en la captura.
+    data = captura.result if captura.result is not None else _parse_result(tee.getvalue())
+    return data, rc
+
+
+def _run_camino(script, cli_args, run_kwargs, timeout, dni, on_line=None, fase_final=False):
+    """Ejecuta un camino (in-process o subprocess) y retorna (data, returncode).
+
+    data es el dict del JSON_RESULT o None si el camino no emitio resultado.
+    Lanza subprocess.TimeoutExpired solo en modo subprocess; in-process el
+    timeout lo controla el worker sobre el proceso completo.
+    """
+    on_fase = _fase_handler(fase_final)
+    nombre = os.path.splitext(os.path.basename(script))[0]
+
+    if IN_PROCESS:
+        modulo = _import_camino(script)
+        if modulo is not None:
+            with tracing.span(nombre, "camino"):
+                return _run_in_process(modulo, run_kwargs, dni, on_line=on_line, on_fase=on_fase)
+
+    def on_line_sub(line):
+        if '[FASE] ' in line:
+            try:
+                on_fase(json.loads(line.split('[FASE] ', 1)[1].strip()))
+            except Exception as e:
+                print(f"[deudas] WARN parseando FASE: {e}", file=sys.stderr)
+            return
+        if on_line:
+            on_line(line)
+
+    # En subprocess el camino escribe su propia traza (los spans internos no cruzan procesos)
+    cmd = [sys.executable, '-u', script] + list(cli_args)
+    with tracing.span(nombre, "camino", subprocess=True):
+        stdout, rc = _run_subprocess(cmd, timeout=timeout, on_line=on_line_sub)
+    return _parse_result(stdout), rc
+
+
 def _parse_result(stdout):
     return parse_json_from_markers(stdout, strict=True)
 
 
 def _emit_result(data):
+    data = io_worker.adjuntar_diagnostico(data)
     print("===JSON_RESULT_START===", flush=True)
     print(json.dumps(data), flush=True)
     print("===JSON_RESULT_END===", flush=True)
 
 
+def _cerrar_cliente(reuso):
+    """camino_score dejo T3 en el cliente (reuso) y no sigue ningun camino: volver a home."""
+    if not (reuso and reuso.get("en_cliente")):
+        return
+    try:
+        from shared import coords
+        from shared.flows.cerrar_y_home import cerrar_y_home
+        cerrar_y_home(coords.load_master(), veces=5, close_tab_key="close_tab_btn1")
+    except Exception as e:
+        print(f"[deudas] WARN no se pudo volver a home desde el cliente: {e}", file=sys.stderr)
+
+
 def _check_script(path):
     if not os.path.exists(path):
         return False, f"Script no encontrado: {path}"
     return True, None
 
 
-def _handle_progress_markers(line, dni):
-    """Detecta [CUENTAS_TOTAL] y [CUENTA_ITEM].
+_PROGRESS_TAGS = ('CUENTAS_TOTAL', 'CUENTA_ITEM')
 
-    - [CUENTAS_TOTAL] {"total": N}  → partial etapa='cuentas_total' (bar init, sin body)
-    - [CUENTA_ITEM]   {"id_fa","saldo"} → partial etapa='cuenta_item' (bar tick;
-      si saldo no vacío, info se llena con "• saldo - ID: id_fa" para el body)
+
+def _handle_progress_markers(line, dni):
+    """Detecta [CUENTAS_TOTAL] y [CUENTA_ITEM] en una linea de stdout.
 
     Returns True si matcheó cualquiera.
     """
-    if '[CUENTAS_TOTAL] ' in line:
+    for tag in _PROGRESS_TAGS:
+        prefix = f'[{tag}] '
+        if prefix in line:
+            try:
+                payload = json.loads(line.split(prefix, 1)[1].strip())
+            except Exception as e:
+                print(f"[deudas] WARN parseando {tag}: {e}", file=sys.stderr)
+                return True
+            _handle_progress_marker(tag, payload, dni)
+            return True
+    return False
+
+
+def _handle_progress_marker(tag, payload, dni):
+    """Convierte un marcador de progreso en partial.
+
+    - CUENTAS_TOTAL {"total": N}  → partial etapa='cuentas_total' (bar init, sin body)
+    - CUENTA_ITEM   {"id_fa","saldo"} → partial etapa='cuenta_item' (bar tick;
+      si saldo no vacío, info se llena con "• saldo - ID: id_fa" para el body)
+    """
+    if tag == 'CUENTAS_TOTAL':
         try:
-            payload = json.loads(line.split('[CUENTAS_TOTAL] ', 1)[1].strip())
             total = int(payload.get('total', 0))
             _send_partial(
                 dni, "cuentas_total", "",
                 extra_data={"total": total},
             )
         except Exception as e:
-            print(f"[deudas] WARN parseando CUENTAS_TOTAL: {e}", file=sys.stderr)
-        return True
+            print(f"[deudas] WARN procesando CUENTAS_TOTAL: {e}", file=sys.stderr)
 
-    if '[CUENTA_ITEM] ' in line:
+    elif tag == 'CUENTA_ITEM':
         try:
-            item = json.loads(line.split('[CUENTA_ITEM] ', 1)[1].strip())
+            item = payload
             id_fa = item.get('id_fa', '?')
             saldo = item.get('saldo', '') or ''
             duplicate = bool(item.get('duplicate'))
@@ -208,10 +420,7 @@ def _handle_progress_markers(line, dni):
                 extra["duplicate"] = True
             _send_partial(dni, "cuenta_item", info, extra_data=extra)
         except Exception as e:
-            print(f"[deudas] WARN parseando CUENTA_ITEM: {e}", file=sys.stderr)
-        return True
-
-    return False
+            print(f"[deudas] WARN procesando CUENTA_ITEM: {e}", file=sys.stderr)
 
 
 # ── Modo admin ─────────────────────────────────────────────────────────────────
@@ -223,8 +432,8 @@ def _run_admin(dni):
         _emit_result({"error": err, "dni": dni})
         sys.exit(1)
 
-    cmd = [sys.executable, '-u', _CAMINO_DEUDAS_ADMIN,
-           '--dni', dni, '--shots-dir', _CAPTURES_DIR]
+    cli_args = ['--dni', dni, '--shots-dir', _CAPTURES_DIR]
+    run_kwargs = {"dni": dni, "master_path": None, "shot_dir": Path(_CAPTURES_DIR)}
 
     def on_line(line):
         if _handle_progress_markers(line, dni):
@@ -245,7 +454,8 @@ def _run_admin(dni):
             _send_partial(dni, "validando_deudas", msg)
 
     try:
-        stdout, rc = _run_subprocess(cmd, timeout=1800, on_line=on_line)
+        data, rc = _run_camino(_CAMINO_DEUDAS_ADMIN, cli_args, run_kwargs,
+                               timeout=1800, dni=dni, on_line=on_line, fase_final=True)
     except subprocess.TimeoutExpired:
         _send_partial(dni, "error_analisis", "Timeout en modo admin")
         _emit_result({"error": "Timeout camino_deudas_admin", "dni": dni})
@@ -256,7 +466,6 @@ def _run_admin(dni):
         _emit_result({"error": f"camino_deudas_admin fallo (codigo {rc})", "dni": dni})
         sys.exit(1)
 
-    data = _parse_result(stdout)
     if not data:
         _send_partial(dni, "error_analisis", "No se pudo obtener informacion del cliente")
         _emit_result({"error": "No se encontro JSON del camino_deudas_admin", "dni": dni})
@@ -268,9 +477,16 @@ def _run_admin(dni):
 
 # ── Modo normal: deudas completas ──────────────────────────────────────────────
 
-def _run_deudas_normal(dni, score_data):
+def _run_deudas_normal(dni, score_data, reuso=None):
+    """reuso: claves internas de camino_score (en_cliente, tabla_ver_todos, fa_data).
+
+    Si camino_deudas_principal no llega a correr desde el cliente, T3 vuelve a
+    home aca (camino_score no lo hizo).
+    """
+    reuso = reuso or {}
     ok, err = _check_script(_CAMINO_DEUDAS_PRIN)
     if not ok:
+        _cerrar_cliente(reuso)
         _send_partial(dni, "error_analisis", "Error de configuracion")
         _emit_result({"error": err, "dni": dni})
         sys.exit(1)
@@ -284,11 +500,26 @@ def _run_deudas_normal(dni, score_data):
     _send_partial(dni, "score_obtenido", f"Score: {score}", score=score,
                   extra_data={"image": img} if img else None)
 
-    def _ejecutar_principal(dni_usar):
-        cmd = [sys.executable, '-u', _CAMINO_DEUDAS_PRIN,
-               '--dni', dni_usar, '--shots-dir', _CAPTURES_DIR]
+    tabla_score = reuso.get("tabla_ver_todos") if reuso.get("en_cliente") else None
+
+    def _ejecutar_principal(dni_usar, fase_final, tabla=None):
+        cli_args = ['--dni', dni_usar, '--shots-dir', _CAPTURES_DIR]
         if ids_cliente:
-            cmd.append(json.dumps(ids_cliente))
+            cli_args.append(json.dumps(ids_cliente))
+        run_kwargs = {
+            "dni": dni_usar,
+            "master_path": None,
+            "shot_dir": Path(_CAPTURES_DIR),
+            "ids_cliente_filter": [str(x) for x in ids_cliente] or None,
+        }
+        tabla_path = None
+        if tabla:
+            # T3 quedo en la pantalla del cliente: sin entrada ni Ver Todos
+            run_kwargs.update(tabla=tabla, fa_data_list=reuso.get("fa_data"), desde_cliente=True)
+            with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+                f.write(tabla)
+                tabla_path = f.name
+            cli_args += ['--tabla-file', tabla_path, '--desde-cliente']
 
         def on_line(line):
             if _handle_progress_markers(line, dni):
@@ -299,18 +530,27 @@ def _run_deudas_normal(dni, score_data):
                 _send_partial(dni, "validando_deudas", msg)
 
         try:
-            stdout, rc = _run_subprocess(cmd, timeout=1800, on_line=on_line)
+            return _run_camino(_CAMINO_DEUDAS_PRIN, cli_args, run_kwargs,
+                               timeout=1800, dni=dni, on_line=on_line, fase_final=fase_final)
         except subprocess.TimeoutExpired:
             print("[deudas] Timeout en camino_deudas_principal", file=sys.stderr)
+            if tabla:
+                _cerrar_cliente(reuso)
             return None, 1
-        return _parse_result(stdout), rc
+        finally:
+            if tabla_path:
+                with contextlib.suppress(OSError):
+                    os.remove(tabla_path)
 
-    deudas_data, rc = _ejecutar_principal(score_data.get("dni", dni))
+    # Si puede haber reintento con DNI fallback, el cierre del primer intento no es el final.
+    # El reintento arranca de cero (entrada con el DNI fallback).
+    deudas_data, rc = _ejecutar_principal(score_data.get("dni", dni), fase_final=not dni_fallback,
+                                          tabla=tabla_score)
 
     if rc == 0 and deudas_data and deudas_data.get("total_deuda") in (None, "$0,00") and dni_fallback:
         print(f"[deudas] Sin fa_saldos con CUIT, reintentando con DNI fallback: {dni_fallback}",
               file=sys.stderr)
-        fallback_data, rc2 = _ejecutar_principal(dni_fallback)
+        fallback_data, rc2 = _ejecutar_principal(dni_fallback, fase_final=True)
         if rc2 == 0 and fallback_data:
             deudas_data = fallback_data
 
@@ -318,6 +558,70 @@ def _run_deudas_normal(dni, score_data):
     sys.exit(0 if rc == 0 else 1)
 
 
+# ── Modo normal fusionado: score + deudas en un camino ─────────────────────────
+
+def _run_score_deudas(dni):
+    ok, err = _check_script(_CAMINO_SCORE_DEUDAS)
+    if not ok:
+        _send_partial(dni, "error_analisis", "Error de configuracion")
+        _emit_result({"error": err, "dni": dni})
+        sys.exit(1)
+
+    cli_args = ['--dni', dni, '--shots-dir', _CAPTURES_DIR]
+    run_kwargs = {"dni": dni, "master_path": None, "shot_dir": Path(_CAPTURES_DIR)}
+    score_enviado = []
+
+    def _enviar_score(score):
+        cap = _latest_capture(dni)
+        img = _get_image_b64(cap)
+        _send_partial(dni, "score_obtenido", f"Score: {score}", score=score,
+                      extra_data={"image": img} if img else None)
+        score_enviado.append(score)
+
+    def on_line(line):
+        if _handle_progress_markers(line, dni):
+            return
+
+        if '[CaminoScore] SCORE_CAPTURADO:' in line:
+            _enviar_score(line.split('SCORE_CAPTURADO:', 1)[-1].strip())
+
+        elif '[CaminoDeudasPrincipal]' in line and 'tiempo estimado' in line:
+            msg = line.split('[CaminoDeudasPrincipal]', 1)[-1].strip()
+            _send_partial(dni, "validando_deudas", msg)
+
+    # Cierre final: el del score si no es 80, el de las deudas si no viene reintento
+    def fase_final(payload):
+        return payload.get("final", True) and io_worker.score_num(payload.get("score")) != 80
+
+    try:
+        data, rc = _run_camino(_CAMINO_SCORE_DEUDAS, cli_args, run_kwargs, timeout=1800,
+                               dni=dni, on_line=on_line, fase_final=fase_final)
+    except subprocess.TimeoutExpired:
+        _send_partial(dni, "error_analisis", "Timeout obteniendo score")
+        _emit_result({"error": "Timeout camino_score_deudas", "dni": dni})
+        sys.exit(1)
+
+    if not data:
+        _send_partial(dni, "error_analisis", "Error al analizar la informacion del cliente")
+        _emit_result({"error": f"camino_score_deudas sin resultado (codigo {rc})", "dni": dni})
+        sys.exit(1)
+
+    # Fraude / no creado no pasan por SCORE_CAPTURADO: el partial sale al final, como antes
+    if not score_enviado:
+        _enviar_score(data.get("score", ""))
+
+    if rc != 0:
+        # El camino fallo despues del score (data = solo el score): error como
+        # en los otros modos; el score ya salio en su partial
+        _send_partial(dni, "error_analisis", "Error al analizar la informacion del cliente")
+        _emit_result({**data, "admin_mode": False,
+                      "error": f"camino_score_deudas fallo (codigo {rc})"})
+        sys.exit(1)
+
+    _emit_result({**data, "admin_mode": False})
+    sys.exit(0)
+
+
 # ── Modo validacion: umbral ────────────────────────────────────────────────────
 
 def _run_deudas_validacion(dni, score_data, umbral):
@@ -331,16 +635,22 @@ def _run_deudas_validacion(dni, score_data, umbral):
     ids_cliente = score_data.get("ids_cliente", [])
     dni_usar = score_data.get("dni", dni)
 
-    cmd = [sys.executable, '-u', _CAMINO_DEUDAS_PROV,
-           '--dni', dni_usar, '--umbral-suma', str(umbral)]
+    cli_args = ['--dni', dni_usar, '--umbral-suma', str(umbral)]
     if ids_cliente:
-        cmd.append(json.dumps(ids_cliente))
+        cli_args.append(json.dumps(ids_cliente))
+    run_kwargs = {
+        "dni": dni_usar,
+        "master_path": None,
+        "umbral": float(umbral),
+        "ids_cliente_filter": [str(x) for x in ids_cliente] or None,
+    }
 
     def on_line(line):
         _handle_progress_markers(line, dni)
 
     try:
-        stdout, rc = _run_subprocess(cmd, timeout=1800, on_line=on_line)
+        prov_data, rc = _run_camino(_CAMINO_DEUDAS_PROV, cli_args, run_kwargs,
+                                    timeout=1800, dni=dni, on_line=on_line, fase_final=True)
     except subprocess.TimeoutExpired:
         _send_partial(dni, "error_analisis", "Timeout en validacion de deudas")
         _emit_result({"error": "Timeout camino_deudas_provisorio", "dni": dni})
@@ -356,10 +666,11 @@ def _run_deudas_validacion(dni, score_data, umbral):
             _emit_result({"error": err2, "dni": dni})
             sys.exit(1)
 
-        cmd_corto = [sys.executable, '-u', _CAMINO_SCORE_CORTO,
-                     '--dni', dni, '--shots-dir', _CAPTURES_DIR]
+        cli_corto = ['--dni', dni, '--shots-dir', _CAPTURES_DIR]
+        kwargs_corto = {"dni": dni, "master_path": None, "shot_dir": Path(_CAPTURES_DIR)}
         try:
-            stdout_corto, rc_corto = _run_subprocess(cmd_corto, timeout=300)
+            corto_data, rc_corto = _run_camino(_CAMINO_SCORE_CORTO, cli_corto, kwargs_corto,
+                                               timeout=300, dni=dni, fase_final=True)
         except subprocess.TimeoutExpired:
             _send_partial(dni, "error_analisis", "Timeout en camino_score_corto")
             _emit_result({"error": "Timeout camino_score_corto", "dni": dni})
@@ -370,7 +681,7 @@ def _run_deudas_validacion(dni, score_data, umbral):
             _emit_result({"error": f"camino_score_corto fallo (codigo {rc_corto})", "dni": dni})
             sys.exit(1)
 
-        corto_data = _parse_result(stdout_corto) or {}
+        corto_data = corto_data or {}
         cap_path = corto_data.get("screenshot")
         img = _get_image_b64(cap_path)
         _send_partial(dni, "score_obtenido", "Score: 98", score="98",
@@ -384,7 +695,7 @@ def _run_deudas_validacion(dni, score_data, umbral):
         sys.exit(1)
 
     # rc == 0: umbral no superado, resultado normal con deudas
-    prov_data = _parse_result(stdout) or {}
+    prov_data = prov_data or {}
     cap = _latest_capture(dni)
     img = _get_image_b64(cap)
     _send_partial(dni, "score_obtenido", f"Score: {score}", score=score,
@@ -403,6 +714,8 @@ def main():
 
         dni = sys.argv[1]
         admin_mode = False
+        tracing.begin(f"deudas_{dni}")
+        wait.begin()
 
         if len(sys.argv) >= 3:
             try:
@@ -431,10 +744,21 @@ def main():
         modo = config["modo"]
         umbral = config["umbral"]
 
-        cmd_score = [sys.executable, '-u', _CAMINO_SCORE,
-                     '--dni', dni, '--shots-dir', _CAPTURES_DIR]
+        if modo == "normal" and FUSIONADO:
+            _run_score_deudas(dni)
+            return
+
+        cli_score = ['--dni', dni, '--shots-dir', _CAPTURES_DIR]
+        kwargs_score = {"dni": dni, "master_path": None, "shot_dir": Path(_CAPTURES_DIR)}
+        if modo == "normal" and REUSAR_CLIENTE:
+            # Con score 80 camino_score queda en el cliente y pasa la tabla de Ver Todos
+            cli_score.append('--continuar-si-80')
+            kwargs_score["continuar_si_80"] = True
         try:
-            stdout_score, rc_score = _run_subprocess(cmd_score, timeout=600)
+            score_data, rc_score = _run_camino(
+                _CAMINO_SCORE, cli_score, kwargs_score, timeout=600, dni=dni,
+                fase_final=lambda p: io_worker.score_num(p.get("score")) != 80,
+            )
         except subprocess.TimeoutExpired:
             _send_partial(dni, "error_analisis", "Timeout obteniendo score")
             _emit_result({"error": "Timeout camino_score", "dni": dni})
@@ -445,18 +769,14 @@ def main():
             _emit_result({"error": f"camino_score fallo (codigo {rc_score})", "dni": dni})
             sys.exit(1)
 
-        score_data = _parse_result(stdout_score)
         if not score_data:
             _send_partial(dni, "error_analisis", "No se pudo obtener informacion del cliente")
             _emit_result({"error": "No se encontro JSON del camino_score", "dni": dni})
             sys.exit(1)
 
+        reuso = {k: score_data.pop(k) for k in io_worker.CLAVES_REUSO if k in score_data}
         score = score_data.get("score", "")
-        try:
-            m = re.search(r"\d+", str(score))
-            score_num = int(m.group(0)) if m else None
-        except Exception:
-            score_num = None
+        score_num = io_worker.score_num(score)
 
         if score_num != 80:
             cap = _latest_capture(dni)
@@ -470,7 +790,7 @@ def main():
         if modo == "validacion":
             _run_deudas_validacion(dni, score_data, umbral)
         else:
-            _run_deudas_normal(dni, score_data)
+            _run_deudas_normal(dni, score_data, reuso)
 
     except SystemExit:
         raise
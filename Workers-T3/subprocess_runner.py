@@ -20,8 +20,26 @@ import time
 from dataclasses import dataclass, field
 from typing import Callable, Optional
 
+import metrics
+
 logger = logging.getLogger(__name__)
 
+PHASE_PREFIX = "[FASE] "
+
+
+def _read_pipe(pipe, q: queue.Queue):
+    """Vuelca cada línea del pipe en la cola; None señala fin de stream."""
+    try:
+        for line in iter(pipe.readline, ""):
+            if line:
+                q.put(line)
+    except UnicodeDecodeError as e:
+        logger.warning(f"[SUBPROCESS] UnicodeDecodeError leyendo pipe: {e}")
+    except Exception as e:
+        logger.error(f"[SUBPROCESS] Error leyendo pipe: {e}")
+    finally:
+        q.put(None)  # Señal de fin de stream
+
 
 @dataclass
 class RunResult:
@@ -35,17 +53,17 @@ class RunResult:
 
 
 class SubprocessRunner:
+    metrics_label = "subprocess"
+
     def __init__(
         self,
         queue_drain_timeout: float = 0.1,
         json_capture_timeout: float = 1.0,
         inactivity_timeout: int = 1200,
-        heartbeat_interval: int = 30,
     ):
         self.queue_drain_timeout = queue_drain_timeout
         self.json_capture_timeout = json_capture_timeout
         self.inactivity_timeout = inactivity_timeout
-        self.heartbeat_interval = heartbeat_interval
 
     def run(
         self,
@@ -53,37 +71,22 @@ class SubprocessRunner:
         timeout: int,
         task_id: str,
         on_update: Callable,     # fn(task_id, partial_data, status)
-        heartbeat_fn: Callable,  # fn() para mantener el worker online
+        on_phase: Optional[Callable] = None,  # fn(fase: dict) al ver [FASE] {...}
     ) -> RunResult:
         """
         Ejecuta cmd_args en un subprocess y monitorea su salida en tiempo real.
 
         - Detecta bloques ===JSON_PARTIAL_START=== / ===JSON_PARTIAL_END===
           y los reenvía inmediatamente via on_update.
+        - Detecta líneas [FASE] {...} (ej. cerrar_y_home) y las pasa a on_phase.
         - Mata el proceso si supera `timeout` o `inactivity_timeout` segundos.
         - En caso de timeout envía el error via on_update y marca runner_handled_error=True.
         - Retorna RunResult con el output completo para que el llamador parsee
           el ===JSON_RESULT_START=== / ===JSON_RESULT_END=== final.
         """
-        env = os.environ.copy()
-        env["PYTHONUNBUFFERED"] = "1"
-        env["PYTHONIOENCODING"] = "utf-8"
-
-        logger.info(f"[SUBPROCESS] Comando: {' '.join(cmd_args[:3])} [datos]...")
-
+        launched = time.time()
         try:
-            process = subprocess.Popen(
-                cmd_args,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                bufsize=0,
-                universal_newlines=True,
-                env=env,
-            )
-            logger.info(f"[SUBPROCESS] Proceso creado. PID={process.pid} | Timeout={timeout}s")
+            process, out_q, err_q = self._launch(cmd_args, timeout)
         except Exception as e:
             logger.error(f"[SUBPROCESS] Error creando proceso: {e}", exc_info=True)
             return RunResult(success=False, returncode=None, stdout="", stderr=str(e))
@@ -91,38 +94,13 @@ class SubprocessRunner:
         output_lines: list[str] = []
         stderr_lines: list[str] = []
 
-        def _read(pipe, q: queue.Queue):
-            try:
-                for line in iter(pipe.readline, ""):
-                    if line:
-                        q.put(line)
-            except UnicodeDecodeError as e:
-                logger.warning(f"[SUBPROCESS] UnicodeDecodeError leyendo pipe: {e}")
-            except Exception as e:
-                logger.error(f"[SUBPROCESS] Error leyendo pipe: {e}")
-            finally:
-                q.put(None)  # Señal de fin de stream
-
-        out_q: queue.Queue = queue.Queue()
-        err_q: queue.Queue = queue.Queue()
-        threading.Thread(target=_read, args=(process.stdout, out_q), daemon=True).start()
-        threading.Thread(target=_read, args=(process.stderr, err_q), daemon=True).start()
-
         start = time.time()
         last_output = start
-        last_heartbeat = start
+        first_output = True
 
         while True:
             now = time.time()
 
-            # Heartbeat periódico durante la ejecución
-            if now - last_heartbeat > self.heartbeat_interval:
-                try:
-                    heartbeat_fn()
-                except Exception:
-                    pass
-                last_heartbeat = now
-
             # Timeout global
             if now - start > timeout:
                 logger.error(f"[TIMEOUT] Timeout global ({timeout}s) excedido — terminando proceso")
@@ -171,6 +149,9 @@ class SubprocessRunner:
                 if line is None:
                     break
                 last_output = time.time()
+                if first_output:
+                    first_output = False
+                    metrics.SCRIPT_STARTUP.observe(last_output - launched, runner=self.metrics_label)
                 output_lines.append(line.strip())
                 line_text = line.strip()
             except queue.Empty:
@@ -182,6 +163,8 @@ class SubprocessRunner:
             # Detectar inicio de bloque JSON_PARTIAL
             if line_text and "===JSON_PARTIAL_START===" in line_text:
                 self._capture_and_send_partial(out_q, output_lines, task_id, on_update)
+            elif on_phase and line_text.startswith(PHASE_PREFIX):
+                self._notify_phase(line_text, on_phase)
 
         # Esperar cierre limpio
         try:
@@ -205,6 +188,45 @@ class SubprocessRunner:
         )
 
     # ── Helpers privados ─────────────────────────────────────────────
+    def _launch(self, cmd_args: list, timeout: int):
+        """Crea el subprocess y los threads lectores. Retorna (process, out_q, err_q)."""
+        env = os.environ.copy()
+        env["PYTHONUNBUFFERED"] = "1"
+        env["PYTHONIOENCODING"] = "utf-8"
+
+        logger.info(f"[SUBPROCESS] Comando: {' '.join(cmd_args[:3])} [datos]...")
+
+        process = subprocess.Popen(
+            cmd_args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=0,
+            universal_newlines=True,
+            env=env,
+        )
+        logger.info(f"[SUBPROCESS] Proceso creado. PID={process.pid} | Timeout={timeout}s")
+
+        out_q: queue.Queue = queue.Queue()
+        err_q: queue.Queue = queue.Queue()
+        threading.Thread(target=_read_pipe, args=(process.stdout, out_q), daemon=True).start()
+        threading.Thread(target=_read_pipe, args=(process.stderr, err_q), daemon=True).start()
+        return process, out_q, err_q
+
+    def _notify_phase(self, line_text: str, on_phase: Callable):
+        try:
+            fase = json.loads(line_text[len(PHASE_PREFIX):])
+        except json.JSONDecodeError as e:
+            logger.warning(f"[FASE] JSON inválido: {e}")
+            return
+        logger.info(f"[FASE] {fase.get('fase', '?')}")
+        try:
+            on_phase(fase)
+        except Exception as e:
+            logger.warning(f"[FASE] Error en callback: {e}")
+
     def _drain_stderr(self, err_q: queue.Queue, stderr_lines: list):
         """Lee todas las líneas disponibles en la cola de stderr sin bloquear."""
         try:
@@ -271,3 +293,224 @@ class SubprocessRunner:
                 logger.warning(f"[STDERR]   {line}")
             if len(stderr_lines) > 20:
                 logger.debug(f"[STDERR-FULL]\n{chr(10).join(stderr_lines)}")
+
+
+class _HostRun:
+    """Vista de una corrida dentro del camino_host con la interfaz mínima de Popen."""
+
+    def __init__(self, host: "CaminoHostRunner", run_id: int, pid: int):
+        self._host = host
+        self.run_id = run_id
+        self.pid = pid
+        self.returncode: Optional[int] = None
+        self._done = threading.Event()
+
+    def _finish(self, returncode: int):
+        self.returncode = returncode
+        self._done.set()
+
+    def poll(self) -> Optional[int]:
+        return self.returncode if self._done.is_set() else None
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        if not self._done.wait(timeout):
+            raise subprocess.TimeoutExpired(f"camino_host run {self.run_id}", timeout)
+        return self.returncode
+
+    def kill(self):
+        # No se puede abortar un camino a mitad de ejecución dentro del host:
+        # se mata el host completo y se relanza en la próxima corrida.
+        self._host.stop()
+        self._finish(-9)
+
+
+class CaminoHostRunner(SubprocessRunner):
+    """
+    SubprocessRunner que ejecuta los scripts dentro de un camino_host persistente.
+
+    El host precarga pyautogui/PIL/pynput/shared.* una sola vez y corre cada
+    script con runpy, evitando el arranque de un intérprete por tarea. El stdout
+    de cada corrida respeta el mismo protocolo (JSON_PARTIAL/JSON_RESULT), por lo
+    que `run()` y los llamadores no cambian. Si el host no puede arrancar se usa
+    el camino clásico de subprocess.
+    """
+
+    metrics_label = "host"
+
+    def __init__(self, python_exe: str, host_start_timeout: float = 60.0, **kwargs):
+        super().__init__(**kwargs)
+        from camino_host import HOST_READY, HOST_RUN_END
+
+        self._ready_marker = HOST_READY
+        self._end_marker = HOST_RUN_END
+        self.python_exe = python_exe
+        self.host_start_timeout = host_start_timeout
+        self._script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "camino_host.py")
+
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._ready = threading.Event()
+        self._run_seq = 0
+        self._current: Optional[_HostRun] = None
+        self._out_q: Optional[queue.Queue] = None
+        self._err_q: Optional[queue.Queue] = None
+
+    # ── Ciclo de vida del host ───────────────────────────────────────
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> bool:
+        """Arranca el host (si no está vivo) y espera a que termine la precarga."""
+        with self._lock:
+            if self.alive and self._ready.is_set():
+                return True
+            self._stop_locked()
+
+            env = os.environ.copy()
+            env["PYTHONUNBUFFERED"] = "1"
+            env["PYTHONIOENCODING"] = "utf-8"
+            t0 = time.time()
+            try:
+                self._process = subprocess.Popen(
+                    [self.python_exe, "-u", self._script],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    encoding="utf-8",
+                    errors="replace",
+                    bufsize=1,
+                    env=env,
+                )
+            except Exception as e:
+                logger.error(f"[HOST] No se pudo lanzar camino_host: {e}")
+                self._process = None
+                return False
+
+            self._ready.clear()
+            process = self._process
+            threading.Thread(target=self._pump_stdout, args=(process,), daemon=True).start()
+            threading.Thread(target=self._pump_stderr, args=(process,), daemon=True).start()
+
+        if not self._ready.wait(self.host_start_timeout):
+            logger.error(f"[HOST] camino_host no quedó listo en {self.host_start_timeout:.0f}s")
+            self.stop()
+            return False
+        logger.info(f"[HOST] camino_host listo PID={self._process.pid} en {time.time() - t0:.1f}s")
+        metrics.SCRIPT_STARTUP.observe(time.time() - t0, runner="host_boot")
+        return True
+
+    def stop(self):
+        with self._lock:
+            self._stop_locked()
+
+    def _stop_locked(self):
+        process, self._process = self._process, None
+        self._ready.clear()
+        if process is None:
+            return
+        try:
+            if process.poll() is None:
+                process.kill()
+                process.wait(timeout=5)
+        except Exception as e:
+            logger.warning(f"[HOST] Error terminando camino_host: {e}")
+
+    # ── Lectura de pipes del host ────────────────────────────────────
+    def _pump_stdout(self, process: subprocess.Popen):
+        try:
+            for line in iter(process.stdout.readline, ""):
+                stripped = line.strip()
+                if stripped == self._ready_marker:
+                    self._ready.set()
+                    continue
+                if stripped.startswith(self._end_marker):
+                    try:
+                        info = json.loads(stripped[len(self._end_marker):].strip())
+                    except Exception:
+                        info = {}
+                    with self._lock:
+                        current, out_q = self._current, self._out_q
+                        if current is None or info.get("id") != current.run_id:
+                            continue
+                        self._clear_current_locked()
+                    current._finish(int(info.get("returncode", 1)))
+                    out_q.put(None)
+                    continue
+                out_q = self._out_q if self._current is not None else None
+                if out_q is not None:
+                    out_q.put(line)
+                elif stripped:
+                    # Salida fuera de una corrida (p. ej. hilos residuales del
+                    # script anterior): no debe mezclarse con la próxima tarea.
+                    logger.debug(f"[HOST-STDOUT] (sin corrida) {stripped}")
+        except Exception as e:
+            logger.error(f"[HOST] Error leyendo stdout del host: {e}")
+        finally:
+            # Host caído: cerrar la corrida en curso para que run() no quede colgado
+            with self._lock:
+                current, out_q = self._current, self._out_q
+                # Sólo la corrida de este host; otra pudo arrancar en un host nuevo
+                if current is not None and current.pid != process.pid:
+                    current = None
+                else:
+                    self._clear_current_locked()
+            if current is not None and current.poll() is None:
+                rc = process.poll()
+                current._finish(rc if rc is not None else -3)
+                if out_q is not None:
+                    out_q.put(None)
+
+    def _clear_current_locked(self):
+        self._current = None
+        self._out_q = None
+        self._err_q = None
+
+    def _pump_stderr(self, process: subprocess.Popen):
+        try:
+            for line in iter(process.stderr.readline, ""):
+                err_q = self._err_q if self._current is not None else None
+                if err_q is not None:
+                    err_q.put(line)
+                elif line.strip():
+                    logger.debug(f"[HOST-STDERR] (sin corrida) {line.strip()}")
+        except Exception:
+            pass
+
+    # ── Lanzamiento de una corrida ───────────────────────────────────
+    @staticmethod
+    def _split_cmd(cmd_args: list) -> tuple:
+        """[python, -u, script.py, a, b] -> (script.py, [a, b])."""
+        for i, arg in enumerate(cmd_args):
+            if str(arg).endswith(".py"):
+                return str(arg), [str(a) for a in cmd_args[i + 1:]]
+        raise ValueError("cmd_args no contiene un script .py")
+
+    def _launch(self, cmd_args: list, timeout: int):
+        if not self.start():
+            logger.warning("[HOST] camino_host no disponible — usando subprocess")
+            return super()._launch(cmd_args, timeout)
+
+        script, argv = self._split_cmd(cmd_args)
+        with self._lock:
+            self._run_seq += 1
+            run = _HostRun(self, self._run_seq, self._process.pid)
+            # Referencias locales: al terminar la corrida el pump limpia los
+            # atributos, pero el consumidor sigue leyendo de estas colas.
+            out_q, err_q = queue.Queue(), queue.Queue()
+            self._out_q, self._err_q = out_q, err_q
+            self._current = run
+            request = json.dumps({"id": run.run_id, "script": script, "argv": argv})
+            try:
+                self._process.stdin.write(request + "\n")
+                self._process.stdin.flush()
+            except Exception as e:
+                self._clear_current_locked()
+                raise RuntimeError(f"No se pudo enviar el pedido al camino_host: {e}")
+
+        logger.info(
+            f"[HOST] Corrida {run.run_id}: {os.path.basename(script)} [datos]... "
+            f"| PID host={run.pid} | Timeout={timeout}s"
+        )
+        return run, out_q, err_q
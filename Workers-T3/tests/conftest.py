@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos del worker se importan por nombre (como los importa worker.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,68 @@
+from outbox import Outbox, _COMPACT_MIN_FREE_PAGES
+
+
+def _outbox(tmp_path, **kwargs):
+    return Outbox(str(tmp_path / "outbox.db"), **kwargs)
+
+
+def test_append_y_peek_en_orden(tmp_path):
+    ob = _outbox(tmp_path)
+    a = ob.append("t1", {"etapa": "a"}, "running")
+    b = ob.append("t1", {"etapa": "b", "info": "ñ"}, "completed")
+    assert a and b and a < b
+    assert ob.pending == 2
+    assert ob.peek() == [
+        (a, "t1", {"etapa": "a"}, "running"),
+        (b, "t1", {"etapa": "b", "info": "ñ"}, "completed"),
+    ]
+
+
+def test_ack_borra_la_entrada(tmp_path):
+    ob = _outbox(tmp_path)
+    a = ob.append("t1", {}, "running")
+    b = ob.append("t1", {}, "completed")
+    ob.ack(a)
+    assert ob.pending == 1
+    assert [e[0] for e in ob.peek()] == [b]
+    ob.ack(a)  # ack repetido no descuenta dos veces
+    assert ob.pending == 1
+
+
+def test_persiste_entre_ejecuciones(tmp_path):
+    ob = _outbox(tmp_path)
+    ob.append("t1", {"info": "x"}, "error")
+    ob.close()
+    ob = _outbox(tmp_path)
+    assert ob.pending == 1
+    assert ob.peek()[0][1:] == ("t1", {"info": "x"}, "error")
+
+
+def test_journal_lleno_solo_descarta_partials(tmp_path):
+    ob = _outbox(tmp_path, max_entries=1)
+    assert ob.append("t1", {}, "running")
+    assert ob.append("t1", {}, "running") == 0
+    assert ob.append("t1", {}, "completed")
+    assert ob.pending == 2
+
+
+def test_compacta_al_vaciarse(tmp_path):
+    ob = _outbox(tmp_path)
+    blob = {"image": "x" * 4096}
+    ids = [ob.append("t1", blob, "running") for _ in range(_COMPACT_MIN_FREE_PAGES * 2)]
+    size_lleno = (tmp_path / "outbox.db").stat().st_size
+    for entry_id in ids:
+        ob.ack(entry_id)
+    assert ob.pending == 0
+    assert ob._db.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert (tmp_path / "outbox.db").stat().st_size < size_lleno
+
+
+def test_update_id_estable_entre_ejecuciones(tmp_path):
+    ob = _outbox(tmp_path)
+    entry_id = ob.append("t1", {}, "completed")
+    update_id = ob.update_id(entry_id)
+    ob.close()
+    ob = _outbox(tmp_path)
+    assert ob.update_id(ob.peek()[0][0]) == update_id
+    otro = Outbox(str(tmp_path / "otro.db"))
+    assert otro.origen != ob.origen
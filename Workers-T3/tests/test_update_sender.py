@@ -0,0 +1,109 @@
+from outbox import Outbox
+from update_sender import UpdateSender
+
+
+class _Backend:
+    """send_fn/confirm_fn falsos: registran las llamadas y responden `ok`."""
+
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.calls = []
+        self.update_ids = []
+
+    def __call__(self, task_id, partial_data, status, update_id=None):
+        self.calls.append((task_id, partial_data.get("etapa"), status))
+        self.update_ids.append(update_id)
+        return self.ok
+
+
+def _sender(tmp_path, send, confirm=None):
+    ob = Outbox(str(tmp_path / "outbox.db"))
+    return UpdateSender(send_fn=send, outbox=ob, replay_interval=0.0, confirm_fn=confirm), ob
+
+
+def test_final_confirmado_se_borra(tmp_path):
+    send, confirm = _Backend(), _Backend()
+    sender, ob = _sender(tmp_path, send, confirm)
+    sender._send("t1", {"etapa": "fin"}, "completed", 0.0)
+    assert confirm.calls == [("t1", "fin", "completed")]
+    assert send.calls == []
+    assert ob.pending == 0
+
+
+def test_final_sin_confirmacion_queda_en_el_journal(tmp_path):
+    # El WS "envió" (send_fn True) pero el backend no confirmó por HTTP
+    send, confirm = _Backend(ok=True), _Backend(ok=False)
+    sender, ob = _sender(tmp_path, send, confirm)
+    sender._send("t1", {"etapa": "fin"}, "completed", 0.0)
+    assert ob.pending == 1
+    assert ob.peek()[0][1:] == ("t1", {"etapa": "fin"}, "completed")
+
+
+def test_partial_va_por_send_fn_y_no_toca_el_journal(tmp_path):
+    send, confirm = _Backend(), _Backend()
+    sender, ob = _sender(tmp_path, send, confirm)
+    sender._send("t1", {"etapa": "a"}, "running", 0.0)
+    assert send.calls == [("t1", "a", "running")]
+    assert confirm.calls == []
+    assert ob.pending == 0
+
+
+def test_partial_fallido_se_guarda(tmp_path):
+    sender, ob = _sender(tmp_path, _Backend(ok=False), _Backend())
+    sender._send("t1", {"etapa": "a"}, "running", 0.0)
+    assert ob.pending == 1
+
+
+def test_replay_en_orden_con_confirmacion(tmp_path):
+    send, confirm = _Backend(), _Backend()
+    sender, ob = _sender(tmp_path, send, confirm)
+    ob.append("t1", {"etapa": "a"}, "running")
+    ob.append("t1", {"etapa": "b"}, "completed")
+    ob.append("t2", {"etapa": "c"}, "error")
+    assert sender._replay() is True
+    assert confirm.calls == [("t1", "a", "running"), ("t1", "b", "completed"), ("t2", "c", "error")]
+    assert send.calls == []
+    assert ob.pending == 0
+
+
+def test_replay_se_corta_en_el_primer_fallo(tmp_path):
+    confirm_calls = 0
+
+    def confirm_fn(task_id, partial_data, status, update_id=None):
+        nonlocal confirm_calls
+        confirm_calls += 1
+        return confirm_calls == 1
+
+    sender, ob = _sender(tmp_path, _Backend(), confirm_fn)
+    ob.append("t1", {"etapa": "a"}, "running")
+    ob.append("t1", {"etapa": "b"}, "completed")
+    ob.append("t1", {"etapa": "c"}, "completed")
+    assert sender._replay() is False
+    assert confirm_calls == 2
+    assert [e[2]["etapa"] for e in ob.peek()] == ["b", "c"]
+
+
+def test_dispatch_con_journal_pendiente_encola_detras(tmp_path):
+    sender, ob = _sender(tmp_path, _Backend(ok=True), _Backend(ok=False))
+    ob.append("t1", {"etapa": "a"}, "completed")
+    sender._dispatch([("t1", {"etapa": "b"}, "running", 0.0)])
+    assert [e[2]["etapa"] for e in ob.peek()] == ["a", "b"]
+
+
+def test_sin_confirm_fn_usa_send_fn(tmp_path):
+    send = _Backend()
+    sender, ob = _sender(tmp_path, send)
+    sender._send("t1", {"etapa": "fin"}, "completed", 0.0)
+    assert send.calls == [("t1", "fin", "completed")]
+    assert ob.pending == 0
+
+
+def test_reenvio_con_el_mismo_update_id(tmp_path):
+    confirm = _Backend(ok=False)
+    sender, ob = _sender(tmp_path, _Backend(), confirm)
+    sender._send("t1", {"etapa": "fin"}, "completed", 0.0)
+    confirm.ok = True
+    assert sender._replay() is True
+    assert len(confirm.update_ids) == 2
+    assert confirm.update_ids[0] == confirm.update_ids[1]
+    assert confirm.update_ids[0].startswith(ob.origen)
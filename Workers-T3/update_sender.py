@@ -0,0 +1,308 @@
+"""
+UpdateSender: cola de salida de updates hacia el backend con un thread propio.
+
+Responsabilidades:
+  - Desacoplar la lectura del stdout del camino del envío al backend: el
+    runner y los handlers solo encolan, nunca esperan al WS/HTTP
+  - Enviar en un único thread (WS primero, HTTP de respaldo vía
+    BackendClient.send_update), lo que preserva el orden por task_id
+  - Cola acotada: los partials 'running' se descartan si está llena; los
+    estados finales (completed/error) esperan lugar y nunca se descartan
+  - Coalescing opcional: partials 'running' de la misma tarea y la misma etapa
+    que llegan dentro de `coalesce_window` se mandan juntos en un solo
+    task_update_batch. Un cambio de etapa, un error o el resultado final
+    cortan el lote y se envían sin esperar
+  - Con un Outbox: los finales se escriben a disco antes de enviarse y lo que
+    falla queda en el journal; se reenvía en orden cuando vuelve la conexión
+    (antes que cualquier update nuevo, para no desordenar la tarea). Una
+    entrada solo se borra si el backend la confirmó (`confirm_fn`, HTTP con
+    status ok): que el mensaje haya salido por el WS no alcanza. Cada envío
+    de una entrada lleva su `update_id` para que el backend descarte reenvíos
+  - Métricas: profundidad de cola, latencia de envío, enviados/fallidos/descartados
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+import metrics
+from outbox import Outbox
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "error")
+
+_STOP = object()
+
+
+class UpdateSender:
+    def __init__(
+        self,
+        send_fn: Callable[[str, dict, str], bool],  # BackendClient.send_update
+        maxsize: int = 1000,
+        batch_send_fn: Optional[Callable[[str, list, str], bool]] = None,  # BackendClient.send_update_batch
+        coalesce_window: float = 0.0,
+        max_batch: int = 50,
+        outbox: Optional[Outbox] = None,
+        replay_interval: float = 10.0,
+        confirm_fn: Optional[Callable[..., bool]] = None,  # BackendClient.send_update_confirmed (+ update_id=)
+    ):
+        self._send_fn = send_fn
+        self._confirm_fn = confirm_fn
+        self._batch_send_fn = batch_send_fn
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self._outbox = outbox
+        self.replay_interval = replay_interval
+        self._next_replay = 0.0
+        self._q: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+
+        self._stats_lock = threading.Lock()
+        self._sent = 0
+        self._failed = 0
+        self._dropped = 0
+        self._batches = 0
+        self._send_calls = 0
+        self._send_latency_total = 0.0
+        self._send_latency_max = 0.0
+        self._send_latency_last = 0.0
+        self._queue_wait_last = 0.0
+
+    # ── Ciclo de vida ────────────────────────────────────────────────
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._loop, name="update-sender", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Espera a que se vacíe la cola (hasta `timeout`) y detiene el thread."""
+        if not self.flush(timeout):
+            logger.warning(f"[UPDATES] Cerrando con {self._q.qsize()} updates sin enviar")
+        if self._outbox is not None and self._outbox.pending:
+            logger.warning(f"[OUTBOX] {self._outbox.pending} updates quedan en disco para la próxima ejecución")
+        try:
+            self._q.put_nowait(_STOP)
+        except queue.Full:
+            pass
+
+    def flush(self, timeout: float) -> bool:
+        """Bloquea hasta que todo lo encolado se haya enviado. False si vence `timeout`."""
+        deadline = time.monotonic() + timeout
+        with self._q.all_tasks_done:
+            while self._q.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._q.all_tasks_done.wait(remaining)
+        return True
+
+    # ── Encolado (misma firma que BackendClient.send_update) ─────────
+    def send_update(self, task_id: str, partial_data: dict, status: str = "running") -> bool:
+        """Encola un update. Retorna False solo si se descartó por cola llena."""
+        item = (task_id, partial_data, status, time.monotonic())
+        if status in TERMINAL_STATUSES:
+            self._q.put(item)
+            return True
+        try:
+            self._q.put_nowait(item)
+            return True
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += 1
+            logger.warning(
+                f"[UPDATES] Cola llena ({self._q.maxsize}) — descartando partial "
+                f"{task_id} | {partial_data.get('etapa', '')}"
+            )
+            return False
+
+    # ── Thread de envío ──────────────────────────────────────────────
+    def _loop(self):
+        carry = None
+        while True:
+            if carry is not None:
+                item, carry = carry, None
+            else:
+                try:
+                    item = self._q.get(timeout=self._idle_timeout())
+                except queue.Empty:
+                    self._replay()
+                    continue
+            if item is _STOP:
+                self._q.task_done()
+                return
+
+            batch = [item]
+            try:
+                if self._can_coalesce(item):
+                    carry = self._fill_batch(batch)
+                self._dispatch(batch)
+            finally:
+                for _ in batch:
+                    self._q.task_done()
+
+    def _idle_timeout(self) -> Optional[float]:
+        """Con updates en el journal, despertar para el próximo reintento."""
+        if self._outbox is not None and self._outbox.pending:
+            return max(0.0, self._next_replay - time.monotonic())
+        return None
+
+    def _dispatch(self, batch: list):
+        if self._outbox is not None and self._outbox.pending and not self._replay():
+            # Backend todavía caído: va al journal detrás de lo pendiente
+            for task_id, partial_data, status, _ in batch:
+                self._outbox.append(task_id, partial_data, status)
+            return
+        if len(batch) == 1:
+            self._send(*batch[0])
+        else:
+            self._send_batch(batch)
+
+    def _can_coalesce(self, item) -> bool:
+        return (
+            self.coalesce_window > 0
+            and self._batch_send_fn is not None
+            and item[2] == "running"
+        )
+
+    def _fill_batch(self, batch: list):
+        """Junta en `batch` los partials compatibles que lleguen dentro de la ventana.
+
+        Retorna el primer item que cortó el lote (otra tarea/etapa, estado final,
+        _STOP) para procesarlo a continuación, o None.
+        """
+        task_id, first, _, _ = batch[0]
+        etapa = first.get("etapa")
+        deadline = time.monotonic() + self.coalesce_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                nxt = self._q.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if (
+                nxt is not _STOP
+                and nxt[0] == task_id
+                and nxt[2] == "running"
+                and nxt[1].get("etapa") == etapa
+            ):
+                batch.append(nxt)
+                continue
+            return nxt
+        return None
+
+    def _send(self, task_id: str, partial_data: dict, status: str, enqueued_at: float):
+        entry_id = 0
+        if self._outbox is not None and status in TERMINAL_STATUSES:
+            entry_id = self._outbox.append(task_id, partial_data, status)
+
+        # Lo que está en el journal solo se borra con confirmación del backend
+        t0 = time.monotonic()
+        try:
+            if entry_id:
+                ok = self._confirm(entry_id, task_id, partial_data, status)
+            else:
+                ok = self._send_fn(task_id, partial_data, status)
+        except Exception as e:
+            logger.error(f"[UPDATES] Error enviando update de {task_id}: {e}")
+            ok = False
+        self._record(ok, 1, t0, enqueued_at)
+
+        if self._outbox is None:
+            return
+        if ok and entry_id:
+            self._outbox.ack(entry_id)
+        elif not ok:
+            if not entry_id:
+                self._outbox.append(task_id, partial_data, status)
+            self._next_replay = time.monotonic() + self.replay_interval
+            logger.warning(f"[OUTBOX] Update de {task_id} ({status}) guardado para reenvío")
+
+    def _send_batch(self, batch: list):
+        task_id, _, status, enqueued_at = batch[0]
+        t0 = time.monotonic()
+        try:
+            ok = self._batch_send_fn(task_id, [it[1] for it in batch], status)
+        except Exception as e:
+            logger.error(f"[UPDATES] Error enviando lote de {task_id}: {e}")
+            ok = False
+        with self._stats_lock:
+            self._batches += 1
+        self._record(ok, len(batch), t0, enqueued_at)
+
+        if not ok and self._outbox is not None:
+            for it in batch:
+                self._outbox.append(it[0], it[1], it[2])
+            self._next_replay = time.monotonic() + self.replay_interval
+            logger.warning(f"[OUTBOX] Lote de {len(batch)} updates de {task_id} guardado para reenvío")
+
+    def _replay(self) -> bool:
+        """Reenvía el journal en orden. True si quedó vacío.
+
+        Se corta en el primer fallo (el backend sigue caído) y no se reintenta
+        antes de `replay_interval`, para no pagar un timeout por cada update nuevo.
+        """
+        if time.monotonic() < self._next_replay:
+            return False
+        replayed = 0
+        while True:
+            entries = self._outbox.peek()
+            if not entries:
+                if replayed:
+                    logger.info(f"[OUTBOX] Conexión recuperada: {replayed} updates reenviados")
+                return True
+            for entry_id, task_id, partial_data, status in entries:
+                try:
+                    ok = self._confirm(entry_id, task_id, partial_data, status)
+                except Exception as e:
+                    logger.error(f"[OUTBOX] Error reenviando {task_id}: {e}")
+                    ok = False
+                if not ok:
+                    self._next_replay = time.monotonic() + self.replay_interval
+                    if replayed:
+                        logger.info(f"[OUTBOX] {replayed} updates reenviados, {self._outbox.pending} pendientes")
+                    return False
+                self._outbox.ack(entry_id)
+                replayed += 1
+
+    def _confirm(self, entry_id: int, task_id: str, partial_data: dict, status: str) -> bool:
+        """Envía una entrada del journal; sin confirm_fn, send_fn común."""
+        if self._confirm_fn is None:
+            return self._send_fn(task_id, partial_data, status)
+        return self._confirm_fn(task_id, partial_data, status, update_id=self._outbox.update_id(entry_id))
+
+    def _record(self, ok: bool, count: int, t0: float, enqueued_at: float):
+        latency = time.monotonic() - t0
+        with self._stats_lock:
+            if ok:
+                self._sent += count
+            else:
+                self._failed += count
+            self._send_calls += 1
+            self._send_latency_total += latency
+            self._send_latency_max = max(self._send_latency_max, latency)
+            self._send_latency_last = latency
+            self._queue_wait_last = t0 - enqueued_at
+        metrics.UPDATE_SEND.observe(latency, result="ok" if ok else "error")
+
+    # ── Métricas ─────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        with self._stats_lock:
+            calls = self._send_calls
+            return {
+                "queue_depth":          self._q.qsize(),
+                "sent":                 self._sent,
+                "failed":               self._failed,
+                "dropped":              self._dropped,
+                "batches":              self._batches,
+                "outbox_pending":       self._outbox.pending if self._outbox is not None else 0,
+                "send_latency_last_ms": round(self._send_latency_last * 1000, 1),
+                "send_latency_avg_ms":  round(self._send_latency_total / calls * 1000, 1) if calls else 0.0,
+                "send_latency_max_ms":  round(self._send_latency_max * 1000, 1),
+                "queue_wait_last_ms":   round(self._queue_wait_last * 1000, 1),
+            }
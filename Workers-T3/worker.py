@@ -29,7 +29,13 @@ from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from backend_client import BackendClient
-from subprocess_runner import SubprocessRunner
+from prefetch import TaskPrefetcher
+from scheduler import Scheduler
+from subprocess_runner import CaminoHostRunner, SubprocessRunner
+from heartbeat import HeartbeatMonitor
+import metrics
+from outbox import Outbox
+from update_sender import UpdateSender
 from common_utils import (
     sanitize_error_for_display,
     parse_json_from_markers,
@@ -58,6 +64,15 @@ parser.add_argument("--poll_interval", type=int, default=int(os.getenv("POLL_INT
 parser.add_argument("--log_level",    default=os.getenv("LOG_LEVEL", "INFO"),         help="Nivel de log: DEBUG | INFO | WARNING | ERROR")
 parser.add_argument("--dry-run",      action="store_true",                            help="Simula ejecución sin lanzar automatización real")
 parser.add_argument("--health-port",  type=int, default=int(os.getenv("HEALTH_PORT", "0")), help="Puerto para servidor de health check (0 = deshabilitado)")
+parser.add_argument("--no-camino-host", action="store_true",
+                    default=os.getenv("CAMINO_HOST", "1").lower() in ("0", "false", "no", "off"),
+                    help="Lanza un intérprete por tarea en vez de usar el camino_host persistente")
+parser.add_argument("--no-prefetch",  action="store_true",
+                    default=os.getenv("PREFETCH", "1").lower() in ("0", "false", "no", "off"),
+                    help="No pide la próxima tarea mientras el camino actual cierra tabs")
+parser.add_argument("--no-outbox",    action="store_true",
+                    default=os.getenv("OUTBOX", "1").lower() in ("0", "false", "no", "off"),
+                    help="No guarda en disco los updates que el backend no confirmó")
 
 args = parser.parse_args()
 
@@ -89,6 +104,9 @@ API_KEY     = args.api_key
 POLL_INTERVAL = args.poll_interval
 DRY_RUN     = args.dry_run
 HEALTH_PORT = args.health_port
+CAMINO_HOST = not args.no_camino_host
+PREFETCH    = not args.no_prefetch
+OUTBOX      = not args.no_outbox
 TIMEZONE    = os.getenv("TIMEZONE", "America/Argentina/Buenos_Aires")
 VALID_TASK_TYPES = ["deudas", "movimientos", "pin"]
 
@@ -100,15 +118,28 @@ TIMEOUT_INACTIVIDAD  = 1200
 
 # ── Intervalos del loop principal (segundos) ─────────────────────────
 HEARTBEAT_INTERVAL    = 30
+HEARTBEAT_TIMEOUT     = 5    # timeout HTTP de cada heartbeat (sin reintentos)
+HEARTBEAT_FAILURES    = 3    # fallos seguidos que abren el circuito
+HEARTBEAT_COOLDOWN    = 120  # segundos con el circuito abierto antes de probar de nuevo
 STATS_LOG_INTERVAL    = 60
 WS_RECONNECT_INTERVAL = 10
 POLL_INTERVAL_WS      = 5
-IDLE_SLEEP            = 0.5
+PREFETCH_LEASE_TTL    = 90
 
 # ── Configuración de comunicación ─────────────────────────────────────
+HOST_START_TIMEOUT   = 60
 WS_CONNECT_ATTEMPTS  = 10
 WS_CONNECT_WAIT      = 0.5
 HTTP_FAST_TIMEOUT    = 3
+HTTP_CONFIRM_TIMEOUT = 30  # envíos que el outbox necesita confirmar (resultados finales, reenvíos)
+UPDATE_QUEUE_SIZE    = 1000  # updates pendientes antes de descartar partials 'running'
+UPDATE_FLUSH_TIMEOUT = 10
+UPDATE_COALESCE_MS   = int(os.getenv("UPDATE_COALESCE_MS", "0"))  # ventana de agrupado de partials (0 = apagado)
+UPDATE_BATCH_MAX     = 50  # partials por task_update_batch
+OUTBOX_MAX_ENTRIES   = 5000  # updates en disco antes de descartar partials 'running'
+OUTBOX_REPLAY_EVERY  = 10  # segundos entre reintentos mientras el backend no responde
+HTTP_POOL_SIZE       = 4   # conexiones por pool (lento y rápido)
+HTTP_KEEPALIVE_IDLE  = 30  # segundos sin tráfico antes del primer probe TCP keep-alive
 QUEUE_DRAIN_TIMEOUT  = 0.1
 JSON_CAPTURE_TIMEOUT = 1.0
 
@@ -158,6 +189,12 @@ def log_stats():
         )
 
 
+def _python_exe() -> str:
+    """Python del venv del proyecto si existe; si no, el intérprete actual."""
+    project_venv = os.path.join(BASE_DIR, "..", "venv", "Scripts", "python.exe")
+    return project_venv if os.path.exists(project_venv) else sys.executable
+
+
 def validate_coord_files() -> bool:
     """Verifica que los JSONs de coordenadas necesarios existan antes de procesar tareas."""
     bot_root = os.path.join(BASE_DIR, "..")
@@ -221,7 +258,7 @@ def _validate_incoming_task(task: dict) -> Optional[dict]:
 
 # ── Procesadores de resultado por tipo ───────────────────────────────
 def process_deudas_result(
-    task_id: str, dni: str, data: dict, start_time: float, client: BackendClient
+    task_id: str, dni: str, data: dict, start_time: float, sender: UpdateSender
 ) -> bool:
     """
     Envía el resultado final de una tarea de deudas al backend.
@@ -238,7 +275,7 @@ def process_deudas_result(
         else:
             logger.info(f"[DEUDAS] DNI {dni} — score sin deudas")
 
-        client.send_update(task_id, final_data, status="completed")
+        sender.send_update(task_id, final_data, status="completed")
         logger.info(f"[COMPLETADO] DNI {dni} en {execution_time}s")
         return True
 
@@ -248,7 +285,7 @@ def process_deudas_result(
 
 
 def process_movimientos_result(
-    task_id: str, dni: str, data: dict, start_time: float, client: BackendClient
+    task_id: str, dni: str, data: dict, start_time: float, sender: UpdateSender
 ) -> bool:
     """
     Envía los stages de movimientos al backend.
@@ -259,7 +296,7 @@ def process_movimientos_result(
 
         if not stages:
             execution_time = int(time.time() - start_time)
-            client.send_update(task_id, {"dni": dni, "execution_time": execution_time}, status="completed")
+            sender.send_update(task_id, {"dni": dni, "execution_time": execution_time}, status="completed")
             logger.info(f"[COMPLETADO] Movimientos {task_id} en {execution_time}s (updates parciales ya enviados)")
             return True
 
@@ -282,7 +319,7 @@ def process_movimientos_result(
             else:
                 status = "running"
 
-            client.send_update(task_id, partial_data, status=status)
+            sender.send_update(task_id, partial_data, status=status)
             logger.info(f"[PARCIAL] Etapa {i}/{len(stages)}: {info[:50]}")
 
             if i < len(stages):
@@ -293,12 +330,12 @@ def process_movimientos_result(
 
     except Exception as e:
         logger.error(f"[ERROR] Procesando movimientos DNI {dni}: {e}", exc_info=True)
-        client.send_update(task_id, {"info": sanitize_error_for_display(str(e))}, status="error")
+        sender.send_update(task_id, {"info": sanitize_error_for_display(str(e))}, status="error")
         return False
 
 
 def process_pin_operation(
-    task_id: str, telefono: str, data: dict, start_time: float, client: BackendClient
+    task_id: str, telefono: str, data: dict, start_time: float, sender: UpdateSender
 ) -> bool:
     """Envía el resultado del envío de PIN al backend."""
     try:
@@ -332,13 +369,13 @@ def process_pin_operation(
             final_data["image"] = image_b64
 
         status = "completed" if pin_enviado else "error"
-        client.send_update(task_id, final_data, status=status)
+        sender.send_update(task_id, final_data, status=status)
         logger.info(f"[COMPLETADO] PIN {task_id} en {exec_time}s | Enviado={pin_enviado}")
         return pin_enviado
 
     except Exception as e:
         logger.error(f"[ERROR] Procesando PIN tel={telefono}: {e}", exc_info=True)
-        client.send_update(
+        sender.send_update(
             task_id,
             {"info": sanitize_error_for_display(str(e)), "tipo": "pin"},
             status="error",
@@ -348,7 +385,13 @@ def process_pin_operation(
 
 # ── Proceso de una tarea ──────────────────────────────────────────────
 @retry(stop=stop_after_attempt(2), wait=wait_exponential(multiplier=1, min=5, max=15))
-def process_task(task: dict, client: BackendClient, runner: SubprocessRunner) -> bool:
+def process_task(
+    task: dict,
+    client: BackendClient,
+    sender: UpdateSender,
+    runner: SubprocessRunner,
+    prefetcher: Optional[TaskPrefetcher] = None,
+) -> bool:
     task_id = task["task_id"]
     logger.info(f"[TAREA-INICIO] ===== PROCESANDO {task_id} =====")
 
@@ -358,6 +401,8 @@ def process_task(task: dict, client: BackendClient, runner: SubprocessRunner) ->
 
     input_data = task.get(config.input_key) or task.get("datos", "")
     start_time = time.time()
+    # Envuelve los envíos de esta tarea para medir primer partial, etapas y duración
+    tracked = metrics.TaskMetrics(sender, operation_type, start_time)
 
     logger.info(f"[SCRAPING] {config.data_label}={input_data} | Task={task_id} | Tipo={operation_type}")
 
@@ -375,7 +420,7 @@ def process_task(task: dict, client: BackendClient, runner: SubprocessRunner) ->
             "movimientos": process_movimientos_result,
             "pin":         process_pin_operation,
         }
-        return result_handlers[operation_type](task_id, input_data, mock_data, start_time, client)
+        return result_handlers[operation_type](task_id, input_data, mock_data, start_time, tracked)
 
     # ── Preparar comando ─────────────────────────────────────────────
     base_dir    = os.path.dirname(__file__)
@@ -385,12 +430,11 @@ def process_task(task: dict, client: BackendClient, runner: SubprocessRunner) ->
         logger.error(f"[ERROR] Script no encontrado: {script_path}")
         with stats_lock:
             stats["scraping_errors"] += 1
-        client.send_update(task_id, {"info": f"Script no encontrado: {config.script}.py"}, status="error")
+        tracked.send_update(task_id, {"info": f"Script no encontrado: {config.script}.py"}, status="error")
         return False
 
     # Preferir Python del venv del proyecto
-    project_venv = os.path.join(base_dir, "..", "venv", "Scripts", "python.exe")
-    python_exe   = project_venv if os.path.exists(project_venv) else sys.executable
+    python_exe = _python_exe()
     logger.info(f"[WORKER] Python: {python_exe}")
 
     cmd_args = [python_exe, "-u", script_path, input_data]
@@ -402,7 +446,7 @@ def process_task(task: dict, client: BackendClient, runner: SubprocessRunner) ->
     op_msg = f"Iniciando automatización para {config.data_label} {input_data}"
     if config.pass_task_json and task.get("admin", False):
         op_msg += " (MODO ADMINISTRATIVO)"
-    client.send_update(task_id, {"info": op_msg}, status="running")
+    tracked.send_update(task_id, {"info": op_msg}, status="running")
 
     logger.info(f"[SUBPROCESS] Timeout={config.timeout}s | Admin={task.get('admin', False) if config.pass_task_json else 'N/A'}")
 
@@ -412,14 +456,14 @@ def process_task(task: dict, client: BackendClient, runner: SubprocessRunner) ->
             cmd_args=cmd_args,
             timeout=config.timeout,
             task_id=task_id,
-            on_update=client.send_update,
-            heartbeat_fn=client.register,
+            on_update=tracked.send_update,
+            on_phase=prefetcher.on_phase if prefetcher else None,
         )
     except Exception as e:
         logger.error(f"[SUBPROCESS-ERROR] Error inesperado en runner: {e}", exc_info=True)
         with stats_lock:
             stats["scraping_errors"] += 1
-        client.send_update(task_id, {"info": sanitize_error_for_display(str(e))}, status="error")
+        tracked.send_update(task_id, {"info": sanitize_error_for_display(str(e))}, status="error")
         return False
 
     # ── Manejar resultado del runner ─────────────────────────────────
@@ -434,7 +478,7 @@ def process_task(task: dict, client: BackendClient, runner: SubprocessRunner) ->
         logger.error(f"[ERROR] {msg} — stdout: {result.stdout[:200]}")
         with stats_lock:
             stats["scraping_errors"] += 1
-        client.send_update(task_id, {"info": msg}, status="error")
+        tracked.send_update(task_id, {"info": msg}, status="error")
         return False
 
     if result.returncode != 0:
@@ -443,21 +487,21 @@ def process_task(task: dict, client: BackendClient, runner: SubprocessRunner) ->
         with stats_lock:
             stats["scraping_errors"] += 1
         user_msg = sanitize_error_for_display(raw_error, result.returncode)
-        client.send_update(task_id, {"info": user_msg}, status="error")
+        tracked.send_update(task_id, {"info": user_msg}, status="error")
         return False
 
     if not result.stdout:
         logger.error("[ERROR] Script no produjo output")
         with stats_lock:
             stats["scraping_errors"] += 1
-        client.send_update(task_id, {"info": "Script no produjo resultados"}, status="error")
+        tracked.send_update(task_id, {"info": "Script no produjo resultados"}, status="error")
         return False
 
     # ── Parsear resultado final del script ───────────────────────────
     data = parse_json_from_markers(result.stdout, strict=False)
     if not data or not isinstance(data, dict):
         logger.error("[ERROR] No se pudo parsear el JSON final del script")
-        client.send_update(task_id, {"info": "Error parseando resultado"}, status="error")
+        tracked.send_update(task_id, {"info": "Error parseando resultado"}, status="error")
         return False
 
     # ── Despachar al handler correcto ────────────────────────────────
@@ -466,15 +510,24 @@ def process_task(task: dict, client: BackendClient, runner: SubprocessRunner) ->
         "movimientos": process_movimientos_result,
         "pin":         process_pin_operation,
     }
-    return result_handlers[operation_type](task_id, input_data, data, start_time, client)
+    return result_handlers[operation_type](task_id, input_data, data, start_time, tracked)
 
 
 # ── Health check server (opcional) ───────────────────────────────────
-def _make_health_handler(client_ref: list):
+def _make_health_handler(client_ref: list, sender_ref: list, heartbeat_ref: list):
     class HealthHandler(BaseHTTPRequestHandler):
         def do_GET(self):
-            if self.path == "/health":
+            if self.path == "/metrics":
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", metrics.CONTENT_TYPE)
+                self.send_header("Content-Length", len(body))
+                self.end_headers()
+                self.wfile.write(body)
+            elif self.path == "/health":
                 client = client_ref[0] if client_ref else None
+                sender = sender_ref[0] if sender_ref else None
+                heartbeat = heartbeat_ref[0] if heartbeat_ref else None
                 with stats_lock:
                     body = json.dumps({
                         "pc_id":             PC_ID,
@@ -485,6 +538,8 @@ def _make_health_handler(client_ref: list):
                         "tasks_failed":      stats["tasks_failed"],
                         "ws_connected":      client.ws_connected if client else False,
                         "dry_run":           DRY_RUN,
+                        "updates":           sender.stats() if sender else {},
+                        "heartbeat":         heartbeat.stats() if heartbeat else {},
                     }).encode()
                 self.send_response(200)
                 self.send_header("Content-Type", "application/json")
@@ -501,9 +556,20 @@ def _make_health_handler(client_ref: list):
     return HealthHandler
 
 
-def start_health_server(port: int, client_ref: list):
-    """Arranca un servidor HTTP en un thread daemon que expone /health."""
-    handler = _make_health_handler(client_ref)
+def _register_gauges(client: BackendClient, sender: UpdateSender, heartbeat: HeartbeatMonitor):
+    """Gauges de /metrics que se leen en cada scrape."""
+    metrics.REGISTRY.const_labels = {"pc_id": PC_ID, "worker_tipo": TIPO}
+    metrics.gauge("t3_update_queue_depth", "Updates encolados sin enviar", lambda: sender.stats()["queue_depth"])
+    metrics.gauge("t3_outbox_pending", "Updates en el outbox esperando reenvío", lambda: sender.stats()["outbox_pending"])
+    metrics.gauge("t3_updates_dropped", "Partials descartados por cola llena", lambda: sender.stats()["dropped"])
+    metrics.gauge("t3_ws_connected", "1 si el WebSocket está conectado", lambda: int(client.ws_connected))
+    metrics.gauge("t3_heartbeat_failures", "Heartbeats fallidos seguidos", lambda: heartbeat.stats()["consecutive_failures"])
+    metrics.gauge("t3_uptime_seconds", "Segundos desde que arrancó el worker", lambda: time.time() - stats["started_at"])
+
+
+def start_health_server(port: int, client_ref: list, sender_ref: list, heartbeat_ref: list):
+    """Arranca un servidor HTTP en un thread daemon que expone /health y /metrics."""
+    handler = _make_health_handler(client_ref, sender_ref, heartbeat_ref)
     server  = HTTPServer(("0.0.0.0", port), handler)
     thread  = threading.Thread(target=server.serve_forever, daemon=True)
     thread.start()
@@ -530,20 +596,70 @@ def main_loop():
         tipo=TIPO,
         admin=ADMIN,
         http_fast_timeout=HTTP_FAST_TIMEOUT,
+        http_confirm_timeout=HTTP_CONFIRM_TIMEOUT,
         ws_connect_attempts=WS_CONNECT_ATTEMPTS,
         ws_connect_wait=WS_CONNECT_WAIT,
+        http_pool_size=HTTP_POOL_SIZE,
+        http_keepalive_idle=HTTP_KEEPALIVE_IDLE,
+    )
+    # Cola de salida: el runner y los handlers solo encolan, un thread envía.
+    # Lo que no llega al backend queda en el outbox y se reenvía al reconectar.
+    outbox = (
+        Outbox(os.path.join(LOGS_DIR, f"outbox_{PC_ID}.db"), max_entries=OUTBOX_MAX_ENTRIES)
+        if OUTBOX else None
     )
-    runner = SubprocessRunner(
+    sender = UpdateSender(
+        send_fn=client.send_update,
+        maxsize=UPDATE_QUEUE_SIZE,
+        batch_send_fn=client.send_update_batch,
+        coalesce_window=UPDATE_COALESCE_MS / 1000,
+        max_batch=UPDATE_BATCH_MAX,
+        outbox=outbox,
+        replay_interval=OUTBOX_REPLAY_EVERY,
+        confirm_fn=client.send_update_confirmed,
+    )
+    sender.start()
+
+    runner_kwargs = dict(
         queue_drain_timeout=QUEUE_DRAIN_TIMEOUT,
         json_capture_timeout=JSON_CAPTURE_TIMEOUT,
         inactivity_timeout=TIMEOUT_INACTIVIDAD,
-        heartbeat_interval=HEARTBEAT_INTERVAL,
+    )
+    if CAMINO_HOST and not DRY_RUN:
+        runner = CaminoHostRunner(
+            python_exe=_python_exe(),
+            host_start_timeout=HOST_START_TIMEOUT,
+            **runner_kwargs,
+        )
+        # Precarga en segundo plano: el primer task ya encuentra el host caliente
+        threading.Thread(target=runner.start, daemon=True).start()
+    else:
+        runner = SubprocessRunner(**runner_kwargs)
+
+    # Prefetch: pide la próxima tarea durante el cierre del camino actual
+    prefetcher = None
+    if PREFETCH and not DRY_RUN:
+        prefetcher = TaskPrefetcher(
+            fetch_fn=client.get_task,
+            release_fn=client.release_task,
+            lease_ttl=PREFETCH_LEASE_TTL,
+        )
+
+    # Heartbeat en su propio thread: un backend lento no frena la tarea en curso
+    heartbeat = HeartbeatMonitor(
+        beat_fn=lambda: client.heartbeat(timeout=HEARTBEAT_TIMEOUT),
+        interval=HEARTBEAT_INTERVAL,
+        failure_threshold=HEARTBEAT_FAILURES,
+        cooldown=HEARTBEAT_COOLDOWN,
     )
 
     # Health check server (si está habilitado)
-    client_ref = [client]
+    client_ref    = [client]
+    sender_ref    = [sender]
+    heartbeat_ref = [heartbeat]
     if HEALTH_PORT:
-        start_health_server(HEALTH_PORT, client_ref)
+        _register_gauges(client, sender, heartbeat)
+        start_health_server(HEALTH_PORT, client_ref, sender_ref, heartbeat_ref)
 
     # Registro inicial con reintentos
     for attempt in range(5):
@@ -554,70 +670,61 @@ def main_loop():
     else:
         logger.error("[ERROR] No se pudo registrar después de 5 intentos. Terminando.")
         sys.exit(1)
+    heartbeat.start()
 
     # Conectar WebSocket
     use_websocket = client.connect_ws()
     if not use_websocket:
         logger.warning("[WS] Sin WebSocket — usando solo polling HTTP")
 
-    last_stats_log       = time.time()
-    last_reconnect       = time.time()
-    last_heartbeat       = time.time()
-    last_task_poll       = time.time()
+    # Timers periódicos: un solo scheduler, ejecutado desde este thread
+    # (el heartbeat va aparte, en HeartbeatMonitor)
+    scheduler = Scheduler()
+    scheduler.every("stats", STATS_LOG_INTERVAL, log_stats)
+
+    if use_websocket:
+        def _reconnect_ws():
+            if client.ws_connected:
+                return
+            logger.warning("[WS] Intentando reconectar...")
+            if client.connect_ws():
+                logger.info("[WS] Reconectado exitosamente")
+
+        scheduler.every("ws_reconnect", WS_RECONNECT_INTERVAL, _reconnect_ws)
+        # Polling de respaldo: otro trigger más, se colapsa con los del WS
+        scheduler.every("poll", POLL_INTERVAL_WS, client.notify_task_trigger)
+    else:
+        scheduler.every("poll", POLL_INTERVAL, client.notify_task_trigger)
+        client.notify_task_trigger()  # primer poll inmediato
 
     while True:
         try:
-            now = time.time()
-
-            # Heartbeat periódico
-            if now - last_heartbeat > HEARTBEAT_INTERVAL:
-                client.register()
-                last_heartbeat = time.time()
-
-            # Log de estadísticas periódico
-            if now - last_stats_log > STATS_LOG_INTERVAL:
-                log_stats()
-                last_stats_log = time.time()
-
-            # Reconectar WebSocket si se perdió la conexión
-            if use_websocket and not client.ws_connected and now - last_reconnect > WS_RECONNECT_INTERVAL:
-                logger.warning("[WS] Intentando reconectar...")
-                if client.connect_ws():
-                    logger.info("[WS] Reconectado exitosamente")
-                last_reconnect = time.time()
-
-            # Obtener tarea
-            task = None
+            scheduler.run_pending()
 
-            if use_websocket:
-                # Trigger por WebSocket (notificación new_task)
-                if client.get_ws_trigger():
-                    task_raw = client.get_task()
-                    if task_raw:
-                        task = _validate_incoming_task(task_raw)
-
-                # Polling periódico de respaldo
-                if not task and time.time() - last_task_poll > POLL_INTERVAL_WS:
-                    task_raw = client.get_task()
-                    if task_raw:
-                        task = _validate_incoming_task(task_raw)
-                    last_task_poll = time.time()
-
-                if not task:
-                    time.sleep(IDLE_SLEEP)
+            # Obtener tarea: primero la prefetcheada durante la tarea anterior
+            task = None
+            if prefetcher:
+                task_raw = prefetcher.take()
+                if task_raw:
+                    task = _validate_incoming_task(task_raw)
+
+            if not task:
+                # Dormir hasta el próximo timer o hasta un trigger (WS new_task / poll)
+                if not client.wait_task_trigger(timeout=scheduler.seconds_until_next()):
                     continue
-            else:
                 task_raw = client.get_task()
                 if not task_raw:
-                    time.sleep(POLL_INTERVAL)
                     continue
                 task = _validate_incoming_task(task_raw)
                 if not task:
-                    time.sleep(POLL_INTERVAL)
                     continue
 
             # Procesar tarea
-            success = process_task(task, client, runner)
+            success = process_task(task, client, sender, runner, prefetcher)
+
+            # Sin WS no hay notificaciones: volver a pedir tarea apenas termina
+            if not use_websocket:
+                client.notify_task_trigger()
 
             with stats_lock:
                 if success:
@@ -629,7 +736,12 @@ def main_loop():
 
         except KeyboardInterrupt:
             logger.info("[DETENIDO] Worker detenido por usuario")
+            heartbeat.stop()
+            sender.stop(timeout=UPDATE_FLUSH_TIMEOUT)
             client.close_ws()
+            client.close_http()
+            if isinstance(runner, CaminoHostRunner):
+                runner.stop()
             log_stats()
             sys.exit(0)
         except Exception as e:
@@ -26,7 +26,6 @@ Marcadores que el worker reconoce:
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import sys
 import time
@@ -38,7 +37,7 @@ _HERE = Path(__file__).resolve().parent
 if str(_HERE) not in sys.path:
     sys.path.insert(0, str(_HERE))
 
-from shared import amounts, capture as cap, clipboard, coords, io_worker, mouse
+from shared import amounts, capture as cap, clipboard, coords, io_worker, mouse, wait
 from shared.flows.buscar_deudas_cuenta import buscar_deudas_cuenta
 from shared.flows.cerrar_y_home import cerrar_tabs, volver_a_home
 from shared.flows.entrada_cliente import entrada_cliente
@@ -84,7 +83,7 @@ def _emit_deuda_items(deudas: list[dict], streamed_ids: set[str]) -> None:
         if is_duplicate:
             item["duplicate"] = True
             print(f"[CaminoDeudasAdmin] [DEDUP] id_fa={id_raw} ya emitido, marcando duplicate")
-        print(f"[CUENTA_ITEM] {json.dumps(item, ensure_ascii=False)}", flush=True)
+        io_worker.emit_marker("CUENTA_ITEM", item)
 
 
 def _verify_entrada_cuenta(master: dict) -> bool:
@@ -94,28 +93,29 @@ def _verify_entrada_cuenta(master: dict) -> bool:
     if ok:
         return True
     pg.press("enter")
-    time.sleep(0.5)
+    wait.pause(0.5)
     return False
 
 
 def _flujo_telefonico(master: dict, dni: str, shot_dir: Path, base_delay: float) -> None:
     """Caso especial cuenta unica: score directo sin validar fraude/corrupto."""
     print("[CaminoDeudasAdmin] CASO ESPECIAL Telefonico: cuenta unica, score directo")
-    time.sleep(2.0)
+    wait.pause(2.0)
 
     nx, ny = coords.xy(master, "score.nombre_cliente_btn")
     if nx or ny:
-        time.sleep(2.5)
+        wait.pause(2.5)
         mouse.click(nx, ny, "nombre_cliente_btn", base_delay)
 
-    time.sleep(1.0)
+    wait.pause(1.0)
     pg.press("enter")
     print("[CaminoDeudasAdmin] Enter post nombre_cliente_btn (cartel)")
-    time.sleep(0.5)
+    wait.pause(0.5)
 
     score_value = copiar_score(master, pre_delay=2.5)
     shot_path = capturar_score(master, dni, shot_dir, pre_capture_delay=0.5, clean_before=False)
 
+    io_worker.emit_fase(io_worker.FASE_CIERRE)
     cerrar_tabs(master, veces=5, close_tab_key=CLOSE_TAB_KEY, interval=0.3)
     volver_a_home(master)
     clipboard.clear()
@@ -155,6 +155,7 @@ def _flujo_no_creado(master: dict, dni: str, shot_dir: Path, base_delay: float)
         "info": "Cliente no creado, verifiquelo en la imagen",
     })
 
+    io_worker.emit_fase(io_worker.FASE_CIERRE)
     cerrar_tabs(master, veces=5, close_tab_key=CLOSE_TAB_KEY, interval=0.3)
     volver_a_home(master)
     print("[CaminoDeudasAdmin] Finalizado (cliente no creado)")
@@ -166,6 +167,7 @@ def _flujo_fraude(master: dict, dni: str) -> None:
     cbx, cby = coords.xy(master, "validar.close_fraude_btn")
     if cbx or cby:
         mouse.click(cbx, cby, "close_fraude_btn", 0.5)
+    io_worker.emit_fase(io_worker.FASE_CIERRE)
     cerrar_tabs(master, veces=2, close_tab_key=CLOSE_TAB_KEY, interval=0.5)
     volver_a_home(master)
 
@@ -186,7 +188,7 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
     post_enter = _float_env("POST_ENTER_DELAY", 1.0)
 
     print(f"[CaminoDeudasAdmin] Iniciando DNI={dni}")
-    time.sleep(start_delay)
+    wait.pause(start_delay)
 
     master = coords.load_master(master_path) if master_path else coords.load_master()
     cap.clear_dir(shot_dir)
@@ -200,7 +202,7 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
         base_delay=base_delay,
         post_enter_delay=post_enter,
     )
-    time.sleep(2.5)
+    wait.pause(2.5)
 
     # 2. validar_cliente_creado
     creado, texto = validar_cliente_creado(master, base_delay=base_delay)
@@ -215,7 +217,7 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
         return
 
     # 4. Ver Todos -> cuentas
-    time.sleep(1.0)
+    wait.pause(1.0)
     tabla = copiar_tabla(
         master,
         ver_todos_key=VER_TODOS_KEY,
@@ -235,7 +237,7 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
     for intento in range(MAX_VALIDATION_ATTEMPTS):
         print(f"[CaminoDeudasAdmin] intento validacion {intento + 1}/{MAX_VALIDATION_ATTEMPTS}")
         mouse.click(sx, sy, "seleccionar_btn2", base_delay)
-        time.sleep(1.5)
+        wait.pause(1.5)
 
         if validar_fraude(master, base_delay=base_delay):
             _flujo_fraude(master, dni)
@@ -251,26 +253,26 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
             break
 
         print("[CaminoDeudasAdmin] registro corrupto, navegando al siguiente")
-        time.sleep(1.0)
+        wait.pause(1.0)
         mouse.click(cix, ciy, "client_id_field2 (retry)", base_delay)
-        time.sleep(0.3)
+        wait.pause(0.3)
         pg.press("down")
-        time.sleep(0.15)
+        wait.pause(0.15)
 
     if not validacion_ok:
         print("[CaminoDeudasAdmin] ADVERTENCIA: ningun registro funcional, sigo con el ultimo")
 
-    time.sleep(2.0)
+    wait.pause(2.0)
 
     # 6. nombre_cliente_btn -> Enter (cartel) -> copiar_score
     nx, ny = coords.xy(master, "score.nombre_cliente_btn")
     if nx or ny:
-        time.sleep(2.5)
+        wait.pause(2.5)
         mouse.click(nx, ny, "nombre_cliente_btn", base_delay)
-    time.sleep(1.0)
+    wait.pause(1.0)
     pg.press("enter")
     print("[CaminoDeudasAdmin] Enter post nombre_cliente_btn (cartel)")
-    time.sleep(0.5)
+    wait.pause(0.5)
 
     score_value = copiar_score(master, pre_delay=2.5)
     shot_path = capturar_score(master, dni, shot_dir, pre_capture_delay=0.5, clean_before=False)
@@ -329,12 +331,12 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
 
             try:
                 mouse.click(cix, ciy, "client_id_field2", 0.5)
-                time.sleep(0.4)
+                wait.pause(0.4)
                 for _ in range(idx):
                     pg.press("down")
-                    time.sleep(0.15)
+                    wait.pause(0.15)
                 mouse.click(sx, sy, "seleccionar_btn2", 0.5)
-                time.sleep(1.0)
+                wait.pause(1.0)
 
                 if not _verify_entrada_cuenta(master):
                     print(f"[CaminoDeudasAdmin] cuenta {cuenta_num}: no confirmada, salto")
@@ -369,6 +371,7 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
                 traceback.print_exc()
 
     # 9. Cerrar y home
+    io_worker.emit_fase(io_worker.FASE_CIERRE)
     cerrar_tabs(master, veces=5, close_tab_key=CLOSE_TAB_KEY, interval=0.3)
     volver_a_home(master)
     clipboard.clear()
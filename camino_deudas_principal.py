@@ -3,6 +3,8 @@
 Flujo principal de busqueda de deudas (saldos por ID de FA) cuando hay >1 cuenta.
 
 Secuencia:
+  0. Si viene de camino_score (desde_cliente + tabla): se salta 1-5 y se
+     arranca en la pantalla del cliente con la tabla de Ver Todos recibida
   1. entrada_cliente (cliente_section1, dni_field1/cuit_field1)
   2. Ritual A '¿cliente creado?': validar_cliente_creado (right-click validar.client_name_field + click validar.copi_id_field)
   3. Si ritual A NO copio ID:
@@ -38,8 +40,9 @@ _HERE = Path(__file__).resolve().parent
 if str(_HERE) not in sys.path:
     sys.path.insert(0, str(_HERE))
 
-from shared import amounts, capture as cap
-from shared import coords, io_worker, keyboard, mouse
+from shared import amounts, capture as cap, wait
+from shared import coords, io_worker, keyboard, mouse, screen_state
+from shared.flows.cerrar_y_home import cerrar_tabs, cerrar_y_home
 from shared.flows.entrada_cliente import entrada_cliente
 from shared.flows.iterar_registros import (
     MAX_REGISTROS_SIN_EXPANDIR,
@@ -111,24 +114,10 @@ def _format_currency(value: float) -> str:
     return f"${s}"
 
 
-def run(
-    dni: str,
-    master_path: Path | None,
-    shot_dir: Path,
-    ids_cliente_filter: list[str] | None = None,
-) -> None:
-    pg.FAILSAFE = True
-    start_delay = _float_env("COORDS_START_DELAY", 0.5)
-    base_delay = _float_env("STEP_DELAY", 0.5)
-    post_enter = _float_env("POST_ENTER_DELAY", 1.0)
-
-    print(f"[CaminoDeudasPrincipal] Iniciando para DNI={dni} en {start_delay}s")
-    if ids_cliente_filter:
-        print(f"[CaminoDeudasPrincipal] modo filtrado: {len(ids_cliente_filter)} IDs del camino_score")
-    time.sleep(start_delay)
-
-    master = coords.load_master(master_path) if master_path else coords.load_master()
-
+def _entrar_y_validar(
+    master: dict, dni: str, shot_dir: Path, base_delay: float, post_enter: float
+) -> bool:
+    """Entrada + rituales A/B. False si el camino ya termino (delegado o cliente no creado)."""
     # 1. entrada
     entrada_cliente(
         master,
@@ -137,7 +126,7 @@ def run(
         base_delay=base_delay,
         post_enter_delay=post_enter,
     )
-    time.sleep(0.8)
+    wait.pause(0.8)
 
     # 2. Ritual A '¿cliente creado?' (ANTES de Ver Todos)
     creado, texto_a = validar_cliente_creado(master, base_delay=base_delay)
@@ -147,7 +136,7 @@ def run(
     if es_telefonico(texto_a):
         print("[CaminoDeudasPrincipal] TELEFONICO detectado en ritual A -> camino_deudas_viejo --skip-initial")
         _delegar_a_viejo(dni)
-        return
+        return False
 
     # 3. Ritual A vacio -> probar Ritual B '¿es telefonico?'
     if not creado:
@@ -157,15 +146,14 @@ def run(
         if es_tel:
             print("[CaminoDeudasPrincipal] TELEFONICO detectado en ritual B -> camino_deudas_viejo --skip-initial")
             _delegar_a_viejo(dni)
-            return
+            return False
 
         # Ambos rituales fallaron -> CLIENTE NO CREADO
         print("[CaminoDeudasPrincipal] CLIENTE NO CREADO")
         shot_path = _captura_cliente_no_creado(master, dni, shot_dir)
         keyboard.press_enter(0.5)
-        close_x, close_y = coords.xy(master, f"comunes.{CLOSE_TAB_KEY}")
-        if close_x or close_y:
-            mouse.multi_click(close_x, close_y, "close_tab_btn (no_creado)", times=3, interval=0.15)
+        io_worker.emit_fase(io_worker.FASE_CIERRE)
+        cerrar_tabs(master, veces=3, close_tab_key=CLOSE_TAB_KEY, interval=0.15)
         hx, hy = coords.xy(master, "comunes.home_area")
         mouse.click(hx, hy, "home_area", delay=0.25)
         result = {
@@ -179,20 +167,101 @@ def run(
             result["screenshot"] = str(shot_path)
         io_worker.print_json_result(result)
         print("[CaminoDeudasPrincipal] Finalizado - cliente no creado")
-        return
+        return False
+    return True
+
+
+def run(
+    dni: str,
+    master_path: Path | None,
+    shot_dir: Path,
+    ids_cliente_filter: list[str] | None = None,
+    tabla: str | None = None,
+    fa_data_list: list[dict[str, str]] | None = None,
+    desde_cliente: bool = False,
+) -> None:
+    """Busca las deudas del cliente.
 
-    # 4. Cliente creado (tiene ID) -> Ver Todos
-    time.sleep(0.5)
-    tabla = copiar_tabla(
+    tabla / fa_data_list: el texto de Ver Todos (y sus filas parseadas) que ya
+    copio camino_score; con eso no se repite Ver Todos.
+    desde_cliente: camino_score dejo T3 en la pantalla del cliente, no se
+    vuelve a hacer entrada ni validacion.
+    """
+    pg.FAILSAFE = True
+    start_delay = _float_env("COORDS_START_DELAY", 0.5)
+    base_delay = _float_env("STEP_DELAY", 0.5)
+    post_enter = _float_env("POST_ENTER_DELAY", 1.0)
+
+    print(f"[CaminoDeudasPrincipal] Iniciando para DNI={dni} en {start_delay}s")
+    if ids_cliente_filter:
+        print(f"[CaminoDeudasPrincipal] modo filtrado: {len(ids_cliente_filter)} IDs del camino_score")
+    wait.pause(start_delay)
+
+    master = coords.load_master(master_path) if master_path else coords.load_master()
+    buscar_deudas(
         master,
-        ver_todos_key="ver_todos_btn1",
-        close_tab_key=CLOSE_TAB_KEY,
-        post_ver_todos_delay=0.8,
-        base_delay=base_delay,
+        dni,
+        shot_dir,
+        base_delay,
+        post_enter,
+        ids_cliente_filter,
+        tabla=tabla,
+        fa_data_list=fa_data_list,
+        desde_cliente=desde_cliente,
     )
 
+
+def _emitir_cierre(final: bool) -> None:
+    """FASE_CIERRE; final=False si despues sigue otro intento (reintento con DNI fallback)."""
+    if final:
+        io_worker.emit_fase(io_worker.FASE_CIERRE)
+    else:
+        io_worker.emit_fase(io_worker.FASE_CIERRE, final=False)
+
+
+def buscar_deudas(
+    master: dict,
+    dni: str,
+    shot_dir: Path,
+    base_delay: float,
+    post_enter: float,
+    ids_cliente_filter: list[str] | None = None,
+    tabla: str | None = None,
+    fa_data_list: list[dict[str, str]] | None = None,
+    desde_cliente: bool = False,
+    cierre_final: bool = True,
+) -> None:
+    """Cuerpo de `run` (pasos 1-11) con el master ya cargado y sin demora inicial.
+
+    Lo usa tambien camino_score_deudas para seguir en el mismo cliente.
+    """
+    if desde_cliente and screen_state.en(master, "cliente") is False:
+        print(f"{LOG_PREFIX} T3 no quedo en el cliente ({screen_state.ultima()}), entrada completa")
+        cerrar_y_home(master, veces=5, close_tab_key=CLOSE_TAB_KEY)
+        desde_cliente = False
+
+    if desde_cliente:
+        # camino_score dejo T3 en la pantalla del cliente: sin entrada ni rituales
+        print(f"{LOG_PREFIX} continuando desde la pantalla del cliente (sin entrada ni validacion)")
+    elif not _entrar_y_validar(master, dni, shot_dir, base_delay, post_enter):
+        return
+
+    # 4. Cliente creado (tiene ID) -> Ver Todos (salvo que la tabla venga del camino_score)
+    if tabla is None:
+        wait.pause(0.5)
+        tabla = copiar_tabla(
+            master,
+            ver_todos_key="ver_todos_btn1",
+            close_tab_key=CLOSE_TAB_KEY,
+            post_ver_todos_delay=0.8,
+            base_delay=base_delay,
+        )
+    else:
+        print(f"{LOG_PREFIX} tabla de Ver Todos recibida del camino_score ({len(tabla)} chars)")
+
     # 5. Parsear
-    fa_data_list = parse_fa_data(tabla, log_prefix=LOG_PREFIX)
+    if fa_data_list is None:
+        fa_data_list = parse_fa_data(tabla, log_prefix=LOG_PREFIX)
     num_registros = len(fa_data_list)
 
     # cerrar Ver Todos (copiar_tabla ya lo cierra, pero por si acaso)
@@ -200,7 +269,7 @@ def run(
 
     # 6. Expandir si >20
     if num_registros > MAX_REGISTROS_SIN_EXPANDIR:
-        time.sleep(1.0)
+        wait.pause(1.0)
         expandir_registros(master, num_registros, base_delay, log_prefix=LOG_PREFIX)
 
     # 7. Iterar
@@ -220,6 +289,7 @@ def run(
         base_delay,
         log_prefix=LOG_PREFIX,
         close_tab_key=CLOSE_TAB_KEY,
+        tabla=tabla,
     )
 
     # Nota: NO hacemos close aca. iterar_registros ya cerro la tab del saldo
@@ -268,9 +338,8 @@ def run(
             item.pop("id_cliente_interno", None)
 
     # 10. Cerrar y home (rapido: multi_click + home con delay corto al final)
-    close_x, close_y = coords.xy(master, f"comunes.{CLOSE_TAB_KEY}")
-    if close_x or close_y:
-        mouse.multi_click(close_x, close_y, "close_tab_btn (final)", times=3, interval=0.15)
+    _emitir_cierre(cierre_final)
+    cerrar_tabs(master, veces=3, close_tab_key=CLOSE_TAB_KEY, interval=0.15)
     hx, hy = coords.xy(master, "comunes.home_area")
     # Pequeño breathe (0.25s) para que T3 procese los cierres antes del home.
     mouse.click(hx, hy, "home_area", delay=0.25)
@@ -307,6 +376,12 @@ def _parse_args() -> argparse.Namespace:
         default=None,
         help="JSON con IDs de cliente del camino_score (opcional)",
     )
+    ap.add_argument("--tabla-file", default=None, help="Archivo con la tabla de Ver Todos del camino_score")
+    ap.add_argument(
+        "--desde-cliente",
+        action="store_true",
+        help="T3 ya esta en la pantalla del cliente (sin entrada ni validacion)",
+    )
     return ap.parse_args()
 
 
@@ -323,7 +398,17 @@ if __name__ == "__main__":
                     print(f"[CaminoDeudasPrincipal] IDs cliente recibidos: {len(ids_filter)}")
             except json.JSONDecodeError as e:
                 print(f"[CaminoDeudasPrincipal] ERROR parseando IDs JSON: {e}")
-        run(args.dni, master_path, Path(args.shots_dir), ids_filter)
+        tabla_arg: str | None = None
+        if args.tabla_file:
+            tabla_arg = Path(args.tabla_file).read_text(encoding="utf-8")
+        run(
+            args.dni,
+            master_path,
+            Path(args.shots_dir),
+            ids_filter,
+            tabla=tabla_arg,
+            desde_cliente=args.desde_cliente,
+        )
     except KeyboardInterrupt:
         print("[CaminoDeudasPrincipal] Interrumpido por usuario")
         sys.exit(130)
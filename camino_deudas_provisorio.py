@@ -27,7 +27,6 @@ import json
 import os
 import subprocess
 import sys
-import time
 from pathlib import Path
 
 import pyautogui as pg
@@ -36,7 +35,7 @@ _HERE = Path(__file__).resolve().parent
 if str(_HERE) not in sys.path:
     sys.path.insert(0, str(_HERE))
 
-from shared import amounts, coords, io_worker, keyboard, mouse
+from shared import amounts, coords, io_worker, keyboard, mouse, wait
 from shared.flows.cerrar_y_home import cerrar_tabs, volver_a_home
 from shared.flows.entrada_cliente import entrada_cliente
 from shared.flows.iterar_registros import (
@@ -154,7 +153,7 @@ def run(dni: str, master_path: Path | None, umbral: float, ids_cliente_filter: l
     print(f"{LOG_PREFIX} Iniciando DNI={dni}, umbral={umbral:.0f}")
     if ids_cliente_filter:
         print(f"{LOG_PREFIX} IDs cliente del camino_score: {len(ids_cliente_filter)}")
-    time.sleep(start_delay)
+    wait.pause(start_delay)
 
     master = coords.load_master(master_path) if master_path else coords.load_master()
 
@@ -166,7 +165,7 @@ def run(dni: str, master_path: Path | None, umbral: float, ids_cliente_filter: l
         base_delay=base_delay,
         post_enter_delay=post_enter,
     )
-    time.sleep(0.8)
+    wait.pause(0.8)
 
     # 2. Ritual A '¿cliente creado?'
     creado, texto_a = validar_cliente_creado(master, base_delay=base_delay)
@@ -190,6 +189,7 @@ def run(dni: str, master_path: Path | None, umbral: float, ids_cliente_filter: l
         # Ambos rituales fallaron -> CLIENTE NO CREADO
         print(f"{LOG_PREFIX} CLIENTE NO CREADO")
         keyboard.press_enter(0.5)
+        io_worker.emit_fase(io_worker.FASE_CIERRE)
         _cerrar_y_home(master)
         result = {
             "dni": dni,
@@ -205,7 +205,7 @@ def run(dni: str, master_path: Path | None, umbral: float, ids_cliente_filter: l
         return
 
     # 4. Cliente creado -> Ver Todos
-    time.sleep(0.5)
+    wait.pause(0.5)
     tabla = copiar_tabla(
         master,
         ver_todos_key="ver_todos_btn1",
@@ -219,11 +219,12 @@ def run(dni: str, master_path: Path | None, umbral: float, ids_cliente_filter: l
 
     # 5. Expandir si >20
     if num_registros > MAX_REGISTROS_SIN_EXPANDIR:
-        time.sleep(1.0)
+        wait.pause(1.0)
         expandir_registros(master, num_registros, base_delay, log_prefix=LOG_PREFIX)
 
     if not fa_data_list:
         print(f"{LOG_PREFIX} sin IDs de FA, fin")
+        io_worker.emit_fase(io_worker.FASE_CIERRE)
         _cerrar_y_home(master)
         _emitir_resultado(dni, [], SCORE_FIJO)
         return
@@ -248,6 +249,7 @@ def run(dni: str, master_path: Path | None, umbral: float, ids_cliente_filter: l
         close_tab_key=CLOSE_TAB_KEY,
         stream_cuenta_item=False,
         on_row=check_umbral,
+        tabla=tabla,
     )
 
     if aborted or suma_state["excedido"]:
@@ -296,6 +298,7 @@ def run(dni: str, master_path: Path | None, umbral: float, ids_cliente_filter: l
             item.pop("id_cliente_interno", None)
 
     # 8. Cerrar + home + resultado
+    io_worker.emit_fase(io_worker.FASE_CIERRE)
     _cerrar_y_home(master)
     _emitir_resultado(dni, fa_saldos, SCORE_FIJO)
 
@@ -16,7 +16,6 @@ import argparse
 import os
 import re
 import sys
-import time
 from pathlib import Path
 from typing import Any
 
@@ -26,7 +25,7 @@ _HERE = Path(__file__).resolve().parent
 if str(_HERE) not in sys.path:
     sys.path.insert(0, str(_HERE))
 
-from shared import amounts, clipboard, coords, io_worker, keyboard, mouse
+from shared import amounts, clipboard, coords, io_worker, keyboard, mouse, wait
 from shared.flows.cerrar_y_home import cerrar_tabs, volver_a_home
 from shared.flows.validar_cliente import (
     VALID_FUNCIONAL,
@@ -54,7 +53,7 @@ def _read_clipboard_stable(max_attempts: int = 3, delay: float = 0.2) -> str:
     """Lee el portapapeles varias veces hasta dos lecturas iguales."""
     last = ""
     for _ in range(max_attempts):
-        time.sleep(delay)
+        wait.pause(delay)
         txt = clipboard.get_text() or ""
         if txt and txt == last:
             return txt
@@ -131,7 +130,7 @@ def _process_fa_actuales(
         print(f"[CaminoDeudasViejo] Revisando posicion {position + 1} (y={cur_y})")
 
         clipboard.clear()
-        time.sleep(0.2)
+        wait.pause(0.2)
         mouse.right_click(base_x, cur_y, f"fa_seleccion[{position}]", 0.5)
         mouse.click(cpy_x, cur_cpy_y, f"fa_seleccion_copy[{position}]", 0.3)
         copied = _read_clipboard_stable(max_attempts=2, delay=0.3)
@@ -141,15 +140,15 @@ def _process_fa_actuales(
 
         # seleccionar
         mouse.click(base_x, cur_y, f"fa_seleccion[{position}] (select)", 0.5)
-        time.sleep(3.0)
+        wait.pause(3.0)
 
         # saldo
         dx, dy = coords.xy(master, "fa_cobranza.fa_deuda")
         mouse.double_click(dx, dy, "fa_deuda", 0.3)
-        time.sleep(0.3)
+        wait.pause(0.3)
         dcx, dcy = coords.xy(master, "fa_cobranza.fa_deuda_copy")
         clipboard.clear()
-        time.sleep(0.2)
+        wait.pause(0.2)
         mouse.right_click(dx, dy, "fa_deuda (right)", 0.3)
         mouse.click(dcx, dcy, "fa_deuda_copy", 0.3)
         saldo_txt = _read_clipboard_stable(max_attempts=2, delay=0.2)
@@ -161,7 +160,7 @@ def _process_fa_actuales(
         id_txt = ""
         for _ in range(4):
             clipboard.clear()
-            time.sleep(0.2)
+            wait.pause(0.2)
             mouse.right_click(rax, ray, "fa_area_copy", 0.3)
             mouse.click(cpx, cpy, "fa_copy", 0.2)
             id_txt = _read_clipboard_stable(max_attempts=2, delay=0.2)
@@ -208,7 +207,7 @@ def _right_click_copy(x: int, y: int, master: dict, max_attempts: int = 3) -> st
     last = ""
     for _ in range(max_attempts):
         clipboard.clear()
-        time.sleep(0.2)
+        wait.pause(0.2)
         mouse.right_click(x, y, "right_copy", 0.5)
         mouse.click(x + off_x, y + off_y, "context_menu_copy", 0.2)
         txt = _read_clipboard_stable(max_attempts=2, delay=0.2)
@@ -239,7 +238,7 @@ def _process_cuenta_financiera(
             bx, by = coords.xy(master, "resumen_cf.cuenta_financiera_btn")
             mouse.click(bx, by, "cuenta_financiera_btn", base_delay)
             current_cf_y = by
-            time.sleep(1.0)
+            wait.pause(1.0)
         else:
             bx, by = coords.xy(master, "resumen_cf.cuenta_financiera_btn")
             mouse.click(bx, by, "cuenta_financiera_btn", base_delay)
@@ -252,7 +251,7 @@ def _process_cuenta_financiera(
                 sel_y = by + 2 * cf_row_step
             mouse.click(bx, sel_y, f"cuenta_financiera_btn[{cf_index}]", 0.2)
             current_cf_y = sel_y
-            time.sleep(0.6)
+            wait.pause(0.6)
 
         # Validar label
         lcx, lcy = coords.xy(master, "resumen_cf.cuenta_financiera_label_click")
@@ -295,21 +294,21 @@ def _process_cuenta_financiera(
         ml_x, ml_y = coords.xy(master, "resumen_cf.mostrar_lista_btn1")
         if ml_x or ml_y:
             mouse.click(ml_x, ml_y, "mostrar_lista_btn1", base_delay)
-            time.sleep(1.5)
+            wait.pause(1.5)
 
         fcx, fcy = coords.xy(master, "resumen_cf.cuenta_financiera_first_cell")
         if fcx or fcy:
             mouse.click(fcx, fcy, "cf_first_cell", 0.5)
-            time.sleep(0.5)
+            wait.pause(0.5)
 
         # Primer fila: ID + saldo
         clipboard.clear()
-        time.sleep(0.3)
+        wait.pause(0.3)
         keyboard.hotkey("ctrl", "c", delay_after=0.4)
         first_id = clipboard.get_text().strip()
         keyboard.send_right_presses(3, interval=0.2, use_pynput=use_pynput)
         clipboard.clear()
-        time.sleep(0.3)
+        wait.pause(0.3)
         keyboard.hotkey("ctrl", "c", delay_after=0.4)
         first_saldo = clipboard.get_text().strip()
         first_id_num = extract_first_number(first_id) or first_id
@@ -329,12 +328,12 @@ def _process_cuenta_financiera(
         for i in range(1, n_to_copy):
             keyboard.send_down_presses(1, interval=0.3, use_pynput=use_pynput)
             clipboard.clear()
-            time.sleep(0.2)
+            wait.pause(0.2)
             keyboard.hotkey("ctrl", "c", delay_after=0.4)
             id_cf = clipboard.get_text().strip()
             keyboard.send_right_presses(3, interval=0.2, use_pynput=use_pynput)
             clipboard.clear()
-            time.sleep(0.3)
+            wait.pause(0.3)
             keyboard.hotkey("ctrl", "c", delay_after=0.4)
             saldo_cf = clipboard.get_text().strip()
             if id_cf:
@@ -360,7 +359,7 @@ def _capturar_id_registro(master: dict, offset_y: int = 0) -> str:
     cx, cy = coords.xy(master, "validar.validar_copy")
     if cx or cy:
         mouse.click(cx, cy + offset_y, f"validar_copy (off {offset_y})", 0.2)
-    time.sleep(0.1)
+    wait.pause(0.1)
     return _read_clipboard_stable(max_attempts=2, delay=0.2)
 
 
@@ -380,7 +379,7 @@ def _ejecutar_un_registro(
         print("[CaminoDeudasViejo] Registro corrupto, salto")
         return False
 
-    time.sleep(2.0)
+    wait.pause(2.0)
     for clave, label in (
         ("fa_cobranza.fa_cobranza_btn1", "fa_cobranza_btn1"),
         ("fa_cobranza.fa_cobranza_etapa1", "fa_cobranza_etapa1"),
@@ -400,7 +399,7 @@ def run(dni: str, master_path: Path | None, skip_initial: bool = False) -> None:
     base_delay = _float_env("STEP_DELAY", 0.25)
 
     print(f"[CaminoDeudasViejo] Iniciando en {start_delay}s (skip_initial={skip_initial})")
-    time.sleep(start_delay)
+    wait.pause(start_delay)
 
     master = coords.load_master(master_path) if master_path else coords.load_master()
     deudas: list[dict] = []
@@ -408,7 +407,7 @@ def run(dni: str, master_path: Path | None, skip_initial: bool = False) -> None:
 
     if skip_initial:
         print("[CaminoDeudasViejo] MODO SKIP_INITIAL: ya dentro de la cuenta, voy a FA")
-        time.sleep(2.0)
+        wait.pause(2.0)
         for clave, label in (
             ("fa_cobranza.fa_cobranza_btn1", "fa_cobranza_btn1"),
             ("fa_cobranza.fa_cobranza_etapa1", "fa_cobranza_etapa1"),
@@ -453,7 +452,7 @@ def run(dni: str, master_path: Path | None, skip_initial: bool = False) -> None:
         processed_ids.append(current_id)
         _ejecutar_un_registro(master, base_delay, dni, deudas, streamed_ids)
 
-    time.sleep(2.0)
+    wait.pause(2.0)
     volver_a_home(master)
     _emitir_resultado(dni, deudas)
 
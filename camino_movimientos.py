@@ -26,7 +26,6 @@ import csv
 import os
 import re
 import sys
-import time
 from pathlib import Path
 from typing import Any
 
@@ -36,7 +35,7 @@ _HERE = Path(__file__).resolve().parent
 if str(_HERE) not in sys.path:
     sys.path.insert(0, str(_HERE))
 
-from shared import clipboard, coords as coords_mod, io_worker, keyboard, logging_utils, mouse
+from shared import clipboard, coords as coords_mod, io_worker, keyboard, logging_utils, mouse, wait
 from shared.parsing import parse_numbers_from_domicilio
 
 try:
@@ -80,21 +79,21 @@ def _limpiar_campo(master: dict, key: str, label: str) -> None:
         return
     print(f"[CaminoMovimientos] Limpiando {label}")
     pg.click(fx, fy)
-    time.sleep(0.15)
+    wait.pause(0.15)
     pg.click()
-    time.sleep(0.08)
+    wait.pause(0.08)
     pg.click()
-    time.sleep(0.15)
+    wait.pause(0.15)
     pg.press("delete")
-    time.sleep(0.4)
+    wait.pause(0.4)
     pg.press("backspace")
-    time.sleep(0.15)
+    wait.pause(0.15)
     pg.click(fx, fy)
-    time.sleep(0.15)
+    wait.pause(0.15)
     for _ in range(3):
         pg.press("backspace")
-        time.sleep(0.08)
-    time.sleep(0.15)
+        wait.pause(0.08)
+    wait.pause(0.15)
 
 
 def _limpiar_service_id(master: dict) -> None:
@@ -102,21 +101,21 @@ def _limpiar_service_id(master: dict) -> None:
     if not (sx or sy):
         return
     mouse.click(sx, sy, "Service ID field", 0.3)
-    time.sleep(0.2)
+    wait.pause(0.2)
     pg.click()
-    time.sleep(0.1)
+    wait.pause(0.1)
     pg.click()
-    time.sleep(0.2)
+    wait.pause(0.2)
     pg.press("delete")
-    time.sleep(0.5)
+    wait.pause(0.5)
     pg.press("backspace")
-    time.sleep(0.2)
+    wait.pause(0.2)
     pg.click(sx, sy)
-    time.sleep(0.2)
+    wait.pause(0.2)
     for _ in range(3):
         pg.press("backspace")
-        time.sleep(0.1)
-    time.sleep(0.2)
+        wait.pause(0.1)
+    wait.pause(0.2)
 
 
 def _navegar_sin_mouse(config: dict) -> None:
@@ -132,7 +131,7 @@ def _navegar_sin_mouse(config: dict) -> None:
                     for _ in range(steps):
                         kb.press(KBKey.right)
                         kb.release(KBKey.right)
-                        time.sleep(delay)
+                        wait.pause(delay)
                 else:
                     keyboard.send_right_presses(steps, delay, use_pynput=False)
             elif method == "right_arrow":
@@ -140,15 +139,15 @@ def _navegar_sin_mouse(config: dict) -> None:
             elif method == "ctrl_tab":
                 for _ in range(steps):
                     pg.hotkey("ctrl", "tab")
-                    time.sleep(delay)
+                    wait.pause(delay)
             elif method == "tab":
                 for _ in range(steps):
                     pg.press("tab")
-                    time.sleep(delay)
+                    wait.pause(delay)
             else:
                 print(f"[CaminoMovimientos] metodo nav desconocido '{method}', skip")
                 continue
-            time.sleep(0.3)
+            wait.pause(0.3)
         except Exception as e:
             print(f"[CaminoMovimientos] error en nav '{method}': {e}")
 
@@ -212,17 +211,17 @@ def _validar_tiene_movimientos(master: dict) -> tuple[bool, str]:
         return False, ""
 
     clipboard.clear()
-    time.sleep(0.2)
+    wait.pause(0.2)
     pg.moveTo(isx, isy, duration=0.15)
-    time.sleep(0.2)
+    wait.pause(0.2)
     pg.click()
-    time.sleep(0.3)
+    wait.pause(0.3)
     pg.rightClick()
-    time.sleep(0.3)
+    wait.pause(0.3)
     pg.moveTo(icx, icy, duration=0.1)
-    time.sleep(0.1)
+    wait.pause(0.1)
     pg.click()
-    time.sleep(0.5)
+    wait.pause(0.5)
     text = clipboard.get_text().strip()
     parts = _parse_data_line(text)
     if len(parts) < 3:
@@ -250,17 +249,17 @@ def _recolectar_ids_uno_por_uno(master: dict, log_path: Path, dni: str, max_posi
         cur_y = is_y + pos * offset_y
         cur_copy_y = ic_y + pos * offset_y
         clipboard.clear()
-        time.sleep(0.1)
+        wait.pause(0.1)
         pg.moveTo(is_x, cur_y, duration=0.1)
-        time.sleep(0.1)
+        wait.pause(0.1)
         pg.click()
-        time.sleep(0.15)
+        wait.pause(0.15)
         pg.rightClick()
-        time.sleep(0.2)
+        wait.pause(0.2)
         pg.moveTo(ic_x, cur_copy_y, duration=0.08)
-        time.sleep(0.08)
+        wait.pause(0.08)
         pg.click()
-        time.sleep(0.3)
+        wait.pause(0.3)
         text = clipboard.get_text().strip()
         if not text or text == prev:
             print(f"[CaminoMovimientos] fin en pos {pos + 1} ({'vacio' if not text else 'repetido'})")
@@ -273,7 +272,7 @@ def _recolectar_ids_uno_por_uno(master: dict, log_path: Path, dni: str, max_posi
         log_entry = f"DNI_{dni}  Pos{pos + 1} | ID Servicio: {id_extracted} | Fecha: {fecha} | Full: {text[:200]}"
         logging_utils.append_log_raw(log_path, log_entry)
         prev = text
-        time.sleep(0.3)
+        wait.pause(0.3)
     # dedupe preservando orden
     return list(dict.fromkeys(ids))
 
@@ -297,7 +296,7 @@ def _procesar_service_id(
     _limpiar_service_id(master)
     keyboard.type_text(service_id, 0.3)
     keyboard.press_enter(0.5)
-    time.sleep(post_enter_delay)
+    wait.pause(post_enter_delay)
 
     tiene, validation_text = _validar_tiene_movimientos(master)
     if not tiene:
@@ -323,15 +322,15 @@ def _procesar_service_id(
     cx, cy = coords_mod.xy(master, "movimientos.copy_area2")
     mouse.click(cx, cy, "Copy area", 0.5)
     clipboard.clear()
-    time.sleep(0.2)
+    wait.pause(0.2)
     pg.hotkey("ctrl", "c")
-    time.sleep(1.0)
+    wait.pause(1.0)
     clip_txt = clipboard.get_text()
     if not clip_txt.strip():
         mouse.click(cx, cy, "Copy area (retry)", 0.5)
-        time.sleep(0.3)
+        wait.pause(0.3)
         pg.hotkey("ctrl", "c")
-        time.sleep(1.0)
+        wait.pause(1.0)
         clip_txt = clipboard.get_text()
 
     display_txt = clip_txt.replace("\r", " ").replace("\n", " ").strip()
@@ -351,7 +350,7 @@ def _procesar_service_id(
                 new_trailing = trailing
 
     logging_utils.append_log_raw(log_path, log_line)
-    time.sleep(base_delay)
+    wait.pause(base_delay)
 
     bx, by = coords_mod.xy(master, "comunes.close_tab_btn2")
     mouse.click(bx, by, "Cerrar pestana", base_delay)
@@ -377,7 +376,7 @@ def run(
     # No emitimos "iniciando" desde aca para evitar duplicados al frontend.
 
     print(f"[CaminoMovimientos] Iniciando en {start_delay}s")
-    time.sleep(start_delay)
+    wait.pause(start_delay)
 
     master = coords_mod.load_master(coords_path) if coords_path else coords_mod.load_master()
     if not coords_mod.get(master, "movimientos"):
@@ -412,7 +411,7 @@ def run(
     if busqueda_directa:
         print("[CaminoMovimientos] modo busqueda directa: DNI no esta en CSV")
         keyboard.press_enter(post_enter_delay)
-        time.sleep(post_enter_delay)
+        wait.pause(post_enter_delay)
         ids = _recolectar_ids_uno_por_uno(master, log_path, dni)
         if not ids:
             print("[CaminoMovimientos] busqueda directa no encontro IDs validos")
@@ -433,17 +432,17 @@ def run(
     if sx or sy:
         mouse.click(sx, sy, "Service ID (final)", 0.1)
         pg.press("home")
-        time.sleep(0.1)
+        wait.pause(0.1)
         pg.hotkey("shift", "end")
-        time.sleep(0.2)
+        wait.pause(0.2)
         pg.press("delete")
     dx, dy = coords_mod.xy(master, field_key)
     if dx or dy:
         mouse.click(dx, dy, f"{field_label} (final)", 0.1)
         pg.press("home")
-        time.sleep(0.1)
+        wait.pause(0.1)
         pg.hotkey("shift", "end")
-        time.sleep(0.2)
+        wait.pause(0.2)
         pg.press("delete")
 
     # El dispatcher (scripts/movimientos.py) emite el "completado" con los
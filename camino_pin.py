@@ -29,7 +29,7 @@ _HERE = Path(__file__).resolve().parent
 if str(_HERE) not in sys.path:
     sys.path.insert(0, str(_HERE))
 
-from shared import capture as cap
+from shared import capture as cap, wait
 from shared import coords as coords_mod
 from shared import io_worker, keyboard, mouse
 
@@ -110,7 +110,7 @@ def run(dni: str, master_path: Path | None, enter_times_cli: int | None) -> None
     enter_times, source = _resolve_enter_times(enter_times_cli)
     print(f"[CaminoPin] enter_times={enter_times} (source={source})")
     print(f"[CaminoPin] Iniciando en {start_delay}s...")
-    time.sleep(start_delay)
+    wait.pause(start_delay)
 
     master = coords_mod.load_master(master_path) if master_path else coords_mod.load_master()
     pin_section = coords_mod.get(master, "pin")
@@ -142,7 +142,7 @@ def run(dni: str, master_path: Path | None, enter_times_cli: int | None) -> None
         if is_last:
             if pre_ok_delay > 0:
                 print(f"[CaminoPin] Espera {pre_ok_delay}s antes de Enter final")
-                time.sleep(pre_ok_delay)
+                wait.pause(pre_ok_delay)
             screenshot_path, screenshot_b64 = _captura_y_b64(dni)
         print(f"[CaminoPin] Enter {i + 1}/{total}")
         keyboard.press_enter(enter_delay)
@@ -12,15 +12,16 @@ Flujo:
   6. nombre_cliente_btn -> Enter (elimina cartel)
   7. copiar_score -> capturar_score
   8. si CUIT: extraer_dni_desde_cuit (dni_fallback)
-  9. cerrar_y_home
- 10. Resultado JSON: {dni, score, success, timestamp, ids_cliente?, dni_fallback?, caso_especial?}
+  9. cerrar_y_home; con continuar_si_80 y score 80 solo se cierran las tabs
+    hasta la pantalla del cliente (camino_deudas_principal sigue desde ahi)
+ 10. Resultado JSON: {dni, score, success, timestamp, ids_cliente?, dni_fallback?, caso_especial?,
+     tabla_ver_todos?, fa_data?, en_cliente?}
 """
 from __future__ import annotations
 
 import argparse
 import os
 import sys
-import time
 from pathlib import Path
 
 import pyautogui as pg
@@ -29,10 +30,12 @@ _HERE = Path(__file__).resolve().parent
 if str(_HERE) not in sys.path:
     sys.path.insert(0, str(_HERE))
 
-from shared import clipboard, coords, io_worker, keyboard, mouse
+from shared import capture as cap
+from shared import clipboard, coords, io_worker, keyboard, mouse, screen_state, wait
 from shared.flows.cerrar_y_home import cerrar_y_home, cerrar_tabs, volver_a_home
 from shared.flows.entrada_cliente import entrada_cliente
 from shared.flows.extraer_dni_cuit import extraer_dni_desde_cuit
+from shared.flows.iterar_registros import parse_fa_data
 from shared.flows.score import capturar_score, copiar_score
 from shared.flows.telefonico import es_telefonico
 from shared.flows.validar_cliente import (
@@ -47,6 +50,7 @@ from shared.validate import is_cuit
 
 CAPTURE_DIR_DEFAULT = _HERE / "capturas_camino_c"
 MAX_VALIDATION_ATTEMPTS = 10
+SCORE_DEUDAS = "80"  # score que dispara la busqueda de deudas
 
 
 def _float_env(name: str, default: float) -> float:
@@ -65,18 +69,47 @@ def _cerrar_fraude(master: dict) -> None:
     volver_a_home(master)
 
 
-def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
+def _quedo_en_cliente(master: dict, cuit: bool) -> bool:
+    """Confirma que el cierre de SCORE_TABS_A_CLIENTE tabs dejo T3 en el cliente.
+
+    Con firmas (screen_state) se mira la pantalla. Sin firmas el numero fijo
+    solo esta probado con DNI: con CUIT (extraccion del DNI asociado de por
+    medio) no se arriesga y se vuelve a home.
+    """
+    llegada = screen_state.en(master, "cliente")
+    if llegada is True:
+        return True
+    if llegada is None and not cuit:
+        return True
+    motivo = "pantalla no reconocida con CUIT" if llegada is None else f"pantalla '{screen_state.ultima()}'"
+    print(f"[CaminoScore] WARN no quedo en el cliente ({motivo}): cierro y vuelvo a home")
+    return False
+
+
+def run(dni: str, master_path: Path | None, shot_dir: Path, continuar_si_80: bool = False) -> None:
+    """continuar_si_80: si el score es 80 no vuelve a home; deja T3 en la pantalla
+    del cliente y agrega la tabla de Ver Todos al resultado para camino_deudas_principal.
+    """
     pg.FAILSAFE = True
     start_delay = _float_env("COORDS_START_DELAY", 0.375)
     base_delay = _float_env("STEP_DELAY", 0.25)
     post_enter = _float_env("POST_ENTER_DELAY", 1.0)
 
     print(f"[CaminoScore] Iniciando en {start_delay}s...")
-    time.sleep(start_delay)
+    wait.pause(start_delay)
 
     master = coords.load_master(master_path) if master_path else coords.load_master()
     cuit = is_cuit(dni)
 
+    # hash de la zona de resultados justo ANTES del Enter que dispara la busqueda
+    # (no antes de los clicks de tipo de documento): la espera del paso 2
+    # vuelve apenas esa zona cambio y quedo quieta
+    region_validar = coords.region(master, "estabilidad.validar")
+    antes_validar: list[int | None] = [None]
+
+    def _marcar_validar() -> None:
+        antes_validar[0] = cap.region_hash(region_validar)
+
     # 1. entrada
     entrada_cliente(
         master,
@@ -84,11 +117,12 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
         cliente_section_key="cliente_section2",
         base_delay=base_delay,
         post_enter_delay=post_enter,
+        antes_de_enter=_marcar_validar,
     )
 
     # 2. validar cliente creado
     print("[CaminoScore] Validando si cliente esta creado...")
-    time.sleep(2.5)
+    cap.wait_until_stable(region_validar, 2.5, baseline=antes_validar[0], site="settle:validar")
     creado, texto_copiado = validar_cliente_creado(master, base_delay=base_delay)
 
     # 3. caso especial Telefonico ANTES de Ver Todos (cuenta unica, entra directo al score)
@@ -96,16 +130,18 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
     # y se iba directo al score. El orden DEBE ser: Telefonico -> no_creado -> Ver Todos.
     if creado and es_telefonico(texto_copiado):
         print("[CaminoScore] CASO ESPECIAL: Telefonico (cuenta unica)")
-        time.sleep(2.0)
+        wait.pause(2.0)
         nx, ny = coords.xy(master, "score.nombre_cliente_btn")
         if nx or ny:
-            time.sleep(2.5)
+            wait.pause(2.5)
             mouse.click(nx, ny, "nombre_cliente_btn", base_delay)
-        time.sleep(1.0)
+        wait.pause(1.0)
         keyboard.press_enter(0.5)
 
         score_value = copiar_score(master, pre_delay=2.5)
         shot_path = capturar_score(master, dni, shot_dir)
+        print(f"[CaminoScore] SCORE_CAPTURADO:{score_value}")
+        io_worker.emit_fase(io_worker.FASE_CIERRE, score=score_value)
         cerrar_tabs(master, veces=5, close_tab_key="close_tab_btn1")
         volver_a_home(master)
 
@@ -137,6 +173,7 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
         if shot_path:
             result["screenshot"] = str(shot_path)
         io_worker.print_json_result(result)
+        io_worker.emit_fase(io_worker.FASE_CIERRE, score=result["score"])
         cerrar_tabs(master, veces=5, close_tab_key="close_tab_btn1")
         volver_a_home(master)
         print("[CaminoScore] Finalizado - cliente no creado")
@@ -145,7 +182,7 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
     # 5. Ver Todos -> extraer ids_cliente (solo clientes normales creados)
     ids_cliente: list[str] = []
     print("[CaminoScore] Cliente creado, extrayendo IDs via Ver Todos...")
-    time.sleep(1.0)
+    wait.pause(1.0)
     tabla = copiar_tabla(master, ver_todos_key="ver_todos_btn1", close_tab_key="close_tab_btn1")
     if tabla:
         ids_cliente = extract_ids_cliente_from_table(tabla)
@@ -168,9 +205,10 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
         mouse.click(sx, sy, "seleccionar_btn1", base_delay)
 
         # fraude
-        time.sleep(1.5)
+        wait.pause(1.5)
         if validar_fraude(master, base_delay=0.5):
             print("[CaminoScore] FRAUDE detectado")
+            io_worker.emit_fase(io_worker.FASE_CIERRE, score="FRAUDE")
             _cerrar_fraude(master)
             result = {
                 "dni": dni,
@@ -198,27 +236,28 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
             break
 
         print("[CaminoScore] Registro corrupto, navegando al siguiente")
-        time.sleep(1.0)
+        wait.pause(1.0)
         mouse.click(cx, cy, "client_id_field2", base_delay)
-        time.sleep(0.3)
+        wait.pause(0.3)
         keyboard.send_down_presses(1, interval=0.15, use_pynput=use_pynput)
 
     if not validation_success:
         print("[CaminoScore] WARN no se encontro registro funcional tras todos los intentos")
 
-    time.sleep(2.0)
+    wait.pause(2.0)
 
     # 7. nombre_cliente_btn + Enter para eliminar cartel
     nx, ny = coords.xy(master, "score.nombre_cliente_btn")
     if nx or ny:
-        time.sleep(2.5)
+        wait.pause(2.5)
         mouse.click(nx, ny, "nombre_cliente_btn", base_delay)
-    time.sleep(1.0)
+    wait.pause(1.0)
     keyboard.press_enter(0.5)
 
     # 8. score + captura
     score_value = copiar_score(master, pre_delay=2.5)
     shot_path = capturar_score(master, dni, shot_dir)
+    print(f"[CaminoScore] SCORE_CAPTURADO:{score_value}")
 
     # 9. fallback DNI si CUIT
     dni_fallback: str | None = None
@@ -226,8 +265,16 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
         print("[CaminoScore] CUIT: extrayendo DNI asociado como fallback")
         dni_fallback = extraer_dni_desde_cuit(master)
 
-    # 10. cerrar y home
-    cerrar_y_home(master, veces=5, close_tab_key="close_tab_btn1")
+    # 10. cerrar y home (o quedarse en el cliente si siguen las deudas)
+    en_cliente = continuar_si_80 and score_value == SCORE_DEUDAS and bool(tabla)
+    if en_cliente:
+        tabs = int(_float_env("SCORE_TABS_A_CLIENTE", 2))
+        print(f"[CaminoScore] score {score_value}: cerrando {tabs} tabs, sigo en el cliente")
+        cerrar_tabs(master, veces=tabs, close_tab_key="close_tab_btn1", destino="cliente")
+        en_cliente = _quedo_en_cliente(master, cuit)
+    if not en_cliente:
+        io_worker.emit_fase(io_worker.FASE_CIERRE, score=score_value)
+        cerrar_y_home(master, veces=5, close_tab_key="close_tab_btn1")
 
     # 11. resultado
     result = {
@@ -243,6 +290,10 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
         result["dni_fallback"] = dni_fallback
     if shot_path:
         result["screenshot"] = str(shot_path)
+    if en_cliente:
+        result["en_cliente"] = True
+        result["tabla_ver_todos"] = tabla
+        result["fa_data"] = parse_fa_data(tabla, log_prefix="[CaminoScore]")
     io_worker.print_json_result(result)
     print("[CaminoScore] Finalizado.")
 
@@ -260,6 +311,11 @@ def _parse_args() -> argparse.Namespace:
         default=str(CAPTURE_DIR_DEFAULT),
         help="Directorio de capturas",
     )
+    ap.add_argument(
+        "--continuar-si-80",
+        action="store_true",
+        help="Con score 80 no volver a home (sigue camino_deudas_principal)",
+    )
     return ap.parse_args()
 
 
@@ -267,7 +323,7 @@ if __name__ == "__main__":
     try:
         args = _parse_args()
         master_path = Path(args.coords) if args.coords else None
-        run(args.dni, master_path, Path(args.shots_dir))
+        run(args.dni, master_path, Path(args.shots_dir), continuar_si_80=args.continuar_si_80)
     except KeyboardInterrupt:
         print("[CaminoScore] Interrumpido por usuario")
         sys.exit(130)
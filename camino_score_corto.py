@@ -18,7 +18,6 @@ from __future__ import annotations
 import argparse
 import os
 import sys
-import time
 from pathlib import Path
 
 import pyautogui as pg
@@ -27,7 +26,7 @@ _HERE = Path(__file__).resolve().parent
 if str(_HERE) not in sys.path:
     sys.path.insert(0, str(_HERE))
 
-from shared import coords, io_worker, keyboard, mouse
+from shared import coords, io_worker, keyboard, mouse, wait
 from shared.flows.cerrar_y_home import cerrar_tabs, volver_a_home
 from shared.flows.entrada_cliente import entrada_cliente
 from shared.flows.score import capturar_score
@@ -59,7 +58,7 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
     post_enter = _float_env("POST_ENTER_DELAY", 2.0)
 
     print(f"[CaminoScoreCorto] Iniciando en {start_delay}s...")
-    time.sleep(start_delay)
+    wait.pause(start_delay)
 
     master = coords.load_master(master_path) if master_path else coords.load_master()
 
@@ -71,7 +70,7 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
         base_delay=base_delay,
         post_enter_delay=post_enter,
     )
-    time.sleep(2.0)
+    wait.pause(2.0)
 
     # 2. Ver Todos -> contar
     tabla = copiar_tabla(
@@ -90,6 +89,7 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
             "error": "No se pudo obtener total de cuentas",
             "timestamp": io_worker.now_ms(),
         }
+        io_worker.emit_fase(io_worker.FASE_CIERRE)
         cerrar_tabs(master, veces=5, close_tab_key="close_tab_btn1")
         volver_a_home(master)
         io_worker.print_json_result(result)
@@ -104,10 +104,10 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
         print(f"[CaminoScoreCorto] Bajando {downs_needed} filas hasta la ultima")
         use_pynput = os.getenv("NAV_USE_PYNPUT", "1") in ("1", "true", "True")
         keyboard.send_down_presses(downs_needed, interval=0.15, use_pynput=use_pynput)
-        time.sleep(0.5)
+        wait.pause(0.5)
     else:
         print("[CaminoScoreCorto] Una sola cuenta, no hay que navegar")
-        time.sleep(0.5)
+        wait.pause(0.5)
 
     keyboard.press_enter(1.5)
 
@@ -122,6 +122,7 @@ def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
     captura_ok = shot_path is not None
 
     # 6. cerrar y home
+    io_worker.emit_fase(io_worker.FASE_CIERRE)
     cerrar_tabs(master, veces=5, close_tab_key="close_tab_btn1")
     volver_a_home(master)
 
@@ -0,0 +1,131 @@
+"""Camino Score + Deudas (modo normal en una sola navegacion).
+
+Junta camino_score y camino_deudas_principal sin salir del cliente:
+
+Flujo:
+  1. camino_score con continuar_si_80: entrada, validacion, Ver Todos, score.
+     Apenas copia el score imprime SCORE_CAPTURADO (el worker manda el
+     partial score_obtenido ahi mismo, antes de buscar deudas).
+  2. score != 80 (o fraude / no creado / telefonico): resultado del score, fin.
+  3. score == 80 y T3 quedo en el cliente: camino_deudas_principal desde la
+     pantalla del cliente con la tabla de Ver Todos del score (sin entrada, sin
+     validacion, sin segundo Ver Todos, sin pasar por home).
+     Si el score tuvo que volver a home (tabla vacia) las deudas entran de cero.
+  4. Sin deudas con CUIT y hay dni_fallback: reintento del principal con el DNI.
+  5. Resultado JSON: {**score, **deudas} (sin las claves internas del score).
+
+Marcadores que el worker reconoce:
+  [CaminoScore] SCORE_CAPTURADO:{score}
+  [CUENTAS_TOTAL] / [CUENTA_ITEM] {...}  (de iterar_registros)
+
+El modo validacion (umbral, camino_deudas_provisorio) no pasa por aca.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+_HERE = Path(__file__).resolve().parent
+if str(_HERE) not in sys.path:
+    sys.path.insert(0, str(_HERE))
+
+import camino_deudas_principal
+import camino_score
+from shared import coords, io_worker
+from shared.flows.cerrar_y_home import cerrar_y_home
+
+CAPTURE_DIR_DEFAULT = _HERE / "capturas_camino_c"
+LOG_PREFIX = "[CaminoScoreDeudas]"
+SIN_DEUDAS = (None, "$0,00")
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _buscar_deudas(master: dict, dni: str, shot_dir: Path, **kwargs) -> dict | None:
+    """camino_deudas_principal.buscar_deudas; devuelve su resultado como dict."""
+    base_delay = _float_env("STEP_DELAY", 0.5)
+    post_enter = _float_env("POST_ENTER_DELAY", 1.0)
+    with io_worker.capturar_resultado() as captura:
+        camino_deudas_principal.buscar_deudas(master, dni, shot_dir, base_delay, post_enter, **kwargs)
+    return captura.result
+
+
+def run(dni: str, master_path: Path | None, shot_dir: Path) -> None:
+    # 1. score (deja T3 en el cliente si da 80)
+    with io_worker.capturar_resultado() as captura:
+        camino_score.run(dni, master_path, shot_dir, continuar_si_80=True)
+    score_data = captura.result
+    if score_data is None:
+        print(f"{LOG_PREFIX} camino_score no devolvio resultado")
+        return
+    reuso = {k: score_data.pop(k) for k in io_worker.CLAVES_REUSO if k in score_data}
+
+    # 2. sin deudas que buscar
+    if io_worker.score_num(score_data.get("score")) != int(camino_score.SCORE_DEUDAS):
+        io_worker.print_json_result(score_data)
+        print(f"{LOG_PREFIX} Finalizado - score {score_data.get('score')}")
+        return
+
+    master = coords.load_master(master_path) if master_path else coords.load_master()
+    ids_cliente = [str(x) for x in score_data.get("ids_cliente", [])] or None
+    dni_fallback = score_data.get("dni_fallback")
+    print(f"{LOG_PREFIX} score 80, buscando deudas sin salir del cliente")
+
+    try:
+        # 3. deudas desde la pantalla del cliente
+        kwargs: dict = {"ids_cliente_filter": ids_cliente, "cierre_final": not dni_fallback}
+        if reuso.get("en_cliente"):
+            kwargs.update(
+                tabla=reuso.get("tabla_ver_todos"),
+                fa_data_list=reuso.get("fa_data"),
+                desde_cliente=True,
+            )
+        else:
+            print(f"{LOG_PREFIX} camino_score volvio a home, deudas con entrada completa")
+        deudas = _buscar_deudas(master, score_data.get("dni", dni), shot_dir, **kwargs)
+
+        # 4. reintento con DNI fallback (CUIT sin deudas)
+        if dni_fallback and deudas and deudas.get("total_deuda") in SIN_DEUDAS:
+            print(f"{LOG_PREFIX} Sin fa_saldos con CUIT, reintentando con DNI fallback: {dni_fallback}")
+            fallback = _buscar_deudas(master, dni_fallback, shot_dir, ids_cliente_filter=ids_cliente)
+            if fallback:
+                deudas = fallback
+    except Exception as e:
+        # El score ya se mostro: que el resultado lo lleve aunque fallen las deudas
+        print(f"{LOG_PREFIX} ERROR buscando deudas: {e}")
+        io_worker.print_json_result(score_data)
+        # T3 quedo a mitad de las deudas (fuera de home): cerrar antes de salir
+        try:
+            cerrar_y_home(master, veces=5, close_tab_key="close_tab_btn1")
+        except Exception as e2:
+            print(f"{LOG_PREFIX} WARN no se pudo volver a home: {e2}")
+        raise
+
+    # 5. resultado
+    io_worker.print_json_result({**score_data, **(deudas or {})})
+    print(f"{LOG_PREFIX} Finalizado.")
+
+
+def _parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Camino Score + Deudas (modo normal, una navegacion)")
+    ap.add_argument("--dni", required=True, help="DNI/CUIT a procesar")
+    ap.add_argument("--coords", default=None, help="Ruta del JSON master")
+    ap.add_argument("--shots-dir", default=str(CAPTURE_DIR_DEFAULT), help="Directorio de capturas")
+    return ap.parse_args()
+
+
+if __name__ == "__main__":
+    try:
+        args = _parse_args()
+        master_path = Path(args.coords) if args.coords else None
+        run(args.dni, master_path, Path(args.shots_dir))
+    except KeyboardInterrupt:
+        print(f"{LOG_PREFIX} Interrumpido por usuario")
+        sys.exit(130)
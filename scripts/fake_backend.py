@@ -0,0 +1,143 @@
+"""
+Backend falso para probar el worker en local (sin backend-T3).
+
+Implementa los endpoints HTTP que usa BackendClient y registra lo que recibe,
+para medir cuántos mensajes genera una tarea (por ejemplo, comparar
+UPDATE_COALESCE_MS=0 contra UPDATE_COALESCE_MS=200).
+
+No implementa el WebSocket: el worker cae al polling HTTP y todos los updates
+pasan por /workers/task_update y /workers/task_update_batch.
+
+Uso:
+    python scripts/fake_backend.py --port 8009 --tarea deudas:12345678 --tarea deudas:20123456
+    python Workers-T3/worker.py --backend http://127.0.0.1:8009 --pc_id VM_TEST --tipo deudas --api_key x --dry-run
+
+Presiona CTRL+C para salir; imprime un resumen de mensajes recibidos.
+"""
+import argparse
+import itertools
+import json
+import threading
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+parser = argparse.ArgumentParser(description="Backend falso para probar el worker")
+parser.add_argument("--port", type=int, default=8009)
+parser.add_argument("--tarea", action="append", default=[],
+                    help="tipo:datos a encolar (repetible), ej: deudas:12345678")
+parser.add_argument("--sin-lote", action="store_true",
+                    help="Responde 404 en /workers/task_update_batch (prueba el fallback)")
+parser.add_argument("--quiet", action="store_true", help="No imprime cada update")
+args = parser.parse_args()
+
+lock = threading.Lock()
+ids = itertools.count(1)
+tareas = deque()
+asignadas = {}
+stats = Counter()
+vistos = set()  # update_id ya aplicados (reenvíos del outbox del worker)
+
+for spec in args.tarea:
+    tipo, _, datos = spec.partition(":")
+    tareas.append({"task_id": f"fake-{next(ids)}", "tipo": tipo, "datos": datos})
+
+
+def resumen_update(partial):
+    etapa = partial.get("etapa", "")
+    info = str(partial.get("info", ""))[:80]
+    return f"{partial.get('status', '')} | {etapa}: {info}"
+
+
+class Handler(BaseHTTPRequestHandler):
+    def _json(self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            return self._json(400, {"status": "error", "detail": "JSON inválido"})
+
+        path = self.path
+        with lock:
+            stats[path.split("/")[2] if path.startswith("/workers/") else path] += 1
+
+        if path.startswith("/workers/register/"):
+            return self._json(200, {"status": "ok"})
+
+        if path == "/workers/get_task":
+            tipo = body.get("tipo")
+            with lock:
+                for t in list(tareas):
+                    if t["tipo"] == tipo:
+                        tareas.remove(t)
+                        asignadas[t["task_id"]] = t
+                        print(f"[GET_TASK] {body.get('pc_id')} ← {t['task_id']} ({t['datos']})")
+                        return self._json(200, {"status": "ok", "task": t})
+            return self._json(200, {"status": "empty"})
+
+        if path == "/workers/release_task":
+            with lock:
+                t = asignadas.pop(body.get("task_id"), None)
+                if t:
+                    tareas.appendleft(t)
+            print(f"[RELEASE] {body.get('task_id')} {'devuelta a la cola' if t else 'desconocida'}")
+            return self._json(200, {"status": "ok" if t else "not_found"})
+
+        if path == "/workers/task_update":
+            update_id = body.get("update_id")
+            with lock:
+                repetido = bool(update_id) and update_id in vistos
+                if update_id:
+                    vistos.add(update_id)
+                stats["duplicados" if repetido else "partials"] += 1
+            if repetido:
+                print(f"[UPDATE] {body.get('task_id')} | duplicado {update_id}, ignorado")
+                return self._json(200, {"status": "ok"})
+            if not args.quiet:
+                print(f"[UPDATE] {body.get('task_id')} | {resumen_update(body.get('partial_data', {}))}")
+            return self._json(200, {"status": "ok"})
+
+        if path == "/workers/task_update_batch":
+            if args.sin_lote:
+                return self._json(404, {"detail": "Not Found"})
+            updates = body.get("updates", [])
+            with lock:
+                stats["partials"] += len(updates)
+            if not args.quiet:
+                print(f"[BATCH] {body.get('task_id')} | {len(updates)} partials")
+                for p in updates:
+                    print(f"    {resumen_update(p)}")
+            return self._json(200, {"status": "ok"})
+
+        if path == "/workers/task_done":
+            print(f"[DONE] {body.get('task_id')} {body.get('status')} ({body.get('execution_time')}s)")
+            return self._json(200, {"status": "ok"})
+
+        return self._json(404, {"detail": "Not Found"})
+
+    def do_GET(self):
+        # /workers/ws/{pc_id}: sin WebSocket, el worker queda en polling
+        self._json(404, {"detail": "Not Found"})
+
+    def log_message(self, format, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("0.0.0.0", args.port), Handler)
+print(f"=== BACKEND FALSO en :{args.port} — {len(tareas)} tareas en cola ===")
+try:
+    server.serve_forever()
+except KeyboardInterrupt:
+    pass
+finally:
+    server.server_close()
+    print("\n=== RESUMEN ===")
+    for k, v in sorted(stats.items()):
+        print(f"{k:20s} {v}")
@@ -0,0 +1,179 @@
+"""Auto-ajuste de demoras por paso: aprende la espera minima segura de cada click.
+
+Las demoras de los clicks (`delay` de shared.mouse, que hoy sale de STEP_DELAY
+y de literales por camino) se calibraron a mano para el peor dia. Con
+AUTOTUNE=1:
+
+- Cada click queda "pendiente" con su label y la demora que uso. El paso se
+  identifica por label + default (`home_area@0.5`): el mismo boton con otra
+  demora base en otro punto del camino aprende por separado.
+- La siguiente verificacion del camino decide si salio bien: el clipboard
+  cambio (clipboard.wait_change) o la region vigilada cambio y se
+  estabilizo (capture.wait_until_stable). El resultado se anota para todos
+  los clicks pendientes desde la verificacion anterior.
+- Tras AUTOTUNE_MUESTRAS exitos seguidos, y con la tasa de exito de la
+  ventana (ultimos AUTOTUNE_VENTANA) >= AUTOTUNE_TARGET, la demora baja un
+  AUTOTUNE_PASO. Nunca baja del piso (AUTOTUNE_PISO_S o AUTOTUNE_MIN_FRAC del
+  default, el mayor) ni sube del default del codigo.
+- Un fallo vuelve al default en el acto; bajar otra vez exige que la tasa de
+  la ventana se recupere.
+- Lo pendiente se descarta al empezar cada tarea (`reiniciar`, desde
+  wait.begin): un click de la tarea anterior no se juzga con la siguiente.
+- El perfil es por VM (PC_ID / COMPUTERNAME) y se guarda en AUTOTUNE_FILE al
+  cerrar cada tarea. Si el default de un paso cambia en el codigo es otro
+  paso y empieza de cero.
+
+`python -m shared.autotune` muestra el perfil; `... reset` lo borra.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+AUTOTUNE = os.getenv("AUTOTUNE", "0").lower() in ("1", "true", "yes", "on")
+AUTOTUNE_TARGET = float(os.getenv("AUTOTUNE_TARGET", "0.98"))
+AUTOTUNE_VENTANA = int(os.getenv("AUTOTUNE_VENTANA", "50"))
+AUTOTUNE_MUESTRAS = int(os.getenv("AUTOTUNE_MUESTRAS", "10"))
+AUTOTUNE_PASO = float(os.getenv("AUTOTUNE_PASO", "0.85"))
+AUTOTUNE_PISO_S = float(os.getenv("AUTOTUNE_PISO_S", "0.05"))
+AUTOTUNE_MIN_FRAC = float(os.getenv("AUTOTUNE_MIN_FRAC", "0.3"))
+VM = os.getenv("PC_ID") or os.getenv("COMPUTERNAME") or socket.gethostname()
+AUTOTUNE_FILE = Path(os.getenv("AUTOTUNE_FILE", str(Path(__file__).parent / f"autotune_{VM}.json")))
+
+_lock = threading.Lock()
+_perfil: dict[str, dict[str, Any]] | None = None
+_pendientes: list[tuple[str, float]] = []  # (paso, demora usada) desde la ultima verificacion
+_sucio = False
+
+
+# ── Perfil ─────────────────────────────────────────────────────────────────────
+def _cargar() -> dict[str, dict[str, Any]]:
+    global _perfil
+    if _perfil is None:
+        try:
+            data = json.loads(AUTOTUNE_FILE.read_text(encoding="utf-8"))
+            _perfil = data.get("pasos", {}) if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            _perfil = {}
+    return _perfil
+
+
+def guardar() -> None:
+    """Escribe el perfil si cambio (se llama al cerrar cada tarea)."""
+    global _sucio
+    with _lock:
+        if not _sucio or _perfil is None:
+            return
+        data = {"vm": VM, "ts": int(time.time()), "pasos": _perfil}
+        _sucio = False
+    try:
+        tmp = AUTOTUNE_FILE.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, AUTOTUNE_FILE)
+    except OSError as e:
+        print(f"[autotune] WARN no se pudo guardar {AUTOTUNE_FILE}: {e}")
+
+
+atexit.register(guardar)
+
+
+def _piso(default: float) -> float:
+    return max(AUTOTUNE_PISO_S, default * AUTOTUNE_MIN_FRAC)
+
+
+def _paso(label: str, default: float) -> str:
+    """Clave del perfil: el mismo label con otra demora base es otro paso."""
+    return f"{label}@{default:g}"
+
+
+def _entrada(paso: str, default: float) -> dict[str, Any]:
+    global _sucio
+    perfil = _cargar()
+    e = perfil.get(paso)
+    if e is None:
+        e = perfil[paso] = {"default": default, "delay": default, "racha": 0, "hist": []}
+        _sucio = True
+    return e
+
+
+# ── API ────────────────────────────────────────────────────────────────────────
+def delay(label: str, default: float) -> float:
+    """Demora a usar para el paso `label` (el default si no hay nada aprendido)."""
+    if not AUTOTUNE or default <= _piso(default):
+        return default
+    with _lock:
+        e = _entrada(_paso(label, default), default)
+        return min(default, max(_piso(default), float(e["delay"])))
+
+
+def pendiente(label: str, default: float, usado: float) -> None:
+    """El click `label` (demora base `default`) se hizo con `usado`; lo juzga la proxima verificacion."""
+    if AUTOTUNE:
+        with _lock:
+            _pendientes.append((_paso(label, default), usado))
+
+
+def reiniciar() -> None:
+    """Descarta los clicks pendientes (inicio de tarea)."""
+    with _lock:
+        _pendientes.clear()
+
+
+def verificado(ok: bool) -> None:
+    """Resultado de una verificacion (clipboard / region) para los clicks pendientes."""
+    if not AUTOTUNE:
+        return
+    with _lock:
+        pasos = list(dict.fromkeys(paso for paso, _ in _pendientes))
+        _pendientes.clear()
+        for paso in pasos:
+            _registrar(paso, ok)
+
+
+def _registrar(label: str, ok: bool) -> None:
+    global _sucio
+    e = _cargar().get(label)
+    if e is None:
+        return
+    default = float(e["default"])
+    hist = e.setdefault("hist", [])
+    hist.append(1 if ok else 0)
+    del hist[:-AUTOTUNE_VENTANA]
+    _sucio = True
+    if not ok:
+        if e["delay"] < default:
+            print(f"[autotune] {label}: fallo con {e['delay']:.2f}s, vuelvo al default {default:.2f}s")
+        e["delay"], e["racha"] = default, 0
+        return
+    e["racha"] = int(e.get("racha", 0)) + 1
+    tasa = sum(hist) / len(hist)
+    if e["racha"] >= AUTOTUNE_MUESTRAS and tasa >= AUTOTUNE_TARGET and e["delay"] > _piso(default):
+        nuevo = round(max(_piso(default), e["delay"] * AUTOTUNE_PASO), 3)
+        print(f"[autotune] {label}: {e['delay']:.2f}s -> {nuevo:.2f}s (exito {tasa:.0%})")
+        e["delay"], e["racha"] = nuevo, 0
+
+
+def perfil() -> dict[str, dict[str, Any]]:
+    with _lock:
+        return json.loads(json.dumps(_cargar()))
+
+
+if __name__ == "__main__":
+    # python -m shared.autotune        -> perfil aprendido de esta VM
+    # python -m shared.autotune reset  -> borra el perfil (vuelve a los defaults)
+    if len(sys.argv) >= 2 and sys.argv[1] == "reset":
+        AUTOTUNE_FILE.unlink(missing_ok=True)
+        print(f"[autotune] {AUTOTUNE_FILE} borrado")
+        sys.exit(0)
+    print(f"[autotune] {AUTOTUNE_FILE} (AUTOTUNE={'1' if AUTOTUNE else '0'})")
+    for label, e in sorted(perfil().items()):
+        hist = e.get("hist", [])
+        tasa = f"{sum(hist) / len(hist):.0%}" if hist else "-"
+        print(f"  {label:40s} {e['delay']:.3f}s / {e['default']:.3f}s  exito {tasa} ({len(hist)})")
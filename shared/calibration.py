@@ -0,0 +1,231 @@
+"""Calibracion por anclas: corrige coords.json cuando la ventana de T3 se movio.
+
+coords.json guarda coordenadas absolutas de la pantalla donde se grabaron.
+Las anclas (coords.json -> `anclas`) son recortes chicos del marco de T3
+(logo, barra de tabs, etc.) guardados en shared/anclas/<nombre>.png junto con
+la posicion donde estaban al grabarlos. Con cv2.matchTemplate se buscan en la
+pantalla y se calcula la transformacion x' = s*x + dx, y' = s*y + dy (escala
+solo con 2+ anclas o con CALIB_ESCALAS), que coords.xy / coords.region
+aplican sin que los caminos se enteren.
+
+- La transformacion se guarda en CALIB_CACHE y se reusa mientras la sonda
+  (buscar la primera ancla solo alrededor de donde deberia estar) la confirme;
+  si falla se recalibra con la pantalla completa.
+- Sin cv2/numpy/MSS, sin anclas o con CALIBRATION=0 no hay transformacion y
+  las coordenadas se usan tal cual, como antes.
+- Grabar un ancla (con T3 en la posicion de referencia de coords.json):
+    python -m shared.calibration capturar <nombre> <x> <y> <w> <h>
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+try:
+    import cv2
+    import numpy as np
+    _HAS_CV2 = True
+except Exception:
+    _HAS_CV2 = False
+
+try:
+    import mss
+    _HAS_MSS = True
+except Exception:
+    _HAS_MSS = False
+
+CALIBRATION = os.getenv("CALIBRATION", "1").lower() in ("1", "true", "yes", "on")
+CALIB_MIN_SCORE = float(os.getenv("CALIB_MIN_SCORE", "0.85"))
+CALIB_MARGIN = int(os.getenv("CALIB_MARGIN", "40"))  # px alrededor de la posicion esperada (sonda)
+CALIB_TOL = int(os.getenv("CALIB_TOL", "2"))  # px de diferencia aceptados por la sonda
+CALIB_VERIFY_S = float(os.getenv("CALIB_VERIFY_S", "10"))  # no re-sondear mas seguido que esto
+CALIB_ESCALAS = [float(s) for s in os.getenv("CALIB_ESCALAS", "1.0").split(",") if s.strip()]
+CALIB_CACHE = Path(os.getenv("CALIB_CACHE", str(Path(__file__).parent / "calibracion_cache.json")))
+ANCLAS_DIR = Path(__file__).parent / "anclas"
+SECCION = "anclas"
+
+_vigente: tuple[float, tuple[float, float, float] | None] | None = None  # (monotonic, transformacion)
+
+
+# ── Pantalla y anclas ──────────────────────────────────────────────────────────
+def _pantalla(rect: tuple[int, int, int, int] | None = None):
+    """Gris de la pantalla (o de rect x,y,w,h) + origen (left, top) en coords de pantalla."""
+    with mss.mss() as sct:
+        if rect is None:
+            mon = sct.monitors[0]
+            rect = (mon["left"], mon["top"], mon["width"], mon["height"])
+        x, y, w, h = rect
+        shot = sct.grab({"left": x, "top": y, "width": w, "height": h})
+    img = cv2.cvtColor(np.asarray(shot), cv2.COLOR_BGRA2GRAY)
+    return img, (x, y)
+
+
+def anclas(master: dict) -> list[dict[str, Any]]:
+    """Anclas definidas con template en disco: [{nombre, x, y, img}]."""
+    out = []
+    for nombre, nodo in master.get(SECCION, {}).items():
+        if nombre.startswith("_") or not isinstance(nodo, dict):
+            continue
+        path = ANCLAS_DIR / nodo.get("archivo", f"{nombre}.png")
+        if not path.exists():
+            continue
+        img = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            print(f"[calib] WARN no se pudo leer {path}")
+            continue
+        out.append({"nombre": nombre, "x": int(nodo.get("x", 0)), "y": int(nodo.get("y", 0)), "img": img})
+    return out
+
+
+def _buscar(pantalla, origen: tuple[int, int], templ, escalas: list[float]):
+    """Mejor match del template: (score, x, y, escala) en coords de pantalla."""
+    mejor = (-1.0, 0, 0, 1.0)
+    for esc in escalas:
+        t = templ if esc == 1.0 else cv2.resize(templ, None, fx=esc, fy=esc, interpolation=cv2.INTER_AREA)
+        if t.shape[0] > pantalla.shape[0] or t.shape[1] > pantalla.shape[1]:
+            continue
+        res = cv2.matchTemplate(pantalla, t, cv2.TM_CCOEFF_NORMED)
+        _, score, _, loc = cv2.minMaxLoc(res)
+        if score > mejor[0]:
+            mejor = (float(score), loc[0] + origen[0], loc[1] + origen[1], esc)
+    return mejor
+
+
+def _ajustar(pares: list[tuple[float, float, float, float]], escala: float) -> tuple[float, float, float]:
+    """Minimos cuadrados de x' = s*x + dx, y' = s*y + dy. Con un solo par, s = escala del match."""
+    if len(pares) == 1:
+        x, y, fx, fy = pares[0]
+        return fx - escala * x, fy - escala * y, escala
+    n = len(pares)
+    mx = sum(p[0] for p in pares) / n
+    my = sum(p[1] for p in pares) / n
+    mfx = sum(p[2] for p in pares) / n
+    mfy = sum(p[3] for p in pares) / n
+    num = sum((p[0] - mx) * (p[2] - mfx) + (p[1] - my) * (p[3] - mfy) for p in pares)
+    den = sum((p[0] - mx) ** 2 + (p[1] - my) ** 2 for p in pares)
+    s = num / den if den else 1.0
+    return mfx - s * mx, mfy - s * my, s
+
+
+# ── Calibracion y sonda ────────────────────────────────────────────────────────
+def calibrar(master: dict) -> tuple[float, float, float] | None:
+    """Busca todas las anclas en la pantalla completa. None si no aparece ninguna."""
+    lista = anclas(master)
+    if not lista:
+        return None
+    pantalla, origen = _pantalla()
+    pares, escalas = [], []
+    for a in lista:
+        score, fx, fy, esc = _buscar(pantalla, origen, a["img"], CALIB_ESCALAS)
+        if score < CALIB_MIN_SCORE:
+            print(f"[calib] ancla '{a['nombre']}' no encontrada (score {score:.2f})")
+            continue
+        pares.append((a["x"], a["y"], fx, fy))
+        escalas.append(esc)
+    if not pares:
+        return None
+    dx, dy, s = _ajustar(pares, escalas[0])
+    print(f"[calib] {len(pares)}/{len(lista)} anclas: dx={dx:.1f} dy={dy:.1f} s={s:.3f}")
+    return dx, dy, s
+
+
+def verificar(master: dict, t: tuple[float, float, float]) -> bool:
+    """Sonda barata: la primera ancla sigue donde la transformacion dice (+-CALIB_TOL px)."""
+    lista = anclas(master)
+    if not lista:
+        return False
+    a = lista[0]
+    dx, dy, s = t
+    h, w = a["img"].shape[:2]
+    tw, th = int(w * s), int(h * s)
+    ex, ey = int(round(s * a["x"] + dx)), int(round(s * a["y"] + dy))
+    try:
+        zona, origen = _pantalla((ex - CALIB_MARGIN, ey - CALIB_MARGIN, tw + 2 * CALIB_MARGIN, th + 2 * CALIB_MARGIN))
+    except Exception as e:
+        print(f"[calib] sonda: grab fallo ({e})")
+        return False
+    score, fx, fy, _ = _buscar(zona, origen, a["img"], [s])
+    ok = score >= CALIB_MIN_SCORE and abs(fx - ex) <= CALIB_TOL and abs(fy - ey) <= CALIB_TOL
+    if not ok:
+        print(f"[calib] sonda fallo (score {score:.2f}, ancla en {fx},{fy} y no en {ex},{ey}), recalibrando")
+    return ok
+
+
+def _leer_cache() -> tuple[float, float, float] | None:
+    try:
+        data = json.loads(CALIB_CACHE.read_text(encoding="utf-8"))
+        return float(data["dx"]), float(data["dy"]), float(data["s"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _guardar_cache(t: tuple[float, float, float]) -> None:
+    try:
+        CALIB_CACHE.write_text(
+            json.dumps({"dx": t[0], "dy": t[1], "s": t[2], "ts": int(time.time())}),
+            encoding="utf-8",
+        )
+    except OSError as e:
+        print(f"[calib] WARN no se pudo guardar {CALIB_CACHE}: {e}")
+
+
+def transformacion(master: dict) -> tuple[float, float, float] | None:
+    """Transformacion vigente: la del cache si la sonda la confirma, si no recalibra.
+
+    None = sin calibracion (coordenadas tal cual).
+    """
+    global _vigente
+    if not (CALIBRATION and _HAS_CV2 and _HAS_MSS) or not anclas(master):
+        return None
+    if _vigente is not None and time.monotonic() - _vigente[0] < CALIB_VERIFY_S:
+        return _vigente[1]
+    t = _resolver(master)
+    _vigente = (time.monotonic(), t)
+    return t
+
+
+def _resolver(master: dict) -> tuple[float, float, float] | None:
+    try:
+        cache = _leer_cache()
+        if cache is not None and verificar(master, cache):
+            return cache
+        t = calibrar(master)
+    except Exception as e:
+        print(f"[calib] WARN calibracion fallo ({e}), coordenadas sin corregir")
+        return None
+    if t is None:
+        print("[calib] WARN ninguna ancla en pantalla, coordenadas sin corregir")
+        return None
+    _guardar_cache(t)
+    return t
+
+
+# ── Grabar anclas ──────────────────────────────────────────────────────────────
+def capturar(nombre: str, x: int, y: int, w: int, h: int) -> Path:
+    """Guarda el recorte actual de pantalla como template del ancla `nombre`."""
+    img, _ = _pantalla((x, y, w, h))
+    ANCLAS_DIR.mkdir(parents=True, exist_ok=True)
+    path = ANCLAS_DIR / f"{nombre}.png"
+    cv2.imwrite(str(path), img)
+    return path
+
+
+if __name__ == "__main__":
+    # python -m shared.calibration                          -> calibra y muestra la transformacion
+    # python -m shared.calibration capturar logo 10 5 120 40 -> graba el ancla 'logo'
+    if not (_HAS_CV2 and _HAS_MSS):
+        print("[calib] hace falta opencv-python, numpy y mss", file=sys.stderr)
+        sys.exit(1)
+    if len(sys.argv) == 7 and sys.argv[1] == "capturar":
+        nombre, *nums = sys.argv[2:]
+        x, y, w, h = (int(n) for n in nums)
+        path = capturar(nombre, x, y, w, h)
+        print(f"[calib] ancla guardada en {path}; agregar a coords.json -> {SECCION}:")
+        print(json.dumps({nombre: {"x": x, "y": y, "w": w, "h": h, "archivo": path.name}}))
+    else:
+        from shared import coords
+        print(f"[calib] {calibrar(coords.load(Path(__file__).parent / 'coords.json'))}")
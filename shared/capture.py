@@ -1,6 +1,15 @@
-"""Captura de pantalla con fallback PIL -> MSS -> pyautogui."""
+"""Captura de pantalla con fallback PIL -> MSS -> pyautogui.
+
+Tambien expone `wait_until_stable`: espera adaptativa que vigila una region
+chica de la pantalla y vuelve apenas T3 termino de redibujarla, con la demora
+fija de siempre como techo.
+"""
 from __future__ import annotations
 
+import os
+import threading
+import time
+import zlib
 from pathlib import Path
 
 try:
@@ -19,6 +28,13 @@ except Exception:
 
 import pyautogui as pg
 
+from shared import autotune, wait
+
+SETTLE_STABLE_MS = int(os.getenv("SETTLE_STABLE_MS", "300"))
+SETTLE_POLL_MS = int(os.getenv("SETTLE_POLL_MS", "30"))
+
+_local = threading.local()  # un handle mss por thread (mss no es thread-safe)
+
 
 def clear_dir(dir_path: Path) -> None:
     """Borra todos los archivos de una carpeta (no recursivo). No falla si no existe."""
@@ -113,3 +129,92 @@ def capture_full(out_path: Path) -> bool:
     except Exception as e:
         print(f"[capture] full pyautogui fallo: {e}")
         return False
+
+
+# ── Espera por estabilidad visual ──────────────────────────────────────────────
+def _grabber():
+    sct = getattr(_local, "sct", None)
+    if sct is None:
+        sct = _local.sct = mss.mss()
+    return sct
+
+
+def region_hash(region: tuple[int, int, int, int]) -> int | None:
+    """crc32 de los pixeles de la region. None si no hay MSS o la region es invalida."""
+    rx, ry, rw, rh = region
+    if not (_HAS_MSS and rw > 0 and rh > 0):
+        return None
+    try:
+        shot = _grabber().grab({"top": ry, "left": rx, "width": rw, "height": rh})
+        return zlib.crc32(shot.raw)
+    except Exception as e:
+        print(f"[capture] settle: grab fallo ({e}), se usa la demora fija")
+        _local.sct = None
+        return None
+
+
+def pixel(x: int, y: int) -> tuple[int, int, int] | None:
+    """Color (r, g, b) de un pixel. None si no hay MSS o el grab falla."""
+    if not _HAS_MSS:
+        return None
+    try:
+        shot = _grabber().grab({"top": y, "left": x, "width": 1, "height": 1})
+        return shot.pixel(0, 0)
+    except Exception as e:
+        print(f"[capture] pixel ({x},{y}) fallo: {e}")
+        _local.sct = None
+        return None
+
+
+def wait_until_stable(
+    region: tuple[int, int, int, int],
+    timeout: float,
+    baseline: int | None = None,
+    stable_ms: int | None = None,
+    site: str | None = None,
+) -> bool:
+    """Espera a que la region cambie respecto de `baseline` y quede quieta `stable_ms`.
+
+    `baseline` es el region_hash() tomado ANTES del click que dispara el
+    redibujo; sin el (o sin MSS / region) no hay con que comparar y se espera
+    `timeout` completo, igual que la demora fija que reemplaza. `timeout` se
+    escala con SLEEP_SCALE. True si la region se estabilizo antes del techo.
+    """
+    site = site or "capture.wait_until_stable"
+    if baseline is None:
+        wait.pause(timeout, site)
+        return False
+
+    limit = timeout * wait.SLEEP_SCALE
+    stable_s = (SETTLE_STABLE_MS if stable_ms is None else stable_ms) / 1000
+    poll_s = SETTLE_POLL_MS / 1000
+    t0 = time.monotonic()
+    last = baseline
+    changed_at: float | None = None  # desde cuando el hash actual no cambia
+    settled = False
+    while True:
+        now = time.monotonic()
+        if now - t0 >= limit:
+            break
+        current = region_hash(region)
+        if current is None:  # el grab fallo a mitad de camino: completar el techo
+            remaining = limit - (now - t0)
+            if remaining > 0:
+                time.sleep(remaining)
+            break
+        now = time.monotonic()
+        if current != last:
+            last, changed_at = current, now
+        elif changed_at is not None and now - changed_at >= stable_s:
+            settled = True
+            break
+        time.sleep(poll_s)
+
+    waited = time.monotonic() - t0
+    wait.record(site, waited, timeout)
+    if settled:
+        print(f"[capture] settle {site}: estable en {waited:.2f}s (techo {limit:.2f}s)")
+    else:
+        print(f"[capture] settle {site}: sin estabilizar, techo {limit:.2f}s")
+    autotune.verificado(settled)
+    return settled
@@ -1,78 +1,417 @@
-"""Clipboard con pyperclip + fallback tkinter."""
+"""Clipboard del proceso: un ClipboardService con backend persistente.
+
+Backends (se prueban en orden; CLIPBOARD_BACKEND=x11|pyperclip|tk fuerza el primero):
+  - x11 (solo Linux, python-xlib): habla directo con la seleccion CLIPBOARD
+    desde una ventana oculta propia. Sin subprocesos xclip/xsel por lectura.
+  - pyperclip: en Windows usa la API nativa; es el default ahi.
+  - tk: un unico root Tk oculto que vive todo el proceso (antes se creaba y
+    destruia una ventana Tk en cada llamada).
+Si el backend activo falla en una operacion se usa el siguiente de la cadena.
+
+Deteccion de cambios (`sentinel` + `wait_change`): en vez de dormir una demora
+fija despues de cada copia, se toma una marca antes del Ctrl+C / click en
+"Copiar" y se vuelve apenas el clipboard cambio. La marca es, en orden:
+  - Windows: GetClipboardSequenceNumber (contador del sistema, cuesta ~1us)
+  - backend x11 con XFIXES: contador de cambios de duenio de CLIPBOARD,
+    alimentado por el thread que atiende los eventos del servidor
+  - sin ninguna de las dos: el texto mismo (polling de get_text)
+
+Las funciones de modulo (get_text, clear, set_text, sentinel, wait_change,
+wait_stable) delegan en el servicio unico de `service()`.
+"""
 from __future__ import annotations
 
+import os
+import sys
+import threading
 import time
+from typing import Any, Callable
 
-try:
-    import pyperclip
-    _HAS_PYPERCLIP = True
-except Exception:
-    pyperclip = None  # type: ignore
-    _HAS_PYPERCLIP = False
+from shared import autotune, wait
 
+CLIPBOARD_BACKEND = os.getenv("CLIPBOARD_BACKEND", "auto").strip().lower()
+SEQ_POLL_S = 0.001   # polling del contador de secuencia (barato)
+TEXT_POLL_S = 0.01   # polling del texto cuando no hay contador
+X11_REPLY_S = 0.5    # espera maxima de la respuesta del duenio de la seleccion
 
-def _tk_get() -> str:
-    try:
+
+# ── Backends ───────────────────────────────────────────────────────────────────
+class _PyperclipBackend:
+    name = "pyperclip"
+
+    def __init__(self) -> None:
+        import pyperclip
+        self._pc = pyperclip
+        self._pc.paste()  # sin mecanismo disponible (ej. Linux sin xclip) falla aca
+
+    def get(self) -> str:
+        return self._pc.paste() or ""
+
+    def set(self, text: str) -> None:
+        self._pc.copy(text)
+
+    def clear(self) -> None:
+        self._pc.copy("")
+
+    def sequence(self) -> Callable[[], int] | None:
+        return None
+
+
+class _TkBackend:
+    """Un root Tk oculto para todo el proceso. Tk solo se usa desde el thread que lo creo."""
+    name = "tk"
+
+    def __init__(self) -> None:
         import tkinter as tk
-        r = tk.Tk(); r.withdraw()
+        self._tcl_error = tk.TclError
+        self._root = tk.Tk()
+        self._root.withdraw()
+
+    def get(self) -> str:
         try:
-            return r.clipboard_get() or ""
-        finally:
-            r.destroy()
-    except Exception:
-        return ""
+            return self._root.clipboard_get() or ""
+        except self._tcl_error:  # clipboard vacio o sin texto
+            return ""
 
+    def set(self, text: str) -> None:
+        self._root.clipboard_clear()
+        self._root.clipboard_append(text)
+        self._root.update()
 
-def _tk_clear() -> None:
-    try:
-        import tkinter as tk
-        r = tk.Tk(); r.withdraw()
+    def clear(self) -> None:
+        self._root.clipboard_clear()
+        self._root.update()
+
+    def sequence(self) -> Callable[[], int] | None:
+        return None
+
+
+class _X11Backend:
+    """Seleccion CLIPBOARD via python-xlib, con una ventana oculta y un thread de eventos.
+
+    El thread atiende SelectionNotify (respuesta a nuestras lecturas),
+    SelectionRequest (otros leyendo lo que pusimos con set), SelectionClear y,
+    si hay XFIXES, los cambios de duenio que alimentan sequence().
+    Selecciones grandes (INCR) no se soportan: esa lectura cae al backend siguiente.
+    """
+    name = "x11"
+
+    def __init__(self) -> None:
+        import Xlib.threaded  # noqa: F401  (el Display se comparte entre threads)
+        from Xlib import X, Xatom
+        from Xlib import display as xdisplay
+        from Xlib.ext import xfixes
+        from Xlib.protocol import event as xevent
+        from Xlib.protocol import request as xrequest
+
+        self._X, self._Xatom = X, Xatom
+        self._xevent, self._xrequest, self._xfixes_mod = xevent, xrequest, xfixes
+        self._d = xdisplay.Display()
+        root = self._d.screen().root
+        self._win = root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+        atom = self._d.get_atom
+        self._clip = atom("CLIPBOARD")
+        self._prop = atom("BOT_T3_CLIP")
+        self._targets = atom("TARGETS")
+        self._incr = atom("INCR")
+        self._utf8 = atom("UTF8_STRING")
+        self._text_atoms = (self._utf8, Xatom.STRING, atom("TEXT"), atom("text/plain;charset=utf-8"))
+
+        self._req_lock = threading.Lock()
+        self._reply = threading.Event()
+        self._reply_ok = False
+        self._owned: str | None = None
+        self._changes = 0
+        self._xfixes = bool(self._d.has_extension("XFIXES"))
+        if self._xfixes:
+            self._d.xfixes_query_version()
+            self._d.xfixes_select_selection_input(
+                root, self._clip, xfixes.XFixesSetSelectionOwnerNotifyMask,
+            )
+        self._d.flush()
+        threading.Thread(target=self._loop, name="clipboard-x11", daemon=True).start()
+
+    # thread de eventos
+    def _loop(self) -> None:
+        X = self._X
+        while True:
+            try:
+                ev = self._d.next_event()
+            except Exception as e:
+                print(f"[clipboard] WARN thread X11 termino: {e}")
+                return
+            if isinstance(ev, self._xfixes_mod.SetSelectionOwnerNotify):
+                self._changes += 1
+            elif ev.type == X.SelectionNotify:
+                self._reply_ok = ev.property != X.NONE
+                self._reply.set()
+            elif ev.type == X.SelectionRequest:
+                self._serve(ev)
+            elif ev.type == X.SelectionClear:
+                self._owned = None
+
+    def _serve(self, ev: Any) -> None:
+        X, Xatom = self._X, self._Xatom
+        prop = ev.property or ev.target  # clientes viejos mandan property None
+        text = self._owned
         try:
-            r.clipboard_clear()
-            r.update()
-        finally:
-            r.destroy()
+            if text is None:
+                prop = X.NONE
+            elif ev.target == self._targets:
+                ev.requestor.change_property(prop, Xatom.ATOM, 32, [self._targets, *self._text_atoms])
+            elif ev.target in self._text_atoms:
+                enc = "latin-1" if ev.target == Xatom.STRING else "utf-8"
+                ev.requestor.change_property(prop, ev.target, 8, text.encode(enc, "replace"))
+            else:
+                prop = X.NONE
+            ev.requestor.send_event(self._xevent.SelectionNotify(
+                time=ev.time, requestor=ev.requestor, selection=ev.selection,
+                target=ev.target, property=prop,
+            ))
+            self._d.flush()
+        except Exception as e:
+            print(f"[clipboard] WARN no se pudo atender SelectionRequest: {e}")
+
+    # operaciones
+    def get(self) -> str:
+        if self._owned is not None:
+            return self._owned
+        X = self._X
+        with self._req_lock:
+            for target in (self._utf8, self._Xatom.STRING):
+                self._reply.clear()
+                self._win.convert_selection(self._clip, target, self._prop, X.CurrentTime)
+                self._d.flush()
+                if not self._reply.wait(X11_REPLY_S):
+                    raise TimeoutError("el duenio de CLIPBOARD no respondio")
+                if self._reply_ok:
+                    break
+            else:
+                return ""  # sin duenio o sin representacion de texto
+            prop = self._win.get_full_property(self._prop, X.AnyPropertyType)
+            self._win.delete_property(self._prop)
+        if prop is None:
+            return ""
+        if prop.property_type == self._incr:
+            raise ValueError("seleccion INCR (demasiado grande para x11)")
+        value = prop.value
+        if isinstance(value, bytes):
+            return value.decode("latin-1" if prop.property_type == self._Xatom.STRING else "utf-8", "replace")
+        return str(value)
+
+    def set(self, text: str) -> None:
+        self._owned = text
+        self._win.set_selection_owner(self._clip, self._X.CurrentTime)
+        if self._d.get_selection_owner(self._clip) != self._win:
+            self._owned = None
+            raise RuntimeError("no se pudo tomar la seleccion CLIPBOARD")
+
+    def clear(self) -> None:
+        self._owned = None
+        self._xrequest.SetSelectionOwner(
+            display=self._d.display, window=self._X.NONE,
+            selection=self._clip, time=self._X.CurrentTime,
+        )
+        self._d.flush()
+
+    def sequence(self) -> Callable[[], int] | None:
+        return (lambda: self._changes) if self._xfixes else None
+
+
+_BACKENDS: dict[str, type] = {
+    "x11": _X11Backend,
+    "pyperclip": _PyperclipBackend,
+    "tk": _TkBackend,
+}
+
+
+def _default_order() -> list[str]:
+    if sys.platform.startswith("linux") and os.getenv("DISPLAY"):
+        return ["x11", "pyperclip", "tk"]
+    return ["pyperclip", "tk"]
+
+
+def _win_seq() -> Callable[[], int] | None:
+    try:
+        import ctypes
+        fn = ctypes.windll.user32.GetClipboardSequenceNumber  # type: ignore[attr-defined]
+        fn.restype = ctypes.c_uint
+        fn.argtypes = []
+        fn()
+        return fn
     except Exception:
-        pass
+        return None
+
+
+# ── Servicio ───────────────────────────────────────────────────────────────────
+class ClipboardService:
+    """get/set/clear/sentinel/wait_change sobre una cadena de backends persistentes.
+
+    Semantica comun: get_text() devuelve '' si esta vacio, no es texto o todo
+    falla; set_text/clear prueban el backend siguiente si uno falla en vez de
+    no hacer nada. Los backends se instancian la primera vez que se usan.
+    """
+
+    def __init__(self, backend: str = "auto"):
+        order = _default_order()
+        if backend in _BACKENDS:
+            order = [backend] + [b for b in order if b != backend]
+        self._order = order
+        self._instances: dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._seq: Callable[[], int] | None = None
+        self._seq_probed = False
+
+    def _chain(self):
+        for name in self._order:
+            with self._lock:
+                if name not in self._instances:
+                    try:
+                        self._instances[name] = _BACKENDS[name]()
+                    except Exception as e:
+                        print(f"[clipboard] backend {name} no disponible: {e}")
+                        self._instances[name] = None
+                inst = self._instances[name]
+            if inst is not None:
+                yield inst
+
+    def _call(self, op: str, *args: Any) -> Any:
+        for backend in self._chain():
+            try:
+                with self._lock:
+                    return getattr(backend, op)(*args)
+            except Exception as e:
+                print(f"[clipboard] WARN {backend.name}.{op} fallo: {e}")
+        return None
+
+    @property
+    def backend(self) -> str:
+        """Nombre del primer backend disponible."""
+        return next((b.name for b in self._chain()), "ninguno")
+
+    def get_text(self) -> str:
+        return self._call("get") or ""
+
+    def set_text(self, text: str) -> None:
+        self._call("set", text)
+
+    def clear(self) -> None:
+        self._call("clear")
+
+    def _sequence(self) -> Callable[[], int] | None:
+        """Contador de cambios del sistema (se resuelve una sola vez)."""
+        with self._lock:
+            if not self._seq_probed:
+                self._seq_probed = True
+                if sys.platform == "win32":
+                    self._seq = _win_seq()
+                else:
+                    first = next(self._chain(), None)
+                    self._seq = first.sequence() if first is not None else None
+            return self._seq
+
+    def sentinel(self, clear_first: bool = False) -> tuple[int | None, str]:
+        """Marca del estado actual del clipboard, para pasarle a wait_change().
 
+        clear_first=True vacia el clipboard antes de marcar: una copia fallida se
+        lee como '' y no como el valor anterior.
+        """
+        if clear_first:
+            self.clear()
+        seq = self._sequence()
+        if seq is not None:
+            return seq(), ""
+        return None, self.get_text()
 
+    def wait_change(
+        self,
+        marca: tuple[int | None, str],
+        timeout: float,
+        site: str | None = None,
+        depth: int = 2,
+    ) -> str:
+        """Espera hasta `timeout` (escalado) a que el clipboard cambie respecto de `marca`.
+
+        Retorna el texto nuevo, o lo que haya en el clipboard al vencer el techo
+        (mismo resultado que la demora fija que reemplaza).
+        """
+        seq0, text0 = marca
+        seq = self._sequence() if seq0 is not None else None
+        limit = timeout * wait.SLEEP_SCALE
+        t0 = time.monotonic()
+        text = ""
+        cambio = True
+        while True:
+            if seq is not None:
+                if seq() != seq0:
+                    # el contador sube tambien con el EmptyClipboard previo al set:
+                    # esperar a que aparezca el texto
+                    text = self.get_text()
+                    if text:
+                        break
+                poll = SEQ_POLL_S
+            else:
+                text = self.get_text()
+                if text != text0:
+                    break
+                poll = TEXT_POLL_S
+            if time.monotonic() - t0 >= limit:
+                text = self.get_text()
+                cambio = False
+                break
+            time.sleep(poll)
+        wait.record(site, time.monotonic() - t0, timeout, depth=depth)
+        autotune.verificado(cambio)
+        return text
+
+    def wait_stable(self, timeout: float = 1.5, step: float = 0.1) -> str:
+        """Espera hasta 'timeout' a que el clipboard deje de estar vacio.
+        Retorna el primer contenido no vacio que encuentra, o '' si timeout.
+        """
+        t0 = time.time()
+        while time.time() - t0 < timeout:
+            txt = self.get_text()
+            if txt.strip():
+                return txt
+            wait.pause(step)
+        return ""
+
+
+_service: ClipboardService | None = None
+_service_lock = threading.Lock()
+
+
+def service() -> ClipboardService:
+    """Servicio unico del proceso (se crea en el primer uso)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ClipboardService(CLIPBOARD_BACKEND)
+        return _service
+
+
+# ── API de modulo ──────────────────────────────────────────────────────────────
 def get_text() -> str:
     """Lee el clipboard como string. '' si vacio o si falla."""
-    if _HAS_PYPERCLIP:
-        try:
-            return pyperclip.paste() or ""
-        except Exception:
-            pass
-    return _tk_get()
+    return service().get_text()
 
 
 def clear() -> None:
     """Vacia el clipboard."""
-    if _HAS_PYPERCLIP:
-        try:
-            pyperclip.copy("")
-            return
-        except Exception:
-            pass
-    _tk_clear()
+    service().clear()
 
 
 def set_text(text: str) -> None:
-    if _HAS_PYPERCLIP:
-        try:
-            pyperclip.copy(text)
-        except Exception:
-            pass
+    service().set_text(text)
+
+
+def sentinel(clear_first: bool = False) -> tuple[int | None, str]:
+    return service().sentinel(clear_first)
+
+
+def wait_change(marca: tuple[int | None, str], timeout: float, site: str | None = None) -> str:
+    return service().wait_change(marca, timeout, site, depth=3)
 
 
 def wait_stable(timeout: float = 1.5, step: float = 0.1) -> str:
-    """Espera hasta 'timeout' a que el clipboard deje de estar vacio.
-    Retorna el primer contenido no vacio que encuentra, o '' si timeout.
-    """
-    t0 = time.time()
-    while time.time() - t0 < timeout:
-        txt = get_text()
-        if txt.strip():
-            return txt
-        time.sleep(step)
-    return ""
+    return service().wait_stable(timeout, step)
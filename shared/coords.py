@@ -4,15 +4,127 @@ El JSON master vive en Bot_T3/shared/coords.json y agrupa las coords por
 seccion (entrada, ver_todos, validar, score, fa_cobranza, etc).
 
 Acceso con dot-notation:  get(master, "entrada.cliente_section2") -> {"x":..,"y":..}
+
+load_master() compila el JSON una vez por proceso (cache por ruta + mtime) en
+un `Master`: dict de solo lectura con un indice plano `clave -> Point/Region`
+que xy() / region() consultan sin recorrer el arbol. Al compilar se valida:
+tipos de x/y/w/h, que cada `_used_by` exista y que toda clave literal
+"seccion.clave" del codigo de los caminos y flows este definida. Con
+COORDS_STRICT=1 (default) un error corta en la carga (CoordsError) y una clave
+inexistente en xy()/region() tambien, en vez de un click mudo en (0,0).
+
+Correccion de pantalla (opcional, en este orden):
+  - shared.calibration: anclas cv2 -> desplazamiento y escala.
+  - `_meta.ventana` {titulo, x, y}: origen de la ventana de T3 al grabar; si
+    la ventana se encuentra (PyGetWindow) las coords se corren lo que se movio.
+    Con x=y=0 las coords del archivo son relativas a la ventana.
+(0,0) sigue significando "no definido" y no se corrige.
 """
 from __future__ import annotations
 
 import json
+import os
+import re
 import sys
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
+
+COORDS_STRICT = os.getenv("COORDS_STRICT", "1").lower() in ("1", "true", "yes", "on")
+COORDS_VALIDATE = os.getenv("COORDS_VALIDATE", "1").lower() in ("1", "true", "yes", "on")
+_RAIZ = Path(__file__).resolve().parent.parent  # Bot_T3
+
+_MASTER_CACHE: dict[Path, tuple[float, "Master"]] = {}
+_transform: tuple[float, float, float] | None = None  # (dx, dy, escala) vigente
+_avisadas: set[str] = set()
+
+
+class CoordsError(Exception):
+    """coords.json invalido o clave inexistente (con COORDS_STRICT)."""
+
+
+# ── Registros compilados ───────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Point:
+    key: str
+    x: int
+    y: int
+    used_by: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Region:
+    key: str
+    x: int
+    y: int
+    w: int
+    h: int
+    used_by: tuple[str, ...] = ()
+
+
+class _Frozen(dict):
+    """dict de solo lectura (el master es compartido entre caminos)."""
+
+    def _solo_lectura(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("el master de coords es de solo lectura")
 
+    __setitem__ = __delitem__ = _solo_lectura  # type: ignore[assignment]
+    clear = pop = popitem = setdefault = update = _solo_lectura  # type: ignore[assignment]
 
+
+class Master(_Frozen):
+    """JSON master compilado: el arbol original + indices planos por clave."""
+
+    index: Mapping[str, Point | Region]
+    nodos: Mapping[str, dict[str, Any]]
+    path: Path | None
+
+
+def _freeze(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return _Frozen((k, _freeze(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+def compilar(raw: dict[str, Any], path: Path | None = None) -> tuple[Master, list[str]]:
+    """Arma el Master y devuelve tambien los errores de tipo encontrados."""
+    master = Master((k, _freeze(v)) for k, v in raw.items())
+    index: dict[str, Point | Region] = {}
+    nodos: dict[str, dict[str, Any]] = {}
+    errores: list[str] = []
+
+    def walk(node: dict[str, Any], prefix: str) -> None:
+        for k, v in node.items():
+            if k.startswith("_") or not isinstance(v, dict):
+                continue
+            key = f"{prefix}{k}"
+            nodos[key] = v
+            if "x" in v or "y" in v:
+                used_by = tuple(str(u) for u in v.get("_used_by", ()))
+                try:
+                    x, y = int(v.get("x", 0)), int(v.get("y", 0))
+                    if "w" in v or "h" in v:
+                        w, h = int(v.get("w", 0)), int(v.get("h", 0))
+                        if w < 0 or h < 0:
+                            raise ValueError("w/h negativos")
+                        index[key] = Region(key, x, y, w, h, used_by)
+                    else:
+                        index[key] = Point(key, x, y, used_by)
+                except (TypeError, ValueError) as e:
+                    errores.append(f"{key}: valor invalido ({e})")
+            walk(v, f"{key}.")
+
+    walk(master, "")
+    object.__setattr__(master, "index", MappingProxyType(index))
+    object.__setattr__(master, "nodos", MappingProxyType(nodos))
+    object.__setattr__(master, "path", path)
+    return master, errores
+
+
+# ── Carga ──────────────────────────────────────────────────────────────────────
 def load(path: Path) -> dict[str, Any]:
     """Lee un JSON de coordenadas. Aborta el proceso (exit 2) si falla."""
     try:
@@ -25,18 +137,138 @@ def load(path: Path) -> dict[str, Any]:
         sys.exit(2)
 
 
-def load_master(path: Path | None = None) -> dict[str, Any]:
-    """Carga el JSON master (default: shared/coords.json)."""
+def load_master(path: Path | None = None) -> Master:
+    """Carga el JSON master compilado (default: shared/coords.json)."""
     if path is None:
         path = Path(__file__).parent / "coords.json"
-    return load(path)
+    path = Path(path).resolve()
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        load(path)  # aborta con el mensaje de siempre
+        raise
+    cached = _MASTER_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        master = cached[1]
+    else:
+        master, errores = compilar(load(path), path)
+        if COORDS_VALIDATE:
+            errores += validar(master)
+        if errores:
+            for e in errores:
+                print(f"[shared.coords] ERROR {e}", file=sys.stderr)
+            if COORDS_STRICT:
+                raise CoordsError(f"{path.name}: {len(errores)} errores (ver log); COORDS_STRICT=0 para seguir")
+        _MASTER_CACHE[path] = (mtime, master)  # solo se cachea si paso la validacion
+    _ajustar_pantalla(master)
+    return master
+
+
+def _ajustar_pantalla(master: dict[str, Any]) -> None:
+    global _transform
+    from shared import calibration  # import diferido: cv2 es opcional y pesado
 
+    _transform = calibration.transformacion(master) or _origen_ventana(master)
 
+
+def _origen_ventana(master: dict[str, Any]) -> tuple[float, float, float] | None:
+    """Desplazamiento de la ventana de T3 respecto de `_meta.ventana` (None si no aplica)."""
+    ventana = master.get("_meta", {}).get("ventana")
+    if not isinstance(ventana, dict):
+        return None
+    titulo = os.getenv("T3_WINDOW_TITLE", "") or ventana.get("titulo", "")
+    if not titulo:
+        return None
+    try:
+        import pygetwindow
+
+        wins = [w for w in pygetwindow.getWindowsWithTitle(titulo) if w.width > 0]
+    except Exception as e:
+        _avisar(f"ventana:{e}", f"[shared.coords] WARN no se pudo ubicar la ventana '{titulo}': {e}")
+        return None
+    if not wins:
+        _avisar(f"ventana:{titulo}", f"[shared.coords] WARN ventana '{titulo}' no encontrada, coords sin corregir")
+        return None
+    return float(wins[0].left - int(ventana.get("x", 0))), float(wins[0].top - int(ventana.get("y", 0))), 1.0
+
+
+def _avisar(clave: str, msg: str) -> None:
+    if clave not in _avisadas:
+        _avisadas.add(clave)
+        print(msg, file=sys.stderr)
+
+
+def _aplicar(x: int, y: int) -> tuple[int, int]:
+    if _transform is None or not (x or y):
+        return x, y
+    dx, dy, s = _transform
+    return int(round(s * x + dx)), int(round(s * y + dy))
+
+
+def _faltante(key: str) -> None:
+    if COORDS_STRICT:
+        raise CoordsError(f"clave de coordenadas inexistente: {key}")
+    _avisar(key, f"[shared.coords] WARN clave inexistente {key}, se usa (0,0)")
+
+
+# ── Validacion ─────────────────────────────────────────────────────────────────
+_LITERAL = re.compile(r'(?<![\w.])(f?)"([a-z_]+)\.([A-Za-z_0-9]*)(\{?)')
+
+
+def _fuentes() -> dict[str, str]:
+    """Codigo de los caminos (raiz) y de shared/ (flows incluidos): {nombre: texto}."""
+    out: dict[str, str] = {}
+    for path in [*_RAIZ.glob("*.py"), *(_RAIZ / "shared").rglob("*.py")]:
+        try:
+            out[path.stem] = path.read_text(encoding="utf-8")
+        except OSError:
+            continue
+    return out
+
+
+def validar(master: Master) -> list[str]:
+    """Errores de coherencia entre el master y el codigo (lista vacia = ok).
+
+    - cada `_used_by` es un camino (<raiz>/<nombre>.py) o un flow
+      (shared/flows/<modulo>.py, opcionalmente `.funcion`)
+    - cada clave literal "seccion.clave" del codigo existe; en f-strings
+      ("seccion.prefijo{...}") alguna clave de la seccion empieza con el prefijo
+    """
+    errores: list[str] = []
+    flows = _RAIZ / "shared" / "flows"
+    for rec in master.index.values():
+        for usuario in rec.used_by:
+            modulo, _, funcion = usuario.partition(".")
+            if (_RAIZ / f"{modulo}.py").exists() and not funcion:
+                continue
+            flow = flows / f"{modulo}.py"
+            if flow.exists() and (not funcion or f"def {funcion}(" in flow.read_text(encoding="utf-8")):
+                continue
+            errores.append(f"{rec.key}: _used_by '{usuario}' no existe")
+
+    secciones = {k for k in master if not k.startswith("_")}
+    for nombre, texto in _fuentes().items():
+        for es_f, seccion, resto, llave in _LITERAL.findall(texto):
+            if seccion not in secciones:
+                continue
+            clave = f"{seccion}.{resto}"
+            if es_f and llave:
+                if not any(k.startswith(clave) for k in master.nodos):
+                    errores.append(f"{nombre}.py: ninguna clave empieza con '{clave}'")
+            elif clave not in master.nodos:
+                errores.append(f"{nombre}.py: clave '{clave}' no definida")
+    return list(dict.fromkeys(errores))
+
+
+# ── Acceso ─────────────────────────────────────────────────────────────────────
 def get(conf: dict[str, Any], dotted: str) -> dict[str, Any]:
     """Acceso dot-notation. 'entrada.cliente_section1' -> conf['entrada']['cliente_section1'].
 
     Devuelve {} si la clave no existe (evita KeyError; el llamador valida con xy()).
     """
+    nodos = getattr(conf, "nodos", None)
+    if nodos is not None:
+        return nodos.get(dotted, {})
     cur: Any = conf
     for part in dotted.split("."):
         if not isinstance(cur, dict):
@@ -47,29 +279,44 @@ def get(conf: dict[str, Any], dotted: str) -> dict[str, Any]:
 
 def xy(conf: dict[str, Any], key: str) -> tuple[int, int]:
     """Extrae (x,y) de una clave (flat o dot-notation). (0,0) si no existe."""
+    index = getattr(conf, "index", None)
+    if index is not None:
+        rec = index.get(key)
+        if rec is None:
+            _faltante(key)
+            return 0, 0
+        return _aplicar(rec.x, rec.y)
     node = get(conf, key) if "." in key else conf.get(key, {})
     if not isinstance(node, dict):
         return 0, 0
     try:
-        return int(node.get("x", 0)), int(node.get("y", 0))
+        return _aplicar(int(node.get("x", 0)), int(node.get("y", 0)))
     except (TypeError, ValueError):
         return 0, 0
 
 
 def region(conf: dict[str, Any], key: str) -> tuple[int, int, int, int]:
     """Extrae (x,y,w,h) de una clave de region. (0,0,0,0) si no existe."""
-    node = get(conf, key) if "." in key else conf.get(key, {})
-    if not isinstance(node, dict):
-        return 0, 0, 0, 0
-    try:
-        return (
-            int(node.get("x", 0)),
-            int(node.get("y", 0)),
-            int(node.get("w", 0)),
-            int(node.get("h", 0)),
-        )
-    except (TypeError, ValueError):
-        return 0, 0, 0, 0
+    index = getattr(conf, "index", None)
+    if index is not None:
+        rec = index.get(key)
+        if rec is None:
+            _faltante(key)
+            return 0, 0, 0, 0
+        x, y = _aplicar(rec.x, rec.y)
+        w, h = (rec.w, rec.h) if isinstance(rec, Region) else (0, 0)
+    else:
+        node = get(conf, key) if "." in key else conf.get(key, {})
+        if not isinstance(node, dict):
+            return 0, 0, 0, 0
+        try:
+            x, y = _aplicar(int(node.get("x", 0)), int(node.get("y", 0)))
+            w, h = int(node.get("w", 0)), int(node.get("h", 0))
+        except (TypeError, ValueError):
+            return 0, 0, 0, 0
+    if _transform is not None:
+        w, h = int(round(w * _transform[2])), int(round(h * _transform[2]))
+    return x, y, w, h
 
 
 def resolve_screenshot_region(conf: dict[str, Any], base_key: str = "screenshot") -> tuple[int, int, int, int]:
@@ -93,3 +340,11 @@ def resolve_screenshot_region(conf: dict[str, Any], base_key: str = "screenshot"
         if w > 0 and h > 0:
             return x, y, w, h
     return 0, 0, 0, 0
+
+
+if __name__ == "__main__":
+    # python -m shared.coords -> compila y valida el master sin correr ningun camino
+    COORDS_STRICT = False
+    m = load_master()
+    print(f"[shared.coords] {len(m.index)} claves ({sum(isinstance(r, Region) for r in m.index.values())} regiones), "
+          f"transformacion {_transform}")
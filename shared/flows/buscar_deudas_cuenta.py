@@ -20,68 +20,60 @@ Usado por: camino_deudas_admin, camino_deudas_provisorio, camino_deudas_viejo.
 from __future__ import annotations
 
 import re
-import time
 
-import pyautogui as pg
-
-from shared import clipboard, coords, keyboard, mouse
+from shared import capture as cap
+from shared import clipboard, coords, input_driver, keyboard, mouse, wait
 from shared.parsing import extract_first_number
+from shared.tracing import traced
 
 MAX_CF_ITER = 30
 
 
 def _extraer_fa_actual(master: dict, base_delay: float, tipo_documento: str) -> dict | None:
     """Extrae {id_fa, saldo} de la fila de FA Actual. None si no hay datos."""
-    clipboard.clear()
-    time.sleep(0.4)
+    marca = clipboard.sentinel(clear_first=True)
 
     area_x, area_y = coords.xy(master, "fa_cobranza.fa_actual_area_rightclick")
-    pg.click(area_x, area_y, button="right")
-    time.sleep(0.5)
+    input_driver.driver().click(area_x, area_y, button="right")
+    wait.pause(0.5)
 
     copy_x, copy_y = coords.xy(master, "fa_cobranza.fa_actual_area_copy")
-    mouse.click(copy_x, copy_y, "fa_actual_area_copy", 0.5)
-    time.sleep(0.5)
-
-    validacion = clipboard.get_text().strip().lower()
+    mouse.click(copy_x, copy_y, "fa_actual_area_copy", 0)
+    validacion = clipboard.wait_change(marca, 1.0, "copy:fa_actual_area").strip().lower()
     if "actual" not in validacion:
         print("[flow:deudas_cuenta] no hay datos en FA Actual")
         return None
 
     # Click en area (seleccionar)
     mouse.click(area_x, area_y, "fa_actual_area (select)", 0.5)
-    time.sleep(0.5)
+    wait.pause(0.5)
 
     # Right-click + resaltar_todo + right-click + copy saldo
-    clipboard.clear()
-    time.sleep(0.3)
+    marca = clipboard.sentinel(clear_first=True)
     srx, sry = coords.xy(master, "fa_cobranza.fa_actual_saldo_rightclick")
-    pg.click(srx, sry, button="right")
-    time.sleep(0.5)
+    input_driver.driver().click(srx, sry, button="right")
+    wait.pause(0.5)
 
     rtx, rty = coords.xy(master, "fa_cobranza.fa_actual_resaltar_todo")
     mouse.click(rtx, rty, "fa_actual_resaltar_todo", 0.5)
-    time.sleep(0.5)
+    wait.pause(0.5)
 
-    pg.click(srx, sry, button="right")
-    time.sleep(0.5)
+    input_driver.driver().click(srx, sry, button="right")
+    wait.pause(0.5)
 
     scpx, scpy = coords.xy(master, "fa_cobranza.fa_actual_saldo_copy")
-    mouse.click(scpx, scpy, "fa_actual_saldo_copy", 0.5)
-    time.sleep(0.5)
-    saldo_fa = clipboard.get_text().strip()
+    mouse.click(scpx, scpy, "fa_actual_saldo_copy", 0)
+    saldo_fa = clipboard.wait_change(marca, 1.0, "copy:fa_actual_saldo").strip()
 
     # Right-click ID + copy
-    clipboard.clear()
-    time.sleep(0.3)
+    marca = clipboard.sentinel(clear_first=True)
     irx, iry = coords.xy(master, "fa_cobranza.fa_actual_id_rightclick")
-    pg.click(irx, iry, button="right")
-    time.sleep(0.5)
+    input_driver.driver().click(irx, iry, button="right")
+    wait.pause(0.5)
 
     icpx, icpy = coords.xy(master, "fa_cobranza.fa_actual_id_copy")
-    mouse.click(icpx, icpy, "fa_actual_id_copy", 0.5)
-    time.sleep(0.5)
-    id_fa = clipboard.get_text().strip()
+    mouse.click(icpx, icpy, "fa_actual_id_copy", 0)
+    id_fa = clipboard.wait_change(marca, 1.0, "copy:fa_actual_id").strip()
 
     if not id_fa or not saldo_fa:
         print("[flow:deudas_cuenta] FA Actual: id o saldo vacios")
@@ -100,6 +92,13 @@ def _extraer_fa_actual(master: dict, base_delay: float, tipo_documento: str) ->
     return {"id_fa": id_fa, "saldo": saldo_fa, "tipo_documento": tipo_documento}
 
 
+def _ctrl_c(timeout: float, site: str) -> str:
+    """Ctrl+C sobre la celda con foco. Vuelve apenas cambia el clipboard (techo: timeout)."""
+    marca = clipboard.sentinel(clear_first=True)
+    input_driver.driver().hotkey("ctrl", "c")
+    return clipboard.wait_change(marca, timeout, site).strip()
+
+
 def _iter_cuenta_financiera(
     master: dict,
     base_delay: float,
@@ -121,17 +120,13 @@ def _iter_cuenta_financiera(
     for iter_idx in range(MAX_CF_ITER):
         # Focus label
         mouse.click(cf_x, cf_y, "cuenta_financiera_label_click", 0.15)
-        time.sleep(0.12)
+        wait.pause(0.12)
         for _ in range(cf_offset):
-            pg.press("down")
-            time.sleep(0.08)
+            input_driver.driver().press("down")
+            wait.pause(0.08)
 
         # Validar label
-        clipboard.clear()
-        time.sleep(0.12)
-        pg.hotkey("ctrl", "c")
-        time.sleep(0.18)
-        current_label = clipboard.get_text().strip().lower()
+        current_label = _ctrl_c(0.3, "copy:cf_label").lower()
         print(f"[flow:deudas_cuenta] label offset={cf_offset} '{current_label[:60]}'")
 
         if "cuenta financiera" not in current_label:
@@ -140,13 +135,9 @@ def _iter_cuenta_financiera(
 
         # Cantidad: 2 rights + Ctrl+C
         for _ in range(2):
-            pg.press("right")
-            time.sleep(0.06)
-        clipboard.clear()
-        time.sleep(0.06)
-        pg.hotkey("ctrl", "c")
-        time.sleep(0.12)
-        cantidad_raw = clipboard.get_text().strip()
+            input_driver.driver().press("right")
+            wait.pause(0.06)
+        cantidad_raw = _ctrl_c(0.18, "copy:cf_cantidad")
         try:
             cantidad = int(re.sub(r"\D", "", cantidad_raw) or "0")
         except Exception:
@@ -157,15 +148,11 @@ def _iter_cuenta_financiera(
             cf_offset += 1
             # Chequear si siguiente fila es otra CF
             mouse.click(cf_x, cf_y, "cuenta_financiera_label_click (peek)", 0.2)
-            time.sleep(0.12)
+            wait.pause(0.12)
             for _ in range(cf_offset):
-                pg.press("down")
-                time.sleep(0.08)
-            clipboard.clear()
-            time.sleep(0.12)
-            pg.hotkey("ctrl", "c")
-            time.sleep(0.18)
-            next_label = clipboard.get_text().strip().lower()
+                input_driver.driver().press("down")
+                wait.pause(0.08)
+            next_label = _ctrl_c(0.3, "copy:cf_label").lower()
             if "cuenta financiera" in next_label:
                 continue
             break
@@ -176,30 +163,22 @@ def _iter_cuenta_financiera(
             ml_x, ml_y = coords.xy(master, "resumen_cf.mostrar_lista_btn1")
         if ml_x or ml_y:
             mouse.click(ml_x, ml_y, "mostrar_lista_btn", base_delay)
-            time.sleep(0.6)
+            wait.pause(0.6)
 
         # Primera celda
         fcx, fcy = coords.xy(master, "resumen_cf.cuenta_financiera_first_cell")
         if fcx or fcy:
             mouse.click(fcx, fcy, "cuenta_financiera_first_cell", 0.4)
-        time.sleep(0.4)
+        wait.pause(0.4)
 
         # Iterar filas
         for i in range(cantidad):
-            clipboard.clear()
-            time.sleep(0.06)
-            pg.hotkey("ctrl", "c")
-            time.sleep(0.12)
-            id_cf = clipboard.get_text().strip()
+            id_cf = _ctrl_c(0.18, "copy:cf_id")
 
             for _ in range(3):
-                pg.press("right")
-                time.sleep(0.06)
-            clipboard.clear()
-            time.sleep(0.06)
-            pg.hotkey("ctrl", "c")
-            time.sleep(0.12)
-            saldo_cf = clipboard.get_text().strip()
+                input_driver.driver().press("right")
+                wait.pause(0.06)
+            saldo_cf = _ctrl_c(0.18, "copy:cf_saldo")
 
             # Registrar si valido y no duplicado
             numero = extract_first_number(id_cf)
@@ -214,25 +193,21 @@ def _iter_cuenta_financiera(
 
             # Volver 3 a la izquierda
             for _ in range(3):
-                pg.press("left")
-                time.sleep(0.06)
+                input_driver.driver().press("left")
+                wait.pause(0.06)
 
             if i < cantidad - 1:
-                pg.press("down")
-                time.sleep(0.12)
+                input_driver.driver().press("down")
+                wait.pause(0.12)
 
         # Chequear siguiente seccion
         mouse.click(cf_x, cf_y, "cuenta_financiera_label_click (after)", 0.2)
-        time.sleep(0.12)
+        wait.pause(0.12)
         for _ in range(cf_offset + 1):
-            pg.press("down")
-            time.sleep(0.08)
-        clipboard.clear()
-        time.sleep(0.12)
+            input_driver.driver().press("down")
+            wait.pause(0.08)
         try:
-            pg.hotkey("ctrl", "c")
-            time.sleep(0.18)
-            next_label = clipboard.get_text().strip().lower()
+            next_label = _ctrl_c(0.3, "copy:cf_label").lower()
         except Exception as e:
             print(f"[flow:deudas_cuenta] error copiando siguiente label: {e}")
             break
@@ -247,6 +222,7 @@ def _iter_cuenta_financiera(
     return deudas
 
 
+@traced("flow")
 def buscar_deudas_cuenta(
     master: dict,
     tipo_documento: str = "DNI",
@@ -265,16 +241,21 @@ def buscar_deudas_cuenta(
     deudas: list[dict] = []
     ids: set[str] = set()
 
-    # 1-4. FA Cobranza -> Etapa -> Actual -> Buscar
+    # 1-3. FA Cobranza -> Etapa -> Actual
     for clave, label in (
         (f"fa_cobranza.fa_cobranza_btn{suf}", "fa_cobranza_btn"),
         (f"fa_cobranza.fa_cobranza_etapa{suf}", "fa_cobranza_etapa"),
         (f"fa_cobranza.fa_cobranza_actual{suf}", "fa_cobranza_actual"),
-        (f"fa_cobranza.fa_cobranza_buscar{suf}", "fa_cobranza_buscar"),
     ):
         x, y = coords.xy(master, clave)
         mouse.click(x, y, label, base_delay)
-    time.sleep(1.5)
+
+    # 4. Buscar: esperar a que la grilla de FAs deje de cambiar (techo: la demora fija)
+    region = coords.region(master, "estabilidad.fa_cobranza")
+    antes = cap.region_hash(region)
+    x, y = coords.xy(master, f"fa_cobranza.fa_cobranza_buscar{suf}")
+    mouse.click(x, y, "fa_cobranza_buscar", 0)
+    cap.wait_until_stable(region, base_delay + 1.5, baseline=antes, site="settle:fa_cobranza")
 
     # 5. FA Actual
     fa_actual = _extraer_fa_actual(master, base_delay, tipo_documento)
@@ -1,31 +1,49 @@
-"""Cerrar pestanias y volver a home (secuencia estandar de fin de flujo)."""
+"""Cerrar pestanias y volver a home (secuencia estandar de fin de flujo).
+
+Si shared.screen_state reconoce la pantalla actual se cierran solo las tabs
+que existen (y se salta el click en home si ya esta ahi); si no, a ciegas.
+"""
 from __future__ import annotations
 
-from shared import clipboard, coords, mouse
+from shared import clipboard, coords, mouse, screen_state
+from shared.tracing import traced
 
 
+@traced("flow")
 def cerrar_tabs(
     master: dict,
     veces: int = 5,
     close_tab_key: str = "close_tab_btn1",
     interval: float = 0.3,
+    destino: str = "home",
 ) -> None:
-    """Multi-click en close_tab_btn para cerrar N pestanias seguidas."""
+    """Multi-click en close_tab_btn para cerrar hasta N pestanias seguidas.
+
+    `destino`: pantalla a la que se quiere llegar (ver screen_state); con la
+    pantalla reconocida se cierran solo las tabs que faltan, nunca mas de N.
+    """
     x, y = coords.xy(master, f"comunes.{close_tab_key}")
     if not (x or y):
         print(f"[flow:cerrar_y_home] WARN comunes.{close_tab_key} no definido")
         return
+    veces = screen_state.tabs_a_cerrar(master, veces, destino)
+    if veces <= 0:
+        return
     mouse.multi_click(x, y, f"close_tab_btn x{veces}", times=veces, interval=interval)
 
 
+@traced("flow")
 def volver_a_home(master: dict, delay: float = 0.5) -> None:
-    """Click en home_area y limpia el clipboard."""
+    """Click en home_area (salvo que ya este en home) y limpia el clipboard."""
     x, y = coords.xy(master, "comunes.home_area")
-    if x or y:
+    if screen_state.en(master, "home"):
+        print("[flow:cerrar_y_home] ya en home, sin click")
+    elif x or y:
         mouse.click(x, y, "home_area", delay)
     clipboard.clear()
 
 
+@traced("flow")
 def cerrar_y_home(
     master: dict,
     veces: int = 5,
@@ -3,27 +3,35 @@
 Secuencia: cliente_section -> tipo_doc -> DNI/CUIT option -> campo -> escribir -> Enter
 -> (solo DNI 7-8 digitos) 2 clicks en no_cuit_field.
 
+El documento se pega y se verifica con keyboard.set_field; si la verificacion
+falla se tipea caracter por caracter como antes.
+
 Usado por: camino_deudas_principal, camino_score, camino_score_corto,
 camino_deudas_admin, camino_deudas_provisorio.
 """
 from __future__ import annotations
 
-import time
+from typing import Callable
 
-from shared import coords, keyboard, mouse
+from shared import coords, keyboard, mouse, wait
 from shared.validate import is_cuit
+from shared.tracing import traced
 
 
+@traced("flow")
 def entrada_cliente(
     master: dict,
     documento: str,
     cliente_section_key: str = "cliente_section2",
     base_delay: float = 0.25,
     post_enter_delay: float = 1.0,
+    antes_de_enter: Callable[[], None] | None = None,
 ) -> bool:
     """Ejecuta la entrada al cliente. Retorna True si es CUIT, False si DNI.
 
     cliente_section_key: 'cliente_section1' (camino_deudas_principal) o 'cliente_section2' (resto).
+    antes_de_enter: se llama justo antes del Enter (p.ej. para tomar el hash base
+    de la region que redibuja la busqueda, sin los clicks previos de por medio).
     """
     documento = (documento or "").strip()
     cuit = is_cuit(documento)
@@ -44,19 +52,23 @@ def entrada_cliente(
         x, y = coords.xy(master, "entrada.dni_option")
         mouse.click(x, y, "dni_option", base_delay)
 
-    # 3. click en campo y escribir (con fallback a dni_field1 si cuit_field1 no tiene coord)
+    # 3. campo: pegar y verificar (con fallback a dni_field1 si cuit_field1 no tiene coord)
     if cuit:
         x, y = coords.xy(master, "entrada.cuit_field1")
         if not (x or y):
             x, y = coords.xy(master, "entrada.dni_field1")
             print("[flow:entrada] WARN: cuit_field1 vacio, fallback a dni_field1")
-        mouse.click(x, y, "cuit_field1", 0.2)
+        label = "cuit_field1"
     else:
         x, y = coords.xy(master, "entrada.dni_field1")
-        mouse.click(x, y, "dni_field1", 0.2)
-    keyboard.type_text(documento, base_delay)
+        label = "dni_field1"
+    if not keyboard.set_field(x, y, documento, label, base_delay):
+        # contenido seleccionado: tipear lo reemplaza
+        keyboard.type_text(documento, base_delay)
 
     # 4. Enter
+    if antes_de_enter is not None:
+        antes_de_enter()
     keyboard.press_enter(post_enter_delay)
 
     # 5. no_cuit_field si DNI de 7-8 digitos
@@ -69,10 +81,11 @@ def entrada_cliente(
             print("[flow:entrada] WARN no_cuit_field no definido")
 
     # dar tiempo a que el sistema responda
-    time.sleep(post_enter_delay)
+    wait.pause(post_enter_delay)
     return cuit
 
 
+@traced("flow")
 def entrada_cliente_movimientos(
     master: dict,
     documento: str,
@@ -89,7 +102,7 @@ def entrada_cliente_movimientos(
     key = "entrada.cuit_field2" if cuit else "entrada.dni_field2"
     x, y = coords.xy(master, key)
     label = "cuit_field2" if cuit else "dni_field2"
-    mouse.click(x, y, label, 0.3)
-    keyboard.type_text(documento, base_delay)
+    if not keyboard.set_field(x, y, documento, label, base_delay):
+        keyboard.type_text(documento, base_delay)
     keyboard.press_enter(post_enter_delay)
     return cuit
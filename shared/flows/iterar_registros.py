@@ -4,8 +4,12 @@ Compartido entre `camino_deudas_principal` y `camino_deudas_provisorio`:
   - parse_fa_data(tabla)               -> [{id_fa, cuit, id_cliente}]
   - copiar_saldo_registro(master, ...) -> saldo (str)
   - expandir_registros(master, N, ...) -> config para mostrar >20 registros
-  - iterar_registros(master, fa_data_list, base_delay, ..., on_row, stream_cuenta_item)
-      Itera cada registro (id_area + offset Y), copia saldo, cierra tab.
+  - parse_saldos_tabla(tabla)          -> {id_fa: saldo} si la tabla trae columna de saldo
+  - iterar_registros(master, fa_data_list, base_delay, ..., on_row, stream_cuenta_item, tabla)
+      Con SALDO_BULK (default) toma los saldos de una sola copia (la tabla de
+      Ver Todos que ya tiene el camino, o la grilla de cuentas copiada entera)
+      y solo abre los registros cuyo saldo falte (id_area + offset Y, copia
+      saldo, cierra tab).
       on_row(idx, item, fa_saldos_acum) -> bool: True para abortar la iteracion
       stream_cuenta_item: imprime [CUENTAS_TOTAL]/[CUENTA_ITEM] para el worker.
   - buscar_por_id_cliente(master, id_cliente, base_delay, ...)
@@ -13,22 +17,63 @@ Compartido entre `camino_deudas_principal` y `camino_deudas_provisorio`:
 """
 from __future__ import annotations
 
-import json
+import os
 import re
-import time
 from typing import Callable
 
-import pyautogui as pg
-
-from shared import amounts, clipboard, coords, keyboard, mouse
+from shared import amounts, clipboard, coords, input_driver, io_worker, keyboard, mouse, wait
 from shared.flows.ver_todos import copiar_tabla
+from shared.tracing import traced
 
 ID_AREA_OFFSET_Y_DEFAULT = 19
 MAX_REGISTROS_SIN_EXPANDIR = 20
+SALDO_BULK = os.getenv("SALDO_BULK", "1").lower() in ("1", "true", "yes", "on")
+# Nombres exactos (sin distinguir mayusculas) de la columna de saldo, separados por coma
+SALDO_COLUMNA = tuple(
+    c.strip().lower() for c in os.getenv("SALDO_COLUMNA", "Saldo").split(",") if c.strip()
+)
 
 OnRow = Callable[[int, dict, list[dict]], bool]
 
 
+def _split_row(line: str) -> list[str]:
+    """Columnas de una fila copiada de T3 (tabs, o 4+ espacios si no hay tabs)."""
+    parts = re.split(r"\t+", line.strip())
+    if len(parts) == 1:
+        parts = re.split(r"\s{4,}", line.strip())
+    return parts
+
+
+def _split_celdas(line: str) -> list[str]:
+    """Como _split_row pero un tab = un separador: las celdas vacias se conservan.
+
+    Para leer una columna por indice (parse_saldos_tabla): con `\t+` una celda
+    vacia desaparece y todo lo que sigue se corre un lugar.
+    """
+    line = line.rstrip("\r\n")
+    if "\t" in line:
+        return line.split("\t")
+    return _split_row(line)
+
+
+def _fa_column(header_parts: list[str]) -> int | None:
+    for cand in ("ID del FA", "FA ID"):
+        if cand in header_parts:
+            return header_parts.index(cand)
+    return None
+
+
+def _fa_id(parts: list[str], fa_index: int) -> str:
+    """id_fa de la fila; si la celda no es numerica prueba la columna anterior."""
+    fa_id = parts[fa_index].strip()
+    if not (fa_id and fa_id.isdigit()):
+        if fa_index > 0 and len(parts) > fa_index - 1:
+            alt = parts[fa_index - 1].strip()
+            if alt and alt.isdigit():
+                fa_id = alt
+    return fa_id if fa_id.isdigit() else ""
+
+
 def parse_fa_data(table_text: str, log_prefix: str = "[iterar]") -> list[dict[str, str]]:
     """Parsea tabla Ver Todos a [{id_fa, cuit, id_cliente}]."""
     if not table_text:
@@ -38,18 +83,8 @@ def parse_fa_data(table_text: str, log_prefix: str = "[iterar]") -> list[dict[st
         print(f"{log_prefix} WARN tabla con menos de 2 lineas")
         return []
 
-    header = lines[0]
-    header_parts = re.split(r"\t+", header.strip())
-    if len(header_parts) == 1:
-        header_parts = re.split(r"\s{4,}", header.strip())
-
-    fa_index = None
-    for cand in ("ID del FA", "FA ID"):
-        try:
-            fa_index = header_parts.index(cand)
-            break
-        except ValueError:
-            continue
+    header_parts = _split_row(lines[0])
+    fa_index = _fa_column(header_parts)
     if fa_index is None:
         print(f"{log_prefix} ERROR no se encontro 'ID del FA'/'FA ID' en header: {header_parts}")
         return []
@@ -74,20 +109,12 @@ def parse_fa_data(table_text: str, log_prefix: str = "[iterar]") -> list[dict[st
     for i, line in enumerate(lines[1:], start=1):
         if not line.strip():
             continue
-        parts = re.split(r"\t+", line.strip())
-        if len(parts) == 1:
-            parts = re.split(r"\s{4,}", line.strip())
+        parts = _split_row(line)
         if len(parts) <= fa_index:
             continue
 
-        fa_id = parts[fa_index].strip()
-        if not (fa_id and fa_id.isdigit()):
-            if fa_index > 0 and len(parts) > fa_index - 1:
-                alt = parts[fa_index - 1].strip()
-                if alt and alt.isdigit():
-                    fa_id = alt
-
-        if not (fa_id and fa_id.isdigit()):
+        fa_id = _fa_id(parts, fa_index)
+        if not fa_id:
             continue
 
         tiene_cuit = ""
@@ -122,6 +149,96 @@ def parse_fa_data(table_text: str, log_prefix: str = "[iterar]") -> list[dict[st
     return out
 
 
+def _saldo_column(header_parts: list[str]) -> int | None:
+    """Indice de la columna de saldo: nombre exacto de SALDO_COLUMNA, en ese orden."""
+    nombres = [h.strip().lower() for h in header_parts]
+    for cand in SALDO_COLUMNA:
+        if cand in nombres:
+            return nombres.index(cand)
+    return None
+
+
+def _sin_signo(saldo: str) -> str:
+    """'$ 1.500,00' -> '1.500,00' (el '$' lo agrega CUENTA_ITEM)."""
+    saldo = saldo.strip()
+    return saldo[1:].strip() if saldo.startswith("$") else saldo
+
+
+def parse_saldos_tabla(table_text: str, log_prefix: str = "[iterar]") -> dict[str, str]:
+    """{id_fa: saldo} de una tabla copiada que tenga la columna SALDO_COLUMNA.
+
+    Se compara el nombre exacto: 'Saldo Vencido' o 'Saldo Anterior' no cuentan
+    como el saldo de la FA.
+
+    Solo incluye saldos que amounts.parse_to_float entiende, de filas con la
+    misma cantidad de celdas que el header; el resto queda afuera para que
+    iterar_registros los lea abriendo el registro. El saldo va sin '$', igual
+    que el de copiar_saldo_registro.
+    """
+    if not table_text:
+        return {}
+    lines = [ln for ln in table_text.strip("\r\n").split("\n") if ln.strip()]
+    if len(lines) < 2:
+        return {}
+    header_parts = _split_celdas(lines[0])
+    fa_index = _fa_column(header_parts)
+    saldo_index = _saldo_column(header_parts)
+    if fa_index is None:
+        return {}
+    if saldo_index is None:
+        print(f"{log_prefix} sin columna de saldo {list(SALDO_COLUMNA)} en {header_parts}")
+        return {}
+
+    out: dict[str, str] = {}
+    descartadas = 0
+    for line in lines[1:]:
+        parts = _split_celdas(line)
+        if len(parts) != len(header_parts):
+            descartadas += 1
+            continue
+        fa_id = _fa_id(parts, fa_index)
+        saldo = _sin_signo(parts[saldo_index])
+        if fa_id and amounts.parse_to_float(saldo) is not None:
+            out.setdefault(fa_id, saldo)
+    print(f"{log_prefix} columna de saldo '{header_parts[saldo_index]}' (#{saldo_index}): {len(out)} saldos en la tabla")
+    if descartadas:
+        print(f"{log_prefix} WARN {descartadas} filas con otra cantidad de celdas que el header: se abren una por una")
+    return out
+
+
+@traced("flow")
+def copiar_grilla_cuentas(master: dict, base_delay: float) -> str:
+    """Copia entera la grilla de cuentas (right-click -> resaltar todo -> copiar todo).
+
+    '' si las coords saldo_principal.grilla_* no estan calibradas.
+    """
+    rx, ry = coords.xy(master, "saldo_principal.grilla_rightclick")
+    cx, cy = coords.xy(master, "saldo_principal.grilla_copiar_todo")
+    if not ((rx or ry) and (cx or cy)):
+        return ""
+    mouse.right_click(rx, ry, "grilla (right 1)", base_delay)
+    hx, hy = coords.xy(master, "saldo_principal.grilla_resaltar_todo")
+    if hx or hy:
+        mouse.click(hx, hy, "grilla_resaltar_todo", base_delay)
+        mouse.right_click(rx, ry, "grilla (right 2)", base_delay)
+    marca = clipboard.sentinel(clear_first=True)
+    mouse.click(cx, cy, "grilla_copiar_todo", 0)
+    return clipboard.wait_change(marca, 1.0, "copy:grilla_cuentas")
+
+
+def _saldos_en_bloque(master: dict, tabla: str, base_delay: float, log_prefix: str) -> dict[str, str]:
+    """Saldos de una sola copia: primero la tabla recibida, si no la grilla de cuentas."""
+    saldos = parse_saldos_tabla(tabla, log_prefix)
+    if saldos:
+        return saldos
+    grilla = copiar_grilla_cuentas(master, base_delay)
+    saldos = parse_saldos_tabla(grilla, log_prefix)
+    if not saldos:
+        print(f"{log_prefix} sin saldos en bloque, se abre cada registro")
+    return saldos
+
+
+@traced("flow")
 def expandir_registros(
     master: dict, num_registros: int, base_delay: float, log_prefix: str = "[iterar]"
 ) -> None:
@@ -140,19 +257,19 @@ def expandir_registros(
         return
     mouse.click(nfx, nfy, "num_registros_field", 0.3)
 
-    pg.click()
-    time.sleep(0.1)
-    pg.click()
-    time.sleep(0.2)
-    pg.press("delete")
-    time.sleep(0.3)
-    pg.press("backspace")
-    time.sleep(0.2)
+    input_driver.driver().click()
+    wait.pause(0.1)
+    input_driver.driver().click()
+    wait.pause(0.2)
+    input_driver.driver().press("delete")
+    wait.pause(0.3)
+    input_driver.driver().press("backspace")
+    wait.pause(0.2)
     mouse.click(nfx, nfy, "num_registros_field (re-click)", 0.2)
     for _ in range(3):
-        pg.press("backspace")
-        time.sleep(0.1)
-    time.sleep(0.3)
+        input_driver.driver().press("backspace")
+        wait.pause(0.1)
+    wait.pause(0.3)
 
     keyboard.type_text(str(num_registros), 0.8)
 
@@ -161,6 +278,7 @@ def expandir_registros(
         mouse.click(bbx, bby, "buscar_registros_btn", 2.5)
 
 
+@traced("flow")
 def copiar_saldo_registro(master: dict, base_delay: float) -> str:
     """Doble-click saldo -> right-click -> saldo_all_copy -> right-click -> saldo_copy."""
     sx, sy = coords.xy(master, "saldo_principal.saldo")
@@ -171,11 +289,12 @@ def copiar_saldo_registro(master: dict, base_delay: float) -> str:
     mouse.right_click(sx, sy, "saldo (right 1)", 0.5)
     mouse.click(sax, say, "saldo_all_copy", base_delay)
     mouse.right_click(sx, sy, "saldo (right 2)", 0.5)
-    mouse.click(scx, scy, "saldo_copy", 0.5)
-
-    return clipboard.get_text().strip()
+    marca = clipboard.sentinel()
+    mouse.click(scx, scy, "saldo_copy", 0)
+    return clipboard.wait_change(marca, 0.5, "copy:saldo_copy").strip()
 
 
+@traced("flow")
 def iterar_registros(
     master: dict,
     fa_data_list: list[dict[str, str]],
@@ -185,9 +304,14 @@ def iterar_registros(
     close_tab_key: str = "close_tab_btn1",
     stream_cuenta_item: bool = True,
     on_row: OnRow | None = None,
+    tabla: str = "",
 ) -> tuple[list[dict[str, str]], bool]:
     """Itera cada registro (id_area + offset Y), copia saldo, cierra tab.
 
+    Con SALDO_BULK los saldos salen de `tabla` (el texto de Ver Todos que ya
+    copio el camino) o de una copia de la grilla de cuentas; solo se abren los
+    registros cuyo saldo no vino en esa copia.
+
     Devuelve (fa_saldos, aborted).
       - fa_saldos: [{id_fa, saldo, [cuit?], [id_cliente_interno?]}]
       - aborted: True si `on_row` devolvio True y corto la iteracion.
@@ -202,8 +326,9 @@ def iterar_registros(
     close_x, close_y = coords.xy(master, f"comunes.{close_tab_key}")
 
     total = len(fa_data_list)
+    saldos_bloque = _saldos_en_bloque(master, tabla, base_delay, log_prefix) if SALDO_BULK else {}
     if stream_cuenta_item:
-        print(f"[CUENTAS_TOTAL] {json.dumps({'total': total})}", flush=True)
+        io_worker.emit_marker("CUENTAS_TOTAL", {"total": total})
 
     aborted = False
     for idx, fa_data in enumerate(fa_data_list):
@@ -212,12 +337,14 @@ def iterar_registros(
         id_cliente_int = fa_data.get("id_cliente", "")
         print(f"{log_prefix} registro {idx + 1}/{total} id_fa={fa_id}{' (CUIT)' if cuit_flag else ''}")
 
-        clipboard.clear()
-        cur_y = iay + (idx * offset_y)
-        mouse.click(iax, cur_y, f"id_area #{idx + 1}", 1.5)
-
-        saldo = copiar_saldo_registro(master, base_delay)
-        print(f"{log_prefix} id_fa={fa_id} saldo='{saldo}'")
+        saldo = saldos_bloque.get(fa_id, "")
+        abierto = not saldo
+        if abierto:
+            clipboard.clear()
+            cur_y = iay + (idx * offset_y)
+            mouse.click(iax, cur_y, f"id_area #{idx + 1}", 1.5)
+            saldo = copiar_saldo_registro(master, base_delay)
+        print(f"{log_prefix} id_fa={fa_id} saldo='{saldo}'{'' if abierto else ' (bloque)'}")
 
         item: dict[str, str] = {"id_fa": fa_id, "saldo": saldo}
         if cuit_flag:
@@ -231,14 +358,14 @@ def iterar_registros(
             is_duplicate = bool(norm_id and norm_id in streamed_ids)
             if norm_id and not is_duplicate:
                 streamed_ids.add(norm_id)
-            saldo_emit = ("$" + saldo) if amounts.parse_to_float(saldo) else ""
+            saldo_emit = ("$" + _sin_signo(saldo)) if amounts.parse_to_float(saldo) else ""
             payload: dict = {"id_fa": fa_id, "saldo": saldo_emit}
             if is_duplicate:
                 payload["duplicate"] = True
                 print(f"{log_prefix} [DEDUP] id_fa={fa_id} ya emitido, marcando duplicate")
-            print(f"[CUENTA_ITEM] {json.dumps(payload)}", flush=True)
+            io_worker.emit_marker("CUENTA_ITEM", payload)
 
-        if close_x or close_y:
+        if abierto and (close_x or close_y):
             mouse.click(close_x, close_y, "close_tab_btn", base_delay)
 
         if on_row is not None:
@@ -254,7 +381,7 @@ def iterar_registros(
 
 
 def _limpiar_campo(master: dict, key: str, label: str, log_prefix: str = "[iterar]") -> None:
-    """Patron de limpieza: 3 clicks + delete + backspace + 3 backspaces."""
+    """Patron de limpieza: 3 clicks + delete + backspace + 3 backspaces (fallback de _setear_campo)."""
     fx, fy = coords.xy(master, key)
     if not (fx or fy):
         return
@@ -262,17 +389,38 @@ def _limpiar_campo(master: dict, key: str, label: str, log_prefix: str = "[itera
     mouse.click(fx, fy, label, 0.2)
     mouse.click(fx, fy, label, 0.1)
     mouse.click(fx, fy, label, 0.2)
-    pg.press("delete")
-    time.sleep(0.6)
-    pg.press("backspace")
-    time.sleep(0.2)
+    input_driver.driver().press("delete")
+    wait.pause(0.6)
+    input_driver.driver().press("backspace")
+    wait.pause(0.2)
     mouse.click(fx, fy, label, 0.2)
     for _ in range(3):
-        pg.press("backspace")
-        time.sleep(0.1)
-    time.sleep(0.2)
+        input_driver.driver().press("backspace")
+        wait.pause(0.1)
+    wait.pause(0.2)
+
+
+def _setear_campo(
+    master: dict, key: str, texto: str, label: str, base_delay: float, log_prefix: str = "[iterar]"
+) -> None:
+    """Pega `texto` en el campo; si no se verifica, limpieza completa + tipeo.
+
+    Con `texto` vacio solo se limpia (ritual completo: un campo vacio no se
+    puede verificar copiando).
+    """
+    fx, fy = coords.xy(master, key)
+    if not (fx or fy):
+        print(f"{log_prefix} WARN {key} no definido")
+        return
+    if texto and keyboard.set_field(fx, fy, texto, label, base_delay):
+        return
+    _limpiar_campo(master, key, label, log_prefix)
+    if texto:
+        mouse.click(fx, fy, label, base_delay)
+        keyboard.type_text(texto, base_delay)
 
 
+@traced("flow")
 def buscar_por_id_cliente(
     master: dict,
     id_cliente: str,
@@ -290,12 +438,8 @@ def buscar_por_id_cliente(
     """
     print(f"{log_prefix} buscando por ID Cliente {id_cliente}")
 
-    _limpiar_campo(master, "entrada.dni_field_clear", "dni_field_clear", log_prefix)
-    _limpiar_campo(master, "entrada.id_cliente_field", "id_cliente_field", log_prefix)
-
-    icx, icy = coords.xy(master, "entrada.id_cliente_field")
-    mouse.click(icx, icy, "id_cliente_field", base_delay)
-    keyboard.type_text(id_cliente, base_delay)
+    _setear_campo(master, "entrada.dni_field_clear", "", "dni_field_clear", base_delay, log_prefix)
+    _setear_campo(master, "entrada.id_cliente_field", id_cliente, "id_cliente_field", base_delay, log_prefix)
     keyboard.press_enter(1.0)
 
     tabla = copiar_tabla(
@@ -325,6 +469,7 @@ def buscar_por_id_cliente(
         close_tab_key=close_tab_key,
         stream_cuenta_item=stream_cuenta_item,
         on_row=on_row,
+        tabla=tabla,
     )
     for item in fa_saldos:
         item["id_cliente_interno"] = id_cliente
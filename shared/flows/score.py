@@ -4,13 +4,13 @@ from __future__ import annotations
 import time
 from pathlib import Path
 
-import pyautogui as pg
-
 from shared import capture as cap
-from shared import clipboard, coords, mouse
+from shared import clipboard, coords, input_driver, mouse, wait
 from shared.parsing import extract_first_number
+from shared.tracing import traced
 
 
+@traced("flow")
 def copiar_score(master: dict, pre_delay: float = 2.5) -> str:
     """Right-click score_area_page -> copy_menu_option -> lee clipboard.
 
@@ -25,24 +25,24 @@ def copiar_score(master: dict, pre_delay: float = 2.5) -> str:
         print("[flow:score] ERROR no hay score_area_page ni score_area_copy")
         return "No encontrado"
 
-    time.sleep(pre_delay)
-    pg.moveTo(px, py, duration=0.12)
-    pg.click(button="right")
-    time.sleep(0.25)
+    wait.pause(pre_delay)
+    marca = clipboard.sentinel()
+    input_driver.driver().click(px, py, button="right", duration=input_driver.move_s(0.12))
+    wait.pause(0.25)
 
     cx, cy = coords.xy(master, "score.copy_menu_option")
     if cx or cy:
-        time.sleep(0.5)
-        mouse.click(cx, cy, "copy_menu_option", 0.2)
+        wait.pause(0.5)
+        mouse.click(cx, cy, "copy_menu_option", 0)
 
-    time.sleep(0.25)
-    raw = clipboard.get_text().strip()
+    raw = clipboard.wait_change(marca, 0.45, "copy:score").strip()
     numero = extract_first_number(raw)
     score = numero or "No encontrado"
     print(f"[flow:score] raw='{raw[:40]}' score={score}")
     return score
 
 
+@traced("flow")
 def capturar_score(
     master: dict,
     dni: str,
@@ -57,9 +57,9 @@ def capturar_score(
 
     scx, scy = coords.xy(master, "score.screenshot_confirm")
     if scx or scy:
-        time.sleep(pre_capture_delay)
+        wait.pause(pre_capture_delay)
         mouse.click(scx, scy, "screenshot_confirm", 0.6)
-        time.sleep(0.5)
+        wait.pause(0.5)
 
     rx, ry, rw, rh = coords.resolve_screenshot_region(coords.get(master, "captura"), base_key="screenshot")
     if not (rw and rh):
@@ -69,7 +69,7 @@ def capturar_score(
             return shot_path
         return None
 
-    time.sleep(0.25)
+    wait.pause(0.25)
     shot_path = shot_dir / f"score_{dni}_{int(time.time())}.png"
     if cap.capture_region(rx, ry, rw, rh, shot_path):
         return shot_path
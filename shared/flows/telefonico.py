@@ -1,12 +1,10 @@
 """Deteccion de caso 'Telefonico' (cliente con cuenta unica)."""
 from __future__ import annotations
 
-import time
 import unicodedata
 
-import pyautogui as pg
-
-from shared import clipboard, coords, mouse
+from shared import clipboard, coords, input_driver, mouse, wait
+from shared.tracing import traced
 
 
 def normalize(text: str) -> str:
@@ -22,6 +20,7 @@ def es_telefonico(texto_copiado: str) -> bool:
     return normalize(texto_copiado) == "telefonico"
 
 
+@traced("flow")
 def verificar_telefonico_post_seleccionar(master: dict) -> tuple[bool, str]:
     """Ritual '¿es telefonico?' DESPUES de seleccionar una cuenta.
 
@@ -44,13 +43,11 @@ def verificar_telefonico_post_seleccionar(master: dict) -> tuple[bool, str]:
         print("[flow:telefonico] WARN coords de validacion post-seleccionar no definidas, asumo OK")
         return True, ""
 
-    clipboard.clear()
-    time.sleep(0.25)
+    marca = clipboard.sentinel(clear_first=True)
     if fcx or fcy:
         mouse.click(fcx, fcy, "validation_telefonico_focus", 0.35)
-    pg.click(rcx, rcy, button="right")
-    time.sleep(0.4)
-    mouse.click(cpx, cpy, "validation_telefonico_copy", 0.35)
-    time.sleep(0.35)
-    texto = clipboard.get_text().strip()
+    input_driver.driver().click(rcx, rcy, button="right")
+    wait.pause(0.4)
+    mouse.click(cpx, cpy, "validation_telefonico_copy", 0)
+    texto = clipboard.wait_change(marca, 0.7, "copy:validation_telefonico").strip()
     return es_telefonico(texto), texto
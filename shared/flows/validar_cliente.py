@@ -8,45 +8,41 @@ Tres operaciones:
 """
 from __future__ import annotations
 
-import time
-
-import pyautogui as pg
-
-from shared import clipboard, coords, keyboard, mouse
+from shared import clipboard, coords, input_driver, keyboard, mouse, wait
 from shared.parsing import has_digit_run
+from shared.tracing import traced
 
 VALID_FUNCIONAL = "funcional"
 VALID_CORRUPTO = "corrupto"
 
 
+@traced("flow")
 def validar_cliente_creado(master: dict, base_delay: float = 0.3) -> tuple[bool, str]:
     """Right-click en client_name_field + copi_id_field. Retorna (creado?, texto).
 
     True si el clipboard tiene una corrida de 4+ digitos.
     """
-    clipboard.clear()
-    time.sleep(0.2)
+    marca = clipboard.sentinel(clear_first=True)
 
     x, y = coords.xy(master, "validar.client_name_field")
     if not (x or y):
         print("[flow:validar_cliente] ERROR client_name_field no definido")
         return False, ""
-    pg.click(x, y, button="right")
-    time.sleep(0.5)
+    input_driver.driver().click(x, y, button="right")
+    wait.pause(0.5)
 
     cx, cy = coords.xy(master, "validar.copi_id_field")
     if not (cx or cy):
         print("[flow:validar_cliente] ERROR copi_id_field no definido")
         return False, ""
-    mouse.click(cx, cy, "copi_id_field", 0.3)
-    time.sleep(0.5)
-
-    texto = clipboard.get_text().strip()
+    mouse.click(cx, cy, "copi_id_field", 0)
+    texto = clipboard.wait_change(marca, 0.8, "copy:copi_id_field").strip()
     creado = has_digit_run(texto, 4)
     print(f"[flow:validar_cliente] ID copiado='{texto[:60]}' creado={creado}")
     return creado, texto
 
 
+@traced("flow")
 def validar_fraude(master: dict, base_delay: float = 0.5) -> bool:
     """Click + right-click en fraude_section -> fraude_copy -> busca 'fraude'."""
     fx, fy = coords.xy(master, "validar.fraude_section")
@@ -55,17 +51,16 @@ def validar_fraude(master: dict, base_delay: float = 0.5) -> bool:
         return False
 
     mouse.click(fx, fy, "fraude_section", base_delay)
-    pg.click(fx, fy, button="right")
-    time.sleep(0.5)
+    marca = clipboard.sentinel()
+    input_driver.driver().click(fx, fy, button="right")
+    wait.pause(0.5)
 
     cx, cy = coords.xy(master, "validar.fraude_copy")
     if not (cx or cy):
         print("[flow:validar_cliente] WARN fraude_copy no definido")
         return False
-    mouse.click(cx, cy, "fraude_copy", 0.5)
-    time.sleep(0.5)
-
-    texto = clipboard.get_text().strip().lower()
+    mouse.click(cx, cy, "fraude_copy", 0)
+    texto = clipboard.wait_change(marca, 1.0, "copy:fraude").strip().lower()
     try:
         safe = texto.encode("ascii", errors="replace").decode("ascii")
         print(f"[flow:validar_cliente] fraude? texto='{safe[:80]}'")
@@ -74,6 +69,7 @@ def validar_fraude(master: dict, base_delay: float = 0.5) -> bool:
     return "fraude" in texto
 
 
+@traced("flow")
 def validar_registro_corrupto(
     master: dict,
     max_copy_attempts: int = 3,
@@ -86,31 +82,31 @@ def validar_registro_corrupto(
 
     anchor_key: client_id_field1 (camino_deudas_viejo) o client_id_field2 (resto).
     """
-    time.sleep(1.5)
-    pg.press("enter")
+    wait.pause(1.5)
+    input_driver.driver().press("enter")
     print("[flow:validar_cliente] Enter presionado")
-    time.sleep(1.5)
+    wait.pause(1.5)
 
     x, y = coords.xy(master, anchor_key)
     if not (x or y):
         print(f"[flow:validar_cliente] WARN {anchor_key} no definido, asumo funcional")
         return VALID_FUNCIONAL
-    pg.click(x, y, button="right")
-    time.sleep(0.5)
+    marca = clipboard.sentinel()
+    input_driver.driver().click(x, y, button="right")
+    wait.pause(0.5)
 
     cx, cy = coords.xy(master, "validar.copi_id_field")
     if not (cx or cy):
         print("[flow:validar_cliente] WARN copi_id_field no definido, asumo funcional")
         return VALID_FUNCIONAL
-    mouse.click(cx, cy, "copi_id_field", 0.3)
-    time.sleep(0.5)
+    mouse.click(cx, cy, "copi_id_field", 0)
 
-    texto = ""
-    for attempt in range(max_copy_attempts):
-        texto = clipboard.get_text().strip()
+    texto = clipboard.wait_change(marca, 0.8, "copy:copi_id_field").strip()
+    for attempt in range(max_copy_attempts - 1):
         if texto:
             break
-        time.sleep(0.5)
+        wait.pause(0.5)
+        texto = clipboard.get_text().strip()
 
     if not texto:
         print("[flow:validar_cliente] clipboard vacio tras reintentos, asumo funcional")
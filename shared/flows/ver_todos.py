@@ -13,11 +13,20 @@ from __future__ import annotations
 
 import time
 
-import pyautogui as pg
-
+from shared import capture as cap
 from shared import clipboard, coords, mouse
+from shared.tracing import traced
+
+
+def _click_y_esperar(master: dict, x: int, y: int, label: str, timeout: float) -> None:
+    """Click en Ver Todos y espera a que la tabla se dibuje (techo: `timeout`)."""
+    region = coords.region(master, "estabilidad.ver_todos")
+    antes = cap.region_hash(region)
+    mouse.click(x, y, label, 0)
+    cap.wait_until_stable(region, timeout, baseline=antes, site="settle:ver_todos")
 
 
+@traced("flow")
 def copiar_tabla(
     master: dict,
     ver_todos_key: str = "ver_todos_btn1",
@@ -35,7 +44,7 @@ def copiar_tabla(
     if not (x or y):
         print(f"[flow:ver_todos] WARN ver_todos.{ver_todos_key} no definido")
         return ""
-    mouse.click(x, y, ver_todos_key, post_ver_todos_delay)
+    _click_y_esperar(master, x, y, ver_todos_key, post_ver_todos_delay)
 
     # 2. Right-click copiar_todo_btn
     cx, cy = coords.xy(master, "ver_todos.copiar_todo_btn")
@@ -50,10 +59,11 @@ def copiar_tabla(
 
     # 5. copiado_btn
     dx, dy = coords.xy(master, "ver_todos.copiado_btn")
-    mouse.click(dx, dy, "copiado_btn", 0.8)
+    marca = clipboard.sentinel()
+    mouse.click(dx, dy, "copiado_btn", 0)
 
-    # 6. leer clipboard
-    tabla = clipboard.get_text()
+    # 6. leer clipboard apenas T3 termina de copiar
+    tabla = clipboard.wait_change(marca, 0.8, "copy:ver_todos")
     print(f"[flow:ver_todos] tabla copiada ({len(tabla)} chars)")
 
     # 7. cerrar ventana Ver Todos
@@ -64,6 +74,7 @@ def copiar_tabla(
     return tabla
 
 
+@traced("flow")
 def ver_todos_admin(
     master: dict,
     close_tab_key: str = "close_tab_btn1",
@@ -78,7 +89,7 @@ def ver_todos_admin(
     if not (x or y):
         print("[flow:ver_todos_admin] WARN ver_todos_btn2 no definido")
         return ""
-    mouse.click(x, y, "ver_todos_btn2", post_ver_todos_delay)
+    _click_y_esperar(master, x, y, "ver_todos_btn2", post_ver_todos_delay)
 
     rcx, rcy = coords.xy(master, "ver_todos_admin_extra.ver_todos_right_click")
     mouse.right_click(rcx, rcy, "ver_todos_right_click", base_delay)
@@ -90,9 +101,10 @@ def ver_todos_admin(
     mouse.right_click(rcx2, rcy2, "ver_todos_right_click_2", base_delay)
 
     cpx, cpy = coords.xy(master, "ver_todos_admin_extra.copiar_todas_btn")
-    mouse.click(cpx, cpy, "copiar_todas_btn", 0.8)
+    marca = clipboard.sentinel()
+    mouse.click(cpx, cpy, "copiar_todas_btn", 0)
 
-    tabla = clipboard.get_text()
+    tabla = clipboard.wait_change(marca, 0.8, "copy:ver_todos_admin")
     print(f"[flow:ver_todos_admin] tabla copiada ({len(tabla)} chars)")
 
     close_x, close_y = coords.xy(master, "ver_todos_admin_extra.close_ver_todos")
@@ -0,0 +1,423 @@
+"""Drivers de entrada (mouse + teclado) detras de shared.mouse / shared.keyboard.
+
+INPUT_DRIVER elige el driver del proceso:
+  - pyautogui (default): lo de siempre. moveTo con tween + click, PAUSE de
+    pyautogui (PYAUTOGUI_PAUSE) despues de cada accion.
+  - xtest (Linux, python-xlib): eventos XTest directos al servidor X. El
+    puntero salta al destino (sin recorrido) y las teclas de un type_text sin
+    intervalo van en un solo lote con un unico sync. Sin PAUSE extra.
+  - pynput: Controller de pynput (posicion instantanea, sin PAUSE).
+  - fake: no toca la pantalla, anota los eventos en memoria (`FakeDriver.eventos`),
+    para probar caminos/planes sin T3.
+  - auto: xtest si hay DISPLAY y XTEST, si no pyautogui.
+Si el driver pedido no levanta se usa pyautogui.
+
+MOUSE_MOVE_S y TYPE_INTERVAL_S (sin default) pisan la duracion del movimiento
+y el intervalo entre caracteres que pide cada llamador: 0 = clicks sin
+recorrido y texto de un saque tambien con pyautogui.
+
+Nombres de teclas: los de pyautogui ("enter", "down", "ctrl", "a", ...).
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Iterator
+
+from shared import wait
+
+try:
+    import pyautogui as pg
+    _HAS_PYAUTOGUI = True
+    wait.aplicar_pausa_pyautogui(pg)  # tambien para los caminos que todavia usan pg directo
+except Exception:
+    _HAS_PYAUTOGUI = False
+    pg = None  # type: ignore
+
+INPUT_DRIVER = os.getenv("INPUT_DRIVER", "pyautogui").strip().lower()
+
+
+def _float_env(name: str) -> float | None:
+    valor = os.getenv(name, "").strip()
+    try:
+        return float(valor) if valor else None
+    except ValueError:
+        return None
+
+
+MOUSE_MOVE_S = _float_env("MOUSE_MOVE_S")
+TYPE_INTERVAL_S = _float_env("TYPE_INTERVAL_S")
+
+
+def move_s(pedido: float) -> float:
+    """Duracion del movimiento a usar (MOUSE_MOVE_S o la del llamador), escalada."""
+    return (pedido if MOUSE_MOVE_S is None else MOUSE_MOVE_S) * wait.SLEEP_SCALE
+
+
+def type_interval(pedido: float) -> float:
+    return pedido if TYPE_INTERVAL_S is None else TYPE_INTERVAL_S
+
+
+# ── Interfaz ───────────────────────────────────────────────────────────────────
+class InputDriver(ABC):
+    """Operaciones minimas que usan shared.mouse y shared.keyboard."""
+    name = "base"
+
+    def size(self) -> tuple[int, int] | None:
+        """Tamanio de la pantalla, o None si el driver no lo sabe."""
+        return None
+
+    @abstractmethod
+    def move(self, x: int, y: int, duration: float = 0.0) -> None:
+        ...
+
+    @abstractmethod
+    def click(self, x: int | None = None, y: int | None = None, button: str = "left",
+              clicks: int = 1, duration: float = 0.0) -> None:
+        """Click en (x,y) (o donde este el puntero). `duration` = recorrido hasta ahi."""
+
+    @abstractmethod
+    def key_down(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def key_up(self, key: str) -> None:
+        ...
+
+    def press(self, key: str, presses: int = 1, interval: float = 0.0) -> None:
+        for i in range(presses):
+            self.key_down(key)
+            self.key_up(key)
+            if interval and i < presses - 1:
+                wait.pause(interval, f"input.{self.name}.press")
+
+    def hotkey(self, *keys: str) -> None:
+        for k in keys:
+            self.key_down(k)
+        for k in reversed(keys):
+            self.key_up(k)
+
+    def type(self, text: str, interval: float = 0.0) -> None:
+        for ch in text:
+            self.press(ch)
+            if interval:
+                wait.pause(interval, f"input.{self.name}.type")
+
+    def sin_failsafe(self) -> ContextManager[None]:
+        """Desactiva el failsafe de esquinas si el driver tiene uno."""
+        return nullcontext()
+
+
+# ── pyautogui ──────────────────────────────────────────────────────────────────
+class _PyautoguiDriver(InputDriver):
+    name = "pyautogui"
+
+    def __init__(self) -> None:
+        if not _HAS_PYAUTOGUI:
+            raise RuntimeError("pyautogui no instalado")
+        self._pg = pg
+
+    def size(self) -> tuple[int, int] | None:
+        try:
+            w, h = self._pg.size()
+            return int(w), int(h)
+        except Exception:
+            return None
+
+    def move(self, x: int, y: int, duration: float = 0.0) -> None:
+        self._pg.moveTo(x, y, duration=duration)
+
+    def click(self, x: int | None = None, y: int | None = None, button: str = "left",
+              clicks: int = 1, duration: float = 0.0) -> None:
+        if x is not None and y is not None and duration > 0:
+            self._pg.moveTo(x, y, duration=duration)
+            x = y = None
+        kwargs: dict[str, Any] = {} if button == "left" else {"button": button}
+        if clicks != 1:
+            kwargs["clicks"] = clicks
+        if x is not None and y is not None:
+            self._pg.click(x, y, **kwargs)
+        else:
+            self._pg.click(**kwargs)
+
+    def key_down(self, key: str) -> None:
+        self._pg.keyDown(key)
+
+    def key_up(self, key: str) -> None:
+        self._pg.keyUp(key)
+
+    def press(self, key: str, presses: int = 1, interval: float = 0.0) -> None:
+        if presses == 1:
+            self._pg.press(key)
+            return
+        try:
+            self._pg.press(key, presses=presses, interval=interval)
+        except TypeError:
+            super().press(key, presses, interval)
+
+    def hotkey(self, *keys: str) -> None:
+        self._pg.hotkey(*keys)
+
+    def type(self, text: str, interval: float = 0.0) -> None:
+        self._pg.typewrite(text, interval=interval)
+
+    @contextmanager
+    def sin_failsafe(self) -> Iterator[None]:
+        old = getattr(self._pg, "FAILSAFE", True)
+        try:
+            self._pg.FAILSAFE = False
+            yield
+        finally:
+            self._pg.FAILSAFE = old
+
+
+# ── pynput ─────────────────────────────────────────────────────────────────────
+_PYNPUT_KEYS = {"ctrl": "ctrl_l", "alt": "alt_l", "shift": "shift_l", "win": "cmd", "escape": "esc",
+                "return": "enter", "pageup": "page_up", "pagedown": "page_down", "pgup": "page_up",
+                "pgdn": "page_down"}
+
+
+class _PynputDriver(InputDriver):
+    name = "pynput"
+
+    def __init__(self) -> None:
+        from pynput import keyboard as pk, mouse as pm
+        self._mouse = pm.Controller()
+        self._kb = pk.Controller()
+        self._Button, self._Key = pm.Button, pk.Key
+
+    def _key(self, key: str) -> Any:
+        if len(key) == 1:
+            return key
+        return getattr(self._Key, _PYNPUT_KEYS.get(key, key))
+
+    def move(self, x: int, y: int, duration: float = 0.0) -> None:
+        self._mouse.position = (x, y)
+
+    def click(self, x: int | None = None, y: int | None = None, button: str = "left",
+              clicks: int = 1, duration: float = 0.0) -> None:
+        if x is not None and y is not None:
+            self._mouse.position = (x, y)
+        self._mouse.click(getattr(self._Button, button), clicks)
+
+    def key_down(self, key: str) -> None:
+        self._kb.press(self._key(key))
+
+    def key_up(self, key: str) -> None:
+        self._kb.release(self._key(key))
+
+    def type(self, text: str, interval: float = 0.0) -> None:
+        if interval:
+            super().type(text, interval)
+        else:
+            self._kb.type(text)
+
+
+# ── XTest ──────────────────────────────────────────────────────────────────────
+_XK_NOMBRES = {
+    "enter": "Return", "return": "Return", "tab": "Tab", "esc": "Escape", "escape": "Escape",
+    "backspace": "BackSpace", "delete": "Delete", "del": "Delete", "insert": "Insert",
+    "space": "space", "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+    "home": "Home", "end": "End", "pageup": "Prior", "pagedown": "Next", "pgup": "Prior",
+    "pgdn": "Next", "ctrl": "Control_L", "ctrlleft": "Control_L", "ctrlright": "Control_R",
+    "alt": "Alt_L", "altleft": "Alt_L", "altright": "Alt_R", "shift": "Shift_L",
+    "shiftleft": "Shift_L", "shiftright": "Shift_R", "win": "Super_L",
+    "\n": "Return", "\t": "Tab", " ": "space",
+}
+_BOTONES_X = {"left": 1, "middle": 2, "right": 3}
+
+
+class _XTestDriver(InputDriver):
+    """Eventos sinteticos via la extension XTEST (un Display por proceso).
+
+    Cada accion encola sus eventos y hace un solo sync: un click son 3
+    requests (warp, press, release) y un texto entero viaja en un lote.
+    """
+    name = "xtest"
+
+    def __init__(self) -> None:
+        from Xlib import X, XK
+        from Xlib import display as xdisplay
+        from Xlib.ext import xtest
+
+        self._X, self._XK, self._xtest = X, XK, xtest
+        self._d = xdisplay.Display()
+        if not self._d.has_extension("XTEST"):
+            raise RuntimeError("el servidor X no tiene XTEST")
+        self._lock = threading.Lock()
+        self._cache: dict[str, tuple[int, bool]] = {}
+        self._shift = self._keycode("shift")[0]
+
+    def _keycode(self, key: str) -> tuple[int, bool]:
+        """(keycode, necesita shift) para un nombre de tecla o caracter."""
+        hit = self._cache.get(key)
+        if hit is not None:
+            return hit
+        nombre = _XK_NOMBRES.get(key if len(key) == 1 else key.lower())
+        if nombre is None and len(key) > 1 and key[0] in "fF" and key[1:].isdigit():
+            nombre = key.upper()
+        keysym = self._XK.string_to_keysym(nombre or key)
+        if not keysym and len(key) == 1 and ord(key) < 0x100:
+            keysym = ord(key)  # Latin-1: keysym == codepoint
+        code = self._d.keysym_to_keycode(keysym) if keysym else 0
+        if not code:
+            raise ValueError(f"tecla sin keycode en este servidor X: {key!r}")
+        shift = len(key) == 1 and self._d.keycode_to_keysym(code, 0) != keysym
+        self._cache[key] = (code, shift)
+        return code, shift
+
+    def _fake(self, tipo: int, detalle: int, x: int = 0, y: int = 0) -> None:
+        if tipo == self._X.MotionNotify:
+            self._xtest.fake_input(self._d, tipo, x=x, y=y)
+        else:
+            self._xtest.fake_input(self._d, tipo, detalle)
+
+    def size(self) -> tuple[int, int] | None:
+        s = self._d.screen()
+        return int(s.width_in_pixels), int(s.height_in_pixels)
+
+    def move(self, x: int, y: int, duration: float = 0.0) -> None:
+        with self._lock:
+            self._fake(self._X.MotionNotify, 0, x, y)
+            self._d.sync()
+
+    def click(self, x: int | None = None, y: int | None = None, button: str = "left",
+              clicks: int = 1, duration: float = 0.0) -> None:
+        boton = _BOTONES_X[button]
+        with self._lock:
+            if x is not None and y is not None:
+                self._fake(self._X.MotionNotify, 0, x, y)
+            for _ in range(clicks):
+                self._fake(self._X.ButtonPress, boton)
+                self._fake(self._X.ButtonRelease, boton)
+            self._d.sync()
+
+    def _teclas(self, keys: list[str], soltar: bool = True) -> None:
+        """Encola press (y release) de cada tecla, con shift si el caracter lo pide."""
+        for key in keys:
+            code, shift = self._keycode(key)
+            if shift:
+                self._fake(self._X.KeyPress, self._shift)
+            self._fake(self._X.KeyPress, code)
+            if soltar:
+                self._fake(self._X.KeyRelease, code)
+            if shift:
+                self._fake(self._X.KeyRelease, self._shift)
+
+    def key_down(self, key: str) -> None:
+        with self._lock:
+            self._fake(self._X.KeyPress, self._keycode(key)[0])
+            self._d.sync()
+
+    def key_up(self, key: str) -> None:
+        with self._lock:
+            self._fake(self._X.KeyRelease, self._keycode(key)[0])
+            self._d.sync()
+
+    def press(self, key: str, presses: int = 1, interval: float = 0.0) -> None:
+        if interval and presses > 1:
+            super().press(key, presses, interval)
+            return
+        with self._lock:
+            self._teclas([key] * presses)
+            self._d.sync()
+
+    def hotkey(self, *keys: str) -> None:
+        codes = [self._keycode(k)[0] for k in keys]
+        with self._lock:
+            for c in codes:
+                self._fake(self._X.KeyPress, c)
+            for c in reversed(codes):
+                self._fake(self._X.KeyRelease, c)
+            self._d.sync()
+
+    def type(self, text: str, interval: float = 0.0) -> None:
+        if interval:
+            super().type(text, interval)
+            return
+        with self._lock:
+            self._teclas(list(text))
+            self._d.sync()
+
+
+# ── Fake (tests / harness sin T3) ──────────────────────────────────────────────
+class FakeDriver(InputDriver):
+    """No toca la pantalla: cada evento queda en `eventos` como tupla."""
+    name = "fake"
+
+    def __init__(self, size: tuple[int, int] = (1920, 1080)) -> None:
+        self._size = size
+        self.pos = (0, 0)
+        self.eventos: list[tuple[Any, ...]] = []
+
+    def size(self) -> tuple[int, int] | None:
+        return self._size
+
+    def move(self, x: int, y: int, duration: float = 0.0) -> None:
+        self.pos = (x, y)
+        self.eventos.append(("move", x, y))
+
+    def click(self, x: int | None = None, y: int | None = None, button: str = "left",
+              clicks: int = 1, duration: float = 0.0) -> None:
+        if x is not None and y is not None:
+            self.pos = (x, y)
+        self.eventos.append(("click", self.pos[0], self.pos[1], button, clicks))
+
+    def key_down(self, key: str) -> None:
+        self.eventos.append(("key_down", key))
+
+    def key_up(self, key: str) -> None:
+        self.eventos.append(("key_up", key))
+
+    def press(self, key: str, presses: int = 1, interval: float = 0.0) -> None:
+        self.eventos.extend([("press", key)] * presses)
+
+    def hotkey(self, *keys: str) -> None:
+        self.eventos.append(("hotkey",) + keys)
+
+    def type(self, text: str, interval: float = 0.0) -> None:
+        self.eventos.append(("type", text))
+
+
+# ── Seleccion ──────────────────────────────────────────────────────────────────
+_DRIVERS = {"pyautogui": _PyautoguiDriver, "pynput": _PynputDriver, "xtest": _XTestDriver, "fake": FakeDriver}
+_driver: InputDriver | None = None
+_driver_lock = threading.Lock()
+
+
+def _crear(nombre: str) -> InputDriver:
+    if nombre == "auto":
+        nombre = "xtest" if sys.platform.startswith("linux") and os.getenv("DISPLAY") else "pyautogui"
+    cls = _DRIVERS.get(nombre)
+    if cls is None:
+        print(f"[input] WARN INPUT_DRIVER={nombre!r} desconocido, uso pyautogui")
+        return _PyautoguiDriver()
+    try:
+        return cls()
+    except Exception as e:
+        if cls is _PyautoguiDriver:
+            raise
+        print(f"[input] WARN driver {nombre} no disponible ({e}), uso pyautogui")
+        return _PyautoguiDriver()
+
+
+def driver() -> InputDriver:
+    """Driver del proceso (se crea en el primer uso segun INPUT_DRIVER)."""
+    global _driver
+    with _driver_lock:
+        if _driver is None:
+            _driver = _crear(INPUT_DRIVER)
+            if _driver.name != "pyautogui":
+                print(f"[input] driver {_driver.name}")
+        return _driver
+
+
+def usar(nuevo: InputDriver | str) -> InputDriver:
+    """Reemplaza el driver del proceso (ej. `usar("fake")` en un harness)."""
+    global _driver
+    with _driver_lock:
+        _driver = _crear(nuevo) if isinstance(nuevo, str) else nuevo
+        return _driver
@@ -7,20 +7,102 @@ marcadores; van a stdout con prefijo [CaminoX] y los lee solo el operador.
 from __future__ import annotations
 
 import json
+import re
 import sys
 import time
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from shared import autotune, tracing, wait
 
 PARTIAL_START = "===JSON_PARTIAL_START==="
 PARTIAL_END = "===JSON_PARTIAL_END==="
 RESULT_START = "===JSON_RESULT_START==="
 RESULT_END = "===JSON_RESULT_END==="
 
+# Fase final de un camino: ya tiene el resultado y solo cierra tabs / vuelve a home.
+# El worker la usa para pedir la proxima tarea por adelantado.
+FASE_CIERRE = "cerrar_y_home"
+
+# Claves internas que camino_score agrega a su resultado para que las deudas
+# sigan desde la pantalla del cliente; el orquestador las saca antes de emitir.
+CLAVES_REUSO = ("en_cliente", "tabla_ver_todos", "fa_data")
+
 
 def now_ms() -> int:
     return int(time.time() * 1000)
 
 
+def score_num(score: object) -> int | None:
+    """Primer numero del score ('80', 'Score: 80') como int, o None."""
+    m = re.search(r"\d+", str(score))
+    return int(m.group(0)) if m else None
+
+
+class Captura:
+    """Destino en memoria de lo que emite un camino ejecutado in-process.
+
+    Mientras hay una captura activa (ver `capturar`), los partials y marcadores
+    van a los callbacks en vez de a stdout y el resultado final queda en
+    `result` como dict (sin pasar por JSON).
+    """
+
+    def __init__(
+        self,
+        on_partial: Callable[[dict[str, Any]], None] | None = None,
+        on_marker: Callable[[str, dict[str, Any]], None] | None = None,
+        solo_resultado: bool = False,
+    ) -> None:
+        self.on_partial = on_partial
+        self.on_marker = on_marker
+        self.solo_resultado = solo_resultado
+        self.result: dict[str, Any] | None = None
+
+
+_capturas: list[Captura] = []
+
+
+@contextmanager
+def capturar(
+    on_partial: Callable[[dict[str, Any]], None] | None = None,
+    on_marker: Callable[[str, dict[str, Any]], None] | None = None,
+) -> Iterator[Captura]:
+    """Redirige send_partial / emit_marker / print_json_result a una Captura."""
+    captura = Captura(on_partial, on_marker)
+    _capturas.append(captura)
+    try:
+        yield captura
+    finally:
+        _capturas.remove(captura)
+
+
+@contextmanager
+def capturar_resultado() -> Iterator[Captura]:
+    """Solo retiene el resultado final; partials y marcadores siguen de largo.
+
+    Para un camino que llama a otro y necesita su resultado como dict (ej.
+    camino_score_deudas) sin cortar el stream hacia el worker.
+    """
+    captura = Captura(solo_resultado=True)
+    _capturas.append(captura)
+    try:
+        yield captura
+    finally:
+        _capturas.remove(captura)
+
+
+def _captura_activa() -> Captura | None:
+    return _capturas[-1] if _capturas else None
+
+
+def _captura_emision() -> Captura | None:
+    """Captura que recibe partials/marcadores (salta las de solo resultado)."""
+    for captura in reversed(_capturas):
+        if not captura.solo_resultado:
+            return captura
+    return None
+
+
 def send_partial(
     identifier: str,
     etapa: str,
@@ -43,19 +125,65 @@ def send_partial(
         payload["admin_mode"] = True
     if extra_data:
         payload.update(extra_data)
+    tracing.instant(etapa, "etapa")
+    captura = _captura_emision()
+    if captura is not None:
+        if captura.on_partial is not None:
+            captura.on_partial(payload)
+        return
     print(PARTIAL_START, flush=True)
     print(json.dumps(payload, ensure_ascii=False), flush=True)
     print(PARTIAL_END, flush=True)
 
 
 def print_json_result(data: dict[str, Any]) -> None:
-    """Emite el resultado final de un camino."""
+    """Emite el resultado final de un camino.
+
+    Cierra la traza y la contabilidad de esperas de la tarea (ver
+    `adjuntar_diagnostico`).
+    """
+    captura = _captura_activa()
+    if captura is not None:
+        captura.result = data
+        return
+    data = adjuntar_diagnostico(data)
     print(RESULT_START, flush=True)
     print(json.dumps(data, ensure_ascii=False), flush=True)
     print(RESULT_END, flush=True)
     sys.stdout.flush()
 
 
+def adjuntar_diagnostico(data: dict[str, Any]) -> dict[str, Any]:
+    """Cierra traza (TRACE_DIR) y esperas (WAIT_REPORT) de la tarea y las agrega al resultado.
+
+    Tambien guarda el perfil de AUTOTUNE aprendido durante la tarea.
+    """
+    trace = tracing.finish()
+    if trace:
+        data = {**data, "trace": trace}
+    waits = wait.finish()
+    if waits:
+        data = {**data, "waits": waits}
+    autotune.guardar()
+    return data
+
+
+def emit_marker(tag: str, payload: dict[str, Any]) -> None:
+    """Emite un marcador de progreso `[TAG] {json}` (ej. CUENTAS_TOTAL, CUENTA_ITEM)."""
+    captura = _captura_emision()
+    if captura is not None:
+        if captura.on_marker is not None:
+            captura.on_marker(tag, payload)
+        return
+    print(f"[{tag}] {json.dumps(payload, ensure_ascii=False)}", flush=True)
+
+
+def emit_fase(fase: str, **extra: Any) -> None:
+    """Emite `[FASE] {"fase": ...}` para avisar al worker en que etapa esta el camino."""
+    tracing.instant(fase, "fase")
+    emit_marker("FASE", {"fase": fase, **extra})
+
+
 def parse_json_from_markers(output: str, strict: bool = True) -> dict[str, Any] | None:
     """Extrae el JSON entre RESULT_START/END de un stdout capturado.
 
@@ -1,9 +1,10 @@
-"""Wrappers de teclado (pyautogui + pynput fallback)."""
+"""Wrappers de teclado (driver de shared.input_driver + pynput fallback)."""
 from __future__ import annotations
 
-import time
+import os
 
-import pyautogui as pg
+from shared import clipboard, input_driver, mouse, wait
+from shared.tracing import traced
 
 try:
     from pynput.keyboard import Controller as KBController, Key as KBKey
@@ -13,97 +14,141 @@ except Exception:
     KBController = None  # type: ignore
     KBKey = None  # type: ignore
 
+FIELD_PASTE = os.getenv("FIELD_PASTE", "1").lower() in ("1", "true", "yes", "on")
+FIELD_VERIFY_S = float(os.getenv("FIELD_VERIFY_S", "0.5"))  # techo de la copia de verificacion
 
+
+@traced("keyboard")
 def type_text(text: str, delay_after: float = 0.3, interval: float = 0.05) -> None:
     """Escribe texto char por char."""
-    pg.typewrite(text, interval=interval)
-    time.sleep(delay_after)
+    input_driver.driver().type(text, interval=input_driver.type_interval(interval))
+    wait.pause(delay_after)
 
 
+@traced("keyboard")
 def press_enter(delay_after: float = 0.3) -> None:
-    pg.press("enter")
-    time.sleep(delay_after)
+    input_driver.driver().press("enter")
+    wait.pause(delay_after)
 
 
+@traced("keyboard")
 def press_key(key: str, delay_after: float = 0.15, times: int = 1) -> None:
     for _ in range(times):
-        pg.press(key)
+        input_driver.driver().press(key)
         if times > 1:
-            time.sleep(0.08)
-    time.sleep(delay_after)
+            wait.pause(0.08)
+    wait.pause(delay_after)
 
 
+@traced("keyboard")
 def hotkey(*keys: str, delay_after: float = 0.2) -> None:
-    pg.hotkey(*keys)
-    time.sleep(delay_after)
+    input_driver.driver().hotkey(*keys)
+    wait.pause(delay_after)
 
 
 def _send_key_presses(key_name: str, pynput_key, count: int, interval: float, use_pynput: bool) -> None:
-    if use_pynput and _HAS_PYNPUT and pynput_key is not None:
+    drv = input_driver.driver()
+    # pynput evita issues en RDP con pyautogui; los otros drivers ya mandan eventos directos
+    if use_pynput and _HAS_PYNPUT and pynput_key is not None and drv.name == "pyautogui":
         kb = KBController()
         for _ in range(count):
             kb.press(pynput_key)
-            time.sleep(0.04)
+            wait.pause(0.04)
             kb.release(pynput_key)
-            time.sleep(interval)
+            wait.pause(interval)
         return
-    try:
-        pg.press(key_name, presses=count, interval=interval)
-    except TypeError:
-        for _ in range(count):
-            pg.press(key_name)
-            time.sleep(interval)
+    drv.press(key_name, presses=count, interval=interval)
 
 
+@traced("keyboard")
 def send_down_presses(count: int, interval: float = 0.15, use_pynput: bool = True) -> None:
     """Flecha abajo N veces (pynput evita issues en RDP)."""
     key = KBKey.down if _HAS_PYNPUT else None
     _send_key_presses("down", key, count, interval, use_pynput)
 
 
+@traced("keyboard")
 def send_right_presses(count: int, interval: float = 0.15, use_pynput: bool = True) -> None:
     key = KBKey.right if _HAS_PYNPUT else None
     _send_key_presses("right", key, count, interval, use_pynput)
 
 
+@traced("keyboard")
 def send_left_presses(count: int, interval: float = 0.15, use_pynput: bool = True) -> None:
     key = KBKey.left if _HAS_PYNPUT else None
     _send_key_presses("left", key, count, interval, use_pynput)
 
 
+@traced("keyboard")
 def hold_backspace(seconds: float) -> None:
     """Mantiene Backspace apretado por 'seconds' segundos (limpieza de campo)."""
-    pg.keyDown("backspace")
+    input_driver.driver().key_down("backspace")
     try:
-        time.sleep(seconds)
+        wait.pause(seconds)
     finally:
-        pg.keyUp("backspace")
+        input_driver.driver().key_up("backspace")
 
 
+@traced("keyboard")
 def clear_field_combo(delay: float = 0.3) -> None:
     """Ctrl+A + Delete (limpieza alternativa)."""
-    pg.hotkey("ctrl", "a")
-    time.sleep(0.1)
-    pg.press("delete")
-    time.sleep(delay)
+    input_driver.driver().hotkey("ctrl", "a")
+    wait.pause(0.1)
+    input_driver.driver().press("delete")
+    wait.pause(delay)
 
 
+@traced("keyboard")
 def clear_field_bruteforce(x: int, y: int, passes: int = 2, backspaces: int = 3) -> None:
     """Ritual de limpieza usado en camino_b: 2 clicks + delete + backspace, luego re-click + N backspaces."""
-    pg.click(x, y)
-    time.sleep(0.15)
-    pg.click()
-    time.sleep(0.08)
-    pg.click()
-    time.sleep(0.15)
-    pg.press("delete")
-    time.sleep(0.4)
-    pg.press("backspace")
-    time.sleep(0.15)
+    input_driver.driver().click(x, y)
+    wait.pause(0.15)
+    input_driver.driver().click()
+    wait.pause(0.08)
+    input_driver.driver().click()
+    wait.pause(0.15)
+    input_driver.driver().press("delete")
+    wait.pause(0.4)
+    input_driver.driver().press("backspace")
+    wait.pause(0.15)
     for _ in range(passes - 1):
-        pg.click(x, y)
-        time.sleep(0.15)
+        input_driver.driver().click(x, y)
+        wait.pause(0.15)
         for _ in range(backspaces):
-            pg.press("backspace")
-            time.sleep(0.08)
-        time.sleep(0.15)
+            input_driver.driver().press("backspace")
+            wait.pause(0.08)
+        wait.pause(0.15)
+
+
+@traced("keyboard")
+def set_field(x: int, y: int, text: str, label: str, delay_after: float = 0.2) -> bool:
+    """Deja `text` en el campo (x,y): click, Ctrl+A, pegar y verificar copiando de vuelta.
+
+    True si la copia de vuelta coincide. False (FIELD_PASTE=0, `text` vacio,
+    clipboard que no se pudo vaciar o copia que no coincide): el campo queda
+    con foco y el llamador sigue con el metodo viejo (tipear encima o el
+    ritual de limpieza). Un campo vacio no se puede verificar (copiarlo no
+    cambia el clipboard), por eso borrar queda para el ritual.
+    """
+    mouse.click(x, y, label, 0.2)
+    if not FIELD_PASTE or not text:
+        return False
+    drv = input_driver.driver()
+    drv.hotkey("ctrl", "a")
+    clipboard.set_text(text)
+    drv.hotkey("ctrl", "v")
+    wait.pause(0.05, f"keyboard.set_field:{label}")
+
+    drv.hotkey("ctrl", "a")
+    marca = clipboard.sentinel(clear_first=True)
+    if clipboard.get_text():
+        # sigue el texto pegado: una copia fallida se leeria como verificada
+        print(f"[keyboard] WARN set_field {label}: no se pudo vaciar el clipboard, sin verificar")
+        return False
+    drv.hotkey("ctrl", "c")
+    leido = clipboard.wait_change(marca, FIELD_VERIFY_S, f"keyboard.set_field:{label}")
+    if leido.strip() != text.strip():
+        print(f"[keyboard] WARN set_field {label}: el campo tiene {leido.strip()[:40]!r}, esperaba {text!r}")
+        return False
+    wait.pause(delay_after)
+    return True
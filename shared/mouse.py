@@ -1,74 +1,79 @@
-"""Wrappers de mouse sobre pyautogui con logging uniforme."""
+"""Wrappers de mouse con logging uniforme (driver de shared.input_driver, pyautogui por default)."""
 from __future__ import annotations
 
-import time
-from contextlib import contextmanager
+from typing import ContextManager
 
-import pyautogui as pg
+from shared import autotune, input_driver, wait
+from shared.tracing import traced
 
 
-@contextmanager
-def suppress_failsafe():
+def suppress_failsafe() -> ContextManager[None]:
     """Desactiva FAILSAFE temporalmente (esquinas no abortan)."""
-    old = getattr(pg, "FAILSAFE", True)
-    try:
-        pg.FAILSAFE = False
-        yield
-    finally:
-        pg.FAILSAFE = old
+    return input_driver.driver().sin_failsafe()
 
 
 def _screen_clamp(x: int, y: int) -> tuple[int, int]:
-    try:
-        w, h = pg.size()
-    except Exception:
+    size = input_driver.driver().size()
+    if size is None:
         return x, y
+    w, h = size
     return max(1, min(x, w - 2)), max(1, min(y, h - 2))
 
 
+@traced("mouse")
 def click(x: int, y: int, label: str, delay: float = 0.25, move_duration: float = 0.12) -> None:
     """Click izquierdo en (x,y). Si (0,0): warning y no-op."""
     if x and y:
         sx, sy = _screen_clamp(x, y)
         print(f"[mouse] Click {label} ({sx},{sy})")
         with suppress_failsafe():
-            pg.moveTo(sx, sy, duration=move_duration)
-            pg.click()
+            input_driver.driver().click(sx, sy, duration=input_driver.move_s(move_duration))
+        usado = autotune.delay(label, delay)
+        autotune.pendiente(label, delay, usado)
+        delay = usado
     else:
         print(f"[mouse] WARN coordenadas {label}=(0,0)")
-    time.sleep(delay)
+    wait.pause(delay, f"mouse.click:{label}")
 
 
+@traced("mouse")
 def right_click(x: int, y: int, label: str, delay: float = 0.25, move_duration: float = 0.12) -> None:
     if x and y:
         sx, sy = _screen_clamp(x, y)
         print(f"[mouse] Right-click {label} ({sx},{sy})")
         with suppress_failsafe():
-            pg.moveTo(sx, sy, duration=move_duration)
-            pg.click(button="right")
+            input_driver.driver().click(sx, sy, button="right", duration=input_driver.move_s(move_duration))
+        usado = autotune.delay(label, delay)
+        autotune.pendiente(label, delay, usado)
+        delay = usado
     else:
         print(f"[mouse] WARN coordenadas {label}=(0,0)")
-    time.sleep(delay)
+    wait.pause(delay, f"mouse.right_click:{label}")
 
 
+@traced("mouse")
 def double_click(x: int, y: int, label: str, delay: float = 0.25, interval: float = 0.0) -> None:
     """Doble click. 'interval' = segundos entre los 2 clicks (0 usa doubleClick nativo)."""
     if x and y:
         sx, sy = _screen_clamp(x, y)
         print(f"[mouse] Double-click {label} ({sx},{sy})")
         with suppress_failsafe():
-            pg.moveTo(sx, sy, duration=0.12)
+            drv = input_driver.driver()
             if interval > 0:
-                pg.click()
-                time.sleep(interval)
-                pg.click()
+                drv.click(sx, sy, duration=input_driver.move_s(0.12))
+                wait.pause(interval, f"mouse.double_click:{label}")
+                drv.click()
             else:
-                pg.doubleClick()
+                drv.click(sx, sy, clicks=2, duration=input_driver.move_s(0.12))
+        usado = autotune.delay(label, delay)
+        autotune.pendiente(label, delay, usado)
+        delay = usado
     else:
         print(f"[mouse] WARN coordenadas {label}=(0,0)")
-    time.sleep(delay)
+    wait.pause(delay, f"mouse.double_click:{label}")
 
 
+@traced("mouse")
 def multi_click(
     x: int,
     y: int,
@@ -84,8 +89,9 @@ def multi_click(
     sx, sy = _screen_clamp(x, y)
     print(f"[mouse] Multi-click {label} x{times} ({sx},{sy}) button={button}")
     with suppress_failsafe():
-        pg.moveTo(sx, sy, duration=0.0)
+        drv = input_driver.driver()
+        drv.move(sx, sy)
         for i in range(times):
-            pg.click(button=button)
+            drv.click(button=button)
             if interval and i < times - 1:
-                time.sleep(interval)
+                wait.pause(interval, f"mouse.multi_click:{label}")
@@ -0,0 +1,351 @@
+"""Planes de acciones declarativos: pasos de UI como datos + un ejecutor unico.
+
+Un plan es un JSON (o dict) con una lista de pasos:
+
+    {"nombre": "entrada", "delay": 0.3, "pasos": [
+      {"accion": "click", "punto": "entrada.cliente_section1", "delay": 0.5,
+       "esperar": {"region": "estabilidad.validar", "timeout": 2.0}},
+      {"accion": "type", "texto": "{dni}"},
+      {"accion": "key", "tecla": "enter", "esperar": {"pantalla": "cliente", "timeout": 5}},
+      {"accion": "copy", "punto": "score.copy_menu_option", "guardar": "score",
+       "esperar": {"clipboard": 1.5}, "reintentos": 2},
+      {"accion": "expect", "esperar": {"pantalla": "score"}}
+    ]}
+
+Acciones: click, right_click, double_click (en `punto` de coords.json o en
+`x`/`y`), type (`texto`, con {variables}), key (`tecla`, "ctrl+c" = hotkey),
+copy (click en `punto` o Ctrl+C; el texto queda en `guardar`) y expect (solo
+la condicion de espera).
+
+Condiciones (`esperar`), todas con techo `timeout` escalado por SLEEP_SCALE:
+  - region: wait_until_stable de una region (hash tomado antes de la accion;
+    sin calibrar = se espera el techo como demora fija y sigue)
+  - clipboard: llego texto al clipboard (se vacia antes de la accion)
+  - pantalla: screen_state reconoce esa pantalla (sin firmas = no se sabe, sigue)
+
+El ejecutor centraliza lo que hoy esta repartido en cada camino:
+  - tiempos: `delay` del paso, o el del plan; todos pasan por wait.pause con
+    sitio `plan:<nombre>:<n>` (se ven en el resumen de WAIT_REPORT) y se
+    multiplican por PLAN_DELAY_SCALE ademas de SLEEP_SCALE.
+  - reintentos: si la condicion no se cumple se repite el paso `reintentos`
+    veces; despues PlanError (o sigue, con "opcional": true).
+  - trazas: un span por plan y uno por paso (TRACE_DIR).
+
+`python -m shared.plan compilar camino.json` convierte una grabacion de
+record_camino.py en un borrador de plan (ver `compilar_grabacion`).
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from shared import capture, clipboard, coords, keyboard, mouse, screen_state, tracing, wait
+
+PLAN_DELAY_SCALE = float(os.getenv("PLAN_DELAY_SCALE", "1.0"))
+PLAN_SNAP_PX = int(os.getenv("PLAN_SNAP_PX", "6"))  # distancia max para asociar un click a una clave
+DELAY_DEFAULT = 0.3
+TIMEOUT_DEFAULT = 2.0
+PANTALLA_POLL_S = 0.1
+ACCIONES = ("click", "right_click", "double_click", "type", "key", "copy", "expect")
+
+
+class PlanError(Exception):
+    """Plan mal formado o paso cuya condicion no se cumplio tras los reintentos."""
+
+
+# ── Validacion ─────────────────────────────────────────────────────────────────
+def cargar(path: Path) -> dict[str, Any]:
+    try:
+        plan = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise PlanError(f"no se pudo leer {path}: {e}") from e
+    plan.setdefault("nombre", Path(path).stem)
+    return plan
+
+
+def validar(plan: dict[str, Any], master: dict | None = None) -> list[str]:
+    """Errores del plan (acciones, campos obligatorios, claves de coords)."""
+    errores = []
+    pasos = plan.get("pasos")
+    if not isinstance(pasos, list):
+        return ["'pasos' tiene que ser una lista"]
+    index = getattr(master, "index", None)
+    for n, paso in enumerate(pasos):
+        accion = paso.get("accion")
+        if accion not in ACCIONES:
+            errores.append(f"paso {n}: accion desconocida {accion!r}")
+            continue
+        punto = paso.get("punto")
+        if accion in ("click", "right_click", "double_click") and not (punto or "x" in paso):
+            errores.append(f"paso {n}: {accion} sin 'punto' ni x/y")
+        if accion == "type" and "texto" not in paso:
+            errores.append(f"paso {n}: type sin 'texto'")
+        if accion == "key" and not paso.get("tecla"):
+            errores.append(f"paso {n}: key sin 'tecla'")
+        if accion == "expect" and not paso.get("esperar") and not paso.get("nota"):
+            errores.append(f"paso {n}: expect sin 'esperar'")
+        if index is not None:
+            claves = [punto, (paso.get("esperar") or {}).get("region")]
+            errores += [f"paso {n}: clave '{c}' no esta en coords.json" for c in claves if c and c not in index]
+    return errores
+
+
+# ── Ejecucion ──────────────────────────────────────────────────────────────────
+def _xy(master: dict, paso: dict[str, Any]) -> tuple[int, int]:
+    if paso.get("punto"):
+        return coords.xy(master, paso["punto"])
+    return int(paso.get("x", 0)), int(paso.get("y", 0))
+
+
+def _antes(master: dict, esperar: dict[str, Any]) -> Any:
+    """Marca que necesita la condicion, tomada antes de la accion."""
+    if "region" in esperar:
+        return capture.region_hash(coords.region(master, esperar["region"]))
+    if "clipboard" in esperar:
+        return clipboard.sentinel(clear_first=True)  # copia fallida = '' y no el valor anterior
+    return None
+
+
+def _timeout(esperar: dict[str, Any], clave: str) -> float:
+    valor = esperar.get(clave)
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return float(valor)
+    return float(esperar.get("timeout", TIMEOUT_DEFAULT))
+
+
+def _esperar(master: dict, esperar: dict[str, Any], marca: Any, site: str) -> tuple[bool, str | None]:
+    """(se cumplio, texto copiado si la condicion era de clipboard)."""
+    if "region" in esperar:
+        region = coords.region(master, esperar["region"])
+        estable = capture.wait_until_stable(region, _timeout(esperar, "timeout"), baseline=marca, site=site)
+        # Region sin calibrar (o sin MSS): no hay con que comparar, se espero el
+        # techo como demora fija y se da por cumplida, igual que una pantalla sin firmas
+        return estable or marca is None, None
+    if "clipboard" in esperar:
+        texto = clipboard.wait_change(marca, _timeout(esperar, "clipboard"), site=site)
+        return bool(texto.strip()), texto
+    if "pantalla" in esperar:
+        timeout = _timeout(esperar, "timeout")
+        t0 = time.monotonic()
+        while True:
+            estado = screen_state.en(master, esperar["pantalla"])
+            if estado is None or estado:
+                wait.record(site, time.monotonic() - t0, timeout)
+                return True, None
+            if time.monotonic() - t0 >= timeout * wait.SLEEP_SCALE:
+                wait.record(site, time.monotonic() - t0, timeout)
+                return False, None
+            time.sleep(PANTALLA_POLL_S)
+    return True, None
+
+
+def _accion(master: dict, paso: dict[str, Any], variables: dict[str, Any], label: str) -> None:
+    accion = paso["accion"]
+    if accion in ("click", "right_click", "double_click"):
+        x, y = _xy(master, paso)
+        getattr(mouse, accion)(x, y, label, delay=0)
+    elif accion == "type":
+        keyboard.type_text(str(paso["texto"]).format(**variables), delay_after=0,
+                           interval=float(paso.get("intervalo", 0.05)))
+    elif accion == "key":
+        teclas = str(paso["tecla"]).split("+")
+        if len(teclas) > 1:
+            keyboard.hotkey(*teclas, delay_after=0)
+        else:
+            keyboard.press_key(teclas[0], delay_after=0, times=int(paso.get("veces", 1)))
+    elif accion == "copy":
+        if paso.get("punto") or "x" in paso:
+            x, y = _xy(master, paso)
+            mouse.click(x, y, label, delay=0)
+        else:
+            keyboard.hotkey("ctrl", "c", delay_after=0)
+
+
+def _paso(master: dict, plan: dict[str, Any], n: int, paso: dict[str, Any],
+          variables: dict[str, Any], resultado: dict[str, Any]) -> None:
+    nombre = plan.get("nombre", "plan")
+    accion = paso["accion"]
+    label = paso.get("label") or paso.get("punto") or accion
+    site = f"plan:{nombre}:{n}"
+    esperar = dict(paso.get("esperar") or {})
+    if accion == "copy" and not esperar:
+        esperar = {"clipboard": TIMEOUT_DEFAULT}
+    reintentos = int(paso.get("reintentos", 0))
+
+    for intento in range(reintentos + 1):
+        marca = _antes(master, esperar)
+        if accion != "expect":
+            _accion(master, paso, variables, label)
+        ok, texto = _esperar(master, esperar, marca, f"{site}:esperar")
+        if accion == "copy":
+            texto = texto if texto is not None else clipboard.get_text()
+            if paso.get("guardar"):
+                resultado[paso["guardar"]] = texto
+        if ok:
+            break
+        if intento < reintentos:
+            print(f"[plan:{nombre}] paso {n} ({label}): condicion {esperar} no se cumplio, reintento {intento + 1}/{reintentos}")
+    else:
+        msg = f"paso {n} ({label}): condicion {esperar} no se cumplio"
+        if not paso.get("opcional"):
+            raise PlanError(msg)
+        print(f"[plan:{nombre}] WARN {msg}, sigo (opcional)")
+
+    delay = float(paso.get("delay", plan.get("delay", DELAY_DEFAULT)))
+    wait.pause(delay * PLAN_DELAY_SCALE, site)
+
+
+def ejecutar(plan: dict[str, Any] | Path, master: dict | None = None,
+             variables: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Corre el plan paso a paso. Devuelve lo guardado por los pasos copy."""
+    if not isinstance(plan, dict):
+        plan = cargar(plan)
+    master = master if master is not None else coords.load_master()
+    errores = validar(plan, master)
+    if errores:
+        raise PlanError("plan invalido: " + "; ".join(errores))
+    nombre = plan.get("nombre", "plan")
+    variables = variables or {}
+    resultado: dict[str, Any] = {}
+    print(f"[plan:{nombre}] {len(plan['pasos'])} pasos")
+    with tracing.span(f"plan:{nombre}", cat="plan"):
+        for n, paso in enumerate(plan["pasos"]):
+            with tracing.span(f"{n}:{paso['accion']}", cat="plan", label=paso.get("label") or paso.get("punto")):
+                _paso(master, plan, n, paso, variables, resultado)
+    return resultado
+
+
+# ── Compilador de grabaciones (record_camino.py) ───────────────────────────────
+_MODIFICADORES = {"Key.ctrl": "ctrl", "Key.alt": "alt", "Key.shift": "shift", "Key.cmd": "win"}
+_DOBLE_CLICK_S = 0.4
+
+
+def _clave_cercana(master: dict | None, x: int, y: int) -> str | None:
+    """Clave de coords.json (punto, no region) mas cercana a (x,y) dentro de PLAN_SNAP_PX."""
+    mejor, dist = None, float(PLAN_SNAP_PX) + 0.5
+    for key, rec in getattr(master, "index", {}).items():
+        if isinstance(rec, coords.Region):
+            continue
+        d = math.hypot(rec.x - x, rec.y - y)
+        if d < dist:
+            mejor, dist = key, d
+    return mejor
+
+
+def _tecla(key: str) -> str:
+    return key[4:] if key.startswith("Key.") else key
+
+
+def _caracter_de_control(key: str) -> str:
+    """pynput en Windows reporta Ctrl+letra como el caracter de control (\\x03 = c)."""
+    if len(key) == 1 and 1 <= ord(key) <= 26:
+        return chr(ord(key) + 96)
+    return key
+
+
+def compilar_grabacion(data: dict[str, Any], master: dict | None = None, nombre: str = "borrador") -> dict[str, Any]:
+    """Convierte el camino.json de record_camino.py en un borrador de plan.
+
+    - Cada click (evento pressed) es un paso; dos clicks izquierdos en el mismo
+      lugar en menos de 0.4s son un double_click. Si hay una clave de
+      coords.json a PLAN_SNAP_PX o menos se usa `punto`, si no x/y.
+    - Las teclas de caracter seguidas se juntan en un solo type; modificador +
+      tecla es un key "ctrl+x" (Ctrl+C se vuelve copy), tambien cuando pynput
+      la reporta como caracter de control; el resto, key.
+    - Los marcadores ESC quedan como expect sin condicion, para completar.
+    - `delay` de cada paso = lo que espero el operador hasta el siguiente
+      (redondeado a 0.05s). Es un borrador: las esperas largas conviene
+      reemplazarlas por `esperar`.
+    """
+    pasos: list[dict[str, Any]] = []
+    tiempos: list[float] = []
+    apretados: list[str] = []  # modificadores abajo, en orden
+
+    def agregar(t: float, paso: dict[str, Any]) -> None:
+        pasos.append(paso)
+        tiempos.append(t)
+
+    for ev in data.get("events", []):
+        t, tipo = float(ev.get("t", 0.0)), ev.get("type")
+        if tipo == "mouse_click" and ev.get("pressed"):
+            x, y = int(ev.get("x", 0)), int(ev.get("y", 0))
+            derecho = "right" in str(ev.get("button", ""))
+            previo = pasos[-1] if pasos else None
+            if (not derecho and previo and previo["accion"] == "click" and t - tiempos[-1] <= _DOBLE_CLICK_S
+                    and previo.get("_xy") == (x, y)):
+                previo["accion"] = "double_click"
+                continue
+            paso: dict[str, Any] = {"accion": "right_click" if derecho else "click", "_xy": (x, y)}
+            clave = _clave_cercana(master, x, y)
+            if clave:
+                paso["punto"] = clave
+            else:
+                paso.update(x=x, y=y)
+            agregar(t, paso)
+        elif tipo == "key_down":
+            key = str(ev.get("key", ""))
+            if key in _MODIFICADORES:
+                if _MODIFICADORES[key] not in apretados:
+                    apretados.append(_MODIFICADORES[key])
+                continue
+            if apretados:
+                key = _caracter_de_control(key)
+            mods = [m for m in apretados if m != "shift" or len(key) != 1]
+            if mods:
+                combo = "+".join(mods + [_tecla(key).lower()])
+                agregar(t, {"accion": "copy"} if combo == "ctrl+c" else {"accion": "key", "tecla": combo})
+            elif len(key) == 1:
+                previo = pasos[-1] if pasos else None
+                if previo and previo["accion"] == "type":
+                    previo["texto"] += key
+                    tiempos[-1] = t
+                else:
+                    agregar(t, {"accion": "type", "texto": key})
+            else:
+                agregar(t, {"accion": "key", "tecla": _tecla(key)})
+        elif tipo == "key_up":
+            mod = _MODIFICADORES.get(str(ev.get("key", "")))
+            if mod in apretados:
+                apretados.remove(mod)
+        elif tipo == "marker":
+            agregar(t, {"accion": "expect", "nota": f"marcador {ev.get('name', '')}: completar 'esperar'"})
+
+    fin = float(data.get("duration", tiempos[-1] if tiempos else 0.0))
+    for n, paso in enumerate(pasos):
+        paso.pop("_xy", None)
+        siguiente = tiempos[n + 1] if n + 1 < len(tiempos) else fin
+        paso["delay"] = round(round(max(0.0, siguiente - tiempos[n]) / 0.05) * 0.05, 2)
+    return {"nombre": nombre, "origen": data.get("created_at"), "pasos": pasos}
+
+
+if __name__ == "__main__":
+    # python -m shared.plan compilar camino.json [salida.json] -> borrador de plan
+    # python -m shared.plan validar plan.json
+    # python -m shared.plan correr plan.json dni=20123456789
+    if len(sys.argv) >= 3 and sys.argv[1] == "compilar":
+        origen = Path(sys.argv[2])
+        grabacion = json.loads(origen.read_text(encoding="utf-8"))
+        plan = compilar_grabacion(grabacion, coords.load_master(), nombre=origen.stem)
+        texto = json.dumps(plan, ensure_ascii=False, indent=2)
+        if len(sys.argv) >= 4:
+            Path(sys.argv[3]).write_text(texto, encoding="utf-8")
+            print(f"[plan] {len(plan['pasos'])} pasos -> {sys.argv[3]}")
+        else:
+            print(texto)
+    elif len(sys.argv) >= 3 and sys.argv[1] == "validar":
+        errores = validar(cargar(Path(sys.argv[2])), coords.load_master())
+        for e in errores:
+            print(f"[plan] {e}")
+        print(f"[plan] {'OK' if not errores else f'{len(errores)} errores'}")
+        sys.exit(1 if errores else 0)
+    elif len(sys.argv) >= 3 and sys.argv[1] == "correr":
+        variables = dict(a.split("=", 1) for a in sys.argv[3:] if "=" in a)
+        print(json.dumps(ejecutar(Path(sys.argv[2]), variables=variables), ensure_ascii=False))
+    else:
+        print("uso: python -m shared.plan compilar|validar|correr <archivo> ...", file=sys.stderr)
+        sys.exit(2)
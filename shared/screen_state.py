@@ -0,0 +1,140 @@
+"""Reconocimiento de la pantalla actual de T3 por firmas de pixeles.
+
+Cada pantalla conocida (home, cliente, Ver Todos, FA Cobranza, saldo, score)
+tiene en coords.json -> `pantallas` unos pocos puntos con su color esperado y
+la cantidad de tabs que hay abiertas sobre home cuando se ve. Con eso:
+
+- `detectar(master)` dice en que pantalla esta T3 (None si no reconoce).
+- `tabs_a_cerrar(master, veces, destino)` calcula cuantos close_tab hacen
+  falta para llegar a `destino` sin pasarse de `veces`: cerrar_tabs cierra
+  exactamente esas y no clickea tabs que no existen.
+- `en(master, pantalla)` deja que un camino se salte pasos cuando T3 ya esta
+  donde hace falta (ej. deudas que siguen desde el cliente del score).
+
+Sin firmas calibradas, sin MSS o con SCREEN_STATE=0 no se reconoce nada y
+todo queda como antes (cierres a ciegas con `veces`).
+"""
+from __future__ import annotations
+
+import os
+import sys
+from typing import Any
+
+from shared import capture, coords
+
+SCREEN_STATE = os.getenv("SCREEN_STATE", "1").lower() in ("1", "true", "yes", "on")
+SCREEN_TOLERANCE = int(os.getenv("SCREEN_TOLERANCE", "16"))  # por canal, 0-255
+SECCION = "pantallas"
+
+_ultima: str | None = None  # ultima pantalla reconocida (para logs / diagnostico)
+
+
+def _rgb(valor: Any) -> tuple[int, int, int] | None:
+    """'#aabbcc' o [r, g, b] -> (r, g, b)."""
+    try:
+        if isinstance(valor, str):
+            h = valor.lstrip("#")
+            return int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
+        r, g, b = valor
+        return int(r), int(g), int(b)
+    except (TypeError, ValueError):
+        return None
+
+
+def firmas(master: dict) -> dict[str, dict[str, Any]]:
+    """Pantallas con al menos un punto calibrado, en el orden de coords.json."""
+    out: dict[str, dict[str, Any]] = {}
+    for nombre, nodo in master.get(SECCION, {}).items():
+        if nombre.startswith("_") or not isinstance(nodo, dict):
+            continue
+        puntos = [p for p in nodo.get("puntos", []) if _rgb(p.get("rgb")) is not None]
+        if puntos:
+            out[nombre] = {"tabs": int(nodo.get("tabs", 0)), "puntos": puntos}
+    return out
+
+
+def _coincide(puntos: list[dict[str, Any]]) -> bool:
+    for p in puntos:
+        color = capture.pixel(int(p.get("x", 0)), int(p.get("y", 0)))
+        if color is None:
+            return False
+        esperado = _rgb(p.get("rgb"))
+        if any(abs(c - e) > SCREEN_TOLERANCE for c, e in zip(color, esperado)):
+            return False
+    return True
+
+
+def detectar(master: dict) -> str | None:
+    """Nombre de la pantalla actual, o None si ninguna firma coincide."""
+    global _ultima
+    if not SCREEN_STATE:
+        return None
+    conocidas = firmas(master)
+    if not conocidas:
+        return None
+    for nombre, firma in conocidas.items():
+        if _coincide(firma["puntos"]):
+            _ultima = nombre
+            return nombre
+    _ultima = None
+    return None
+
+
+def ultima() -> str | None:
+    """Ultima pantalla reconocida por `detectar` (sin volver a mirar)."""
+    return _ultima
+
+
+def en(master: dict, pantalla: str) -> bool | None:
+    """True/False si se reconoce la pantalla actual; None si no se puede saber."""
+    actual = detectar(master)
+    if actual is None:
+        return None
+    return actual == pantalla
+
+
+def tabs(master: dict, pantalla: str) -> int | None:
+    nodo = coords.get(master, f"{SECCION}.{pantalla}")
+    return int(nodo["tabs"]) if "tabs" in nodo else None
+
+
+def tabs_a_cerrar(master: dict, veces: int, destino: str = "home") -> int:
+    """Cuantos close_tab hacen falta para llegar a `destino` (tope `veces`).
+
+    Si la pantalla actual no se reconoce devuelve `veces` (cierre a ciegas).
+    """
+    actual = detectar(master)
+    if actual is None:
+        return veces
+    abiertas, objetivo = tabs(master, actual), tabs(master, destino)
+    if abiertas is None or objetivo is None:
+        return veces
+    n = max(0, min(veces, abiertas - objetivo))
+    if n != veces:
+        print(f"[screen] en '{actual}' ({abiertas} tabs): cierro {n} de {veces} para '{destino}'")
+    return n
+
+
+# ── Calibracion ────────────────────────────────────────────────────────────────
+def firmar(master: dict, pantalla: str) -> list[dict[str, Any]]:
+    """Lee el color actual de los puntos de `pantalla` (con T3 parado en ella)."""
+    nodo = coords.get(master, f"{SECCION}.{pantalla}")
+    out = []
+    for p in nodo.get("puntos", []):
+        x, y = int(p.get("x", 0)), int(p.get("y", 0))
+        color = capture.pixel(x, y)
+        rgb = "#%02x%02x%02x" % color if color else None
+        out.append({"x": x, "y": y, "rgb": rgb})
+    return out
+
+
+if __name__ == "__main__":
+    # python -m shared.screen_state                -> pantalla actual
+    # python -m shared.screen_state firmar cliente -> puntos con el color actual
+    import json
+
+    master = coords.load_master()
+    if len(sys.argv) >= 3 and sys.argv[1] == "firmar":
+        print(json.dumps(firmar(master, sys.argv[2]), ensure_ascii=False))
+    else:
+        print(f"[screen] pantalla actual: {detectar(master)}")
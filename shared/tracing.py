@@ -0,0 +1,191 @@
+"""Trazas por tarea en formato Chrome trace-event (se abren en Perfetto / chrome://tracing).
+
+Se activa con la variable de entorno TRACE_DIR. Sin ella todo es no-op y el
+costo es un chequeo de una global por llamada.
+
+- `span(name, cat)`: context manager que mide un bloque (evento "X").
+- `traced(cat)`: decorador equivalente sobre una funcion (flows, mouse, keyboard).
+- `instant(name, cat)`: marca puntual (ej. cada etapa de send_partial).
+- Mientras hay una traza activa, `time.sleep` queda envuelto y cada espera
+  aparece como span "sleep" anidado en el paso que la hizo.
+- `finish()` escribe `TRACE_DIR/<label>_<timestamp>.json` y devuelve un
+  resumen (tiempo total por paso, sleeps) que se adjunta al resultado final.
+
+Los spans anidados se reconstruyen por contencion de tiempos dentro del mismo
+thread, que es lo que hace Perfetto con los eventos "X".
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+TRACE_DIR = os.getenv("TRACE_DIR", "").strip()
+MAX_EVENTS = 50_000
+SUMMARY_TOP = 15
+
+_lock = threading.Lock()
+_events: list[dict[str, Any]] = []
+_active = False
+_label = ""
+_t0 = 0.0
+_sleep_original: Callable[[float], None] | None = None
+
+
+def enabled() -> bool:
+    return bool(TRACE_DIR)
+
+
+def _now_us() -> float:
+    return (time.perf_counter() - _t0) * 1_000_000
+
+
+def _add(event: dict[str, Any]) -> None:
+    with _lock:
+        if len(_events) < MAX_EVENTS:
+            _events.append(event)
+
+
+# ── Ciclo de vida ──────────────────────────────────────────────────────────────
+def begin(label: str) -> None:
+    """Arranca una traza nueva (descarta la anterior si quedo sin cerrar)."""
+    global _active, _label, _t0, _sleep_original
+    if not enabled():
+        return
+    with _lock:
+        _events.clear()
+        _label = re.sub(r"[^\w.-]+", "_", label) or "camino"
+        _t0 = time.perf_counter()
+        _active = True
+        if _sleep_original is None:
+            _sleep_original = time.sleep
+            time.sleep = _traced_sleep
+
+
+def _ensure_active() -> bool:
+    """Inicio implicito: un camino lanzado solo (sin begin) traza con su nombre de script."""
+    if not _active and enabled():
+        begin(Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else "camino")
+    return _active
+
+
+def finish() -> dict[str, Any] | None:
+    """Cierra la traza activa, la escribe a disco y retorna el resumen (None si no hay)."""
+    global _active, _sleep_original
+    if not _active:
+        return None
+    with _lock:
+        _active = False
+        if _sleep_original is not None:
+            time.sleep = _sleep_original
+            _sleep_original = None
+        events = list(_events)
+        _events.clear()
+        label = _label
+
+    summary = _summarize(events)
+    try:
+        out_dir = Path(TRACE_DIR)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / f"{label}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        with path.open("w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        summary["file"] = str(path)
+    except Exception as e:
+        print(f"[tracing] WARN no se pudo escribir la traza: {e}", file=sys.stderr)
+    return summary
+
+
+def _summarize(events: list[dict[str, Any]]) -> dict[str, Any]:
+    totals: dict[tuple[str, str], list[float]] = {}
+    sleep_us = 0.0
+    end_us = 0.0
+    for ev in events:
+        if ev.get("ph") != "X":
+            continue
+        end_us = max(end_us, ev["ts"] + ev["dur"])
+        if ev["cat"] == "sleep":
+            sleep_us += ev["dur"]
+            continue
+        acc = totals.setdefault((ev["cat"], ev["name"]), [0.0, 0])
+        acc[0] += ev["dur"]
+        acc[1] += 1
+    top = sorted(totals.items(), key=lambda kv: kv[1][0], reverse=True)[:SUMMARY_TOP]
+    return {
+        "total_ms": round(end_us / 1000, 1),
+        "sleep_ms": round(sleep_us / 1000, 1),
+        "steps": [
+            {"cat": cat, "name": name, "ms": round(us / 1000, 1), "count": count}
+            for (cat, name), (us, count) in top
+        ],
+    }
+
+
+# ── Eventos ────────────────────────────────────────────────────────────────────
+@contextmanager
+def span(name: str, cat: str = "step", **args: Any) -> Iterator[None]:
+    """Mide el bloque como un evento "X" del thread actual."""
+    if not (TRACE_DIR and _ensure_active()):
+        yield
+        return
+    start = _now_us()
+    try:
+        yield
+    finally:
+        event = {
+            "name": name, "cat": cat, "ph": "X",
+            "ts": start, "dur": _now_us() - start,
+            "pid": os.getpid(), "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        _add(event)
+
+
+def traced(cat: str) -> Callable[[Callable], Callable]:
+    """Decorador: cada llamada a la funcion es un span `cat`/`nombre`."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*a: Any, **kw: Any) -> Any:
+            if not TRACE_DIR:
+                return fn(*a, **kw)
+            with span(fn.__name__, cat):
+                return fn(*a, **kw)
+        return wrapper
+    return decorator
+
+
+def instant(name: str, cat: str = "marca", **args: Any) -> None:
+    """Marca puntual (evento "i"), ej. el cambio de etapa de un camino."""
+    if not (TRACE_DIR and _ensure_active()):
+        return
+    event = {
+        "name": name, "cat": cat, "ph": "i", "s": "p",
+        "ts": _now_us(), "pid": os.getpid(), "tid": threading.get_ident(),
+    }
+    if args:
+        event["args"] = args
+    _add(event)
+
+
+def _traced_sleep(seconds: float) -> None:
+    original = _sleep_original or time.sleep
+    if not _active:
+        return original(seconds)
+    start = _now_us()
+    try:
+        original(seconds)
+    finally:
+        _add({
+            "name": "sleep", "cat": "sleep", "ph": "X",
+            "ts": start, "dur": _now_us() - start,
+            "pid": os.getpid(), "tid": threading.get_ident(),
+            "args": {"s": seconds},
+        })
@@ -0,0 +1,123 @@
+"""Punto unico de esperas de GUI: contabilidad por call-site y escala global.
+
+Todos los caminos y helpers de `shared` esperan con `pause(segundos)` en vez
+de `time.sleep`:
+
+- SLEEP_SCALE (env, default 1.0) multiplica cada espera. 0 corre los caminos
+  sin demoras (benchmarks, harness de GUI falsa); 0.8 acorta toda la flota
+  desde una sola perilla.
+- Cada llamada se acumula por call-site (`archivo.funcion:linea`, o la
+  etiqueta que pase el llamador). `finish()` devuelve el total de la tarea,
+  que parte del tiempo de pared fue espera pura y los sitios que mas suman.
+- PYAUTOGUI_PAUSE (env, default 0.1 = default de pyautogui) es la pausa que
+  pyautogui agrega despues de cada click/tecla. Tambien se escala con
+  SLEEP_SCALE y queda informada en el resumen. Esa pausa ocurre dentro de
+  pyautogui y no se cuenta por sitio.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from shared import autotune
+
+SLEEP_SCALE = float(os.getenv("SLEEP_SCALE", "1.0"))
+PYAUTOGUI_PAUSE = float(os.getenv("PYAUTOGUI_PAUSE", "0.1"))
+WAIT_REPORT = os.getenv("WAIT_REPORT", "0").lower() in ("1", "true", "yes", "on")
+SUMMARY_TOP = 15
+
+_lock = threading.Lock()
+_sites: dict[str, list[float]] = {}  # site -> [segundos esperados, llamadas, segundos pedidos]
+_started: float | None = None
+
+
+def _caller_site(depth: int) -> str:
+    f = sys._getframe(depth + 1)
+    return f"{Path(f.f_code.co_filename).stem}.{f.f_code.co_name}:{f.f_lineno}"
+
+
+def pause(seconds: float, site: str | None = None) -> None:
+    """Espera `seconds * SLEEP_SCALE` y la anota en el call-site."""
+    scaled = seconds * SLEEP_SCALE
+    record(site or _caller_site(1), scaled, seconds)
+    if scaled > 0:
+        time.sleep(scaled)
+
+
+def record(site: str | None, waited: float, requested: float, depth: int = 1) -> None:
+    """Anota una espera hecha por fuera de `pause` (ej. esperas adaptativas).
+
+    Sin `site` se usa el call-site que esta `depth` frames arriba de record().
+    """
+    global _started
+    if site is None:
+        site = _caller_site(depth)
+    with _lock:
+        if _started is None:
+            _started = time.time()
+        acc = _sites.setdefault(site, [0.0, 0, 0.0])
+        acc[0] += waited
+        acc[1] += 1
+        acc[2] += requested
+
+
+def aplicar_pausa_pyautogui(pg: Any) -> None:
+    """Fija la pausa implicita de pyautogui (escalada) en vez del default oculto."""
+    pg.PAUSE = PYAUTOGUI_PAUSE * SLEEP_SCALE
+
+
+# ── Por tarea ──────────────────────────────────────────────────────────────────
+def begin() -> None:
+    """Arranca la contabilidad de una tarea (descarta lo acumulado).
+
+    Tambien descarta los clicks que AUTOTUNE tenia sin juzgar de la tarea anterior.
+    """
+    global _started
+    with _lock:
+        _sites.clear()
+        _started = time.time()
+    autotune.reiniciar()
+
+
+def summary() -> dict[str, Any]:
+    with _lock:
+        sites = dict(_sites)
+        started = _started
+    wall = time.time() - started if started else 0.0
+    total = sum(acc[0] for acc in sites.values())
+    requested = sum(acc[2] for acc in sites.values())
+    top = sorted(sites.items(), key=lambda kv: kv[1][2], reverse=True)[:SUMMARY_TOP]
+    return {
+        "scale": SLEEP_SCALE,
+        "pyautogui_pause": PYAUTOGUI_PAUSE * SLEEP_SCALE,
+        "wall_s": round(wall, 2),
+        "wait_s": round(total, 2),
+        "requested_s": round(requested, 2),
+        "wait_share": round(total / wall, 3) if wall else 0.0,
+        "calls": int(sum(acc[1] for acc in sites.values())),
+        "top": [
+            {"site": site, "s": round(acc[0], 2), "calls": int(acc[1])}
+            for site, acc in top
+        ],
+    }
+
+
+def finish() -> dict[str, Any] | None:
+    """Cierra la tarea: loguea el resumen y lo retorna si WAIT_REPORT esta activo."""
+    global _started
+    if _started is None:
+        return None
+    data = summary()
+    with _lock:
+        _sites.clear()
+        _started = None
+    print(
+        f"[wait] {data['wait_s']:.1f}s de espera en {data['wall_s']:.1f}s "
+        f"({data['wait_share']:.0%}, {data['calls']} pausas, scale={SLEEP_SCALE})",
+        flush=True,
+    )
+    return data if WAIT_REPORT else None
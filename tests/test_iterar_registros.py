@@ -0,0 +1,32 @@
+from shared.flows.iterar_registros import parse_saldos_tabla
+
+HEADER = "ID del FA\tTipo ID Compañía\tID del Cliente\tSaldo\tNro Cuenta"
+
+
+def test_celda_vacia_no_corre_las_columnas():
+    tabla = f"{HEADER}\n111111\t\t22222222\t1.500,00\t987654\n"
+    assert parse_saldos_tabla(tabla) == {"111111": "1.500,00"}
+
+
+def test_fila_con_otra_cantidad_de_celdas_se_descarta():
+    tabla = f"{HEADER}\n111111\t22222222\t1.500,00\t987654\n333333\tCUIT\t4\t10,00\t5\n"
+    assert parse_saldos_tabla(tabla) == {"333333": "10,00"}
+
+
+def test_ultima_celda_vacia():
+    tabla = f"{HEADER}\n111111\tDNI\t22222222\t1.500,00\t"
+    assert parse_saldos_tabla(tabla) == {"111111": "1.500,00"}
+
+
+def test_columna_por_nombre_exacto():
+    tabla = "ID del FA\tSaldo Vencido\tSaldo\n123\t10,00\t55,00\n"
+    assert parse_saldos_tabla(tabla) == {"123": "55,00"}
+
+
+def test_sin_columna_de_saldo():
+    assert parse_saldos_tabla("ID del FA\tSaldo Vencido\n1\t2\n") == {}
+
+
+def test_saldo_sin_signo_pesos():
+    tabla = f"{HEADER}\n111111\tDNI\t22222222\t$ 1.500,00\t987654\n"
+    assert parse_saldos_tabla(tabla) == {"111111": "1.500,00"}